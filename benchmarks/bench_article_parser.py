@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+"""
+Benchmark Facebook article parsing
+
+Parses every article of saved page HTML (``driver.page_source`` dumps) with
+the old per-selector XPath scans and with the single-pass lxml walker, checks
+that both agree and reports the per-article parse time.
+
+Usage:
+    python -m benchmarks.bench_article_parser page1.html [page2.html ...]
+    python -m benchmarks.bench_article_parser --synthetic 50
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapy.http import HtmlResponse
+
+from facebook.article_parser import parse_article_element
+from facebook.facebook_spider import FacebookPageSpider
+
+
+URL_SELECTORS = [
+    ".//div//span/a[@aria-label!='Enlarge' and @role='link']/@href",
+    ".//span/a[@role='link']/@href",
+    ".//a[contains(@href, '/posts/')]/@href",
+    ".//a[contains(@href, '/photos/')]/@href",
+]
+
+IMAGE_SELECTORS = [
+    ".//img[contains(@src, 'scontent') and not(contains(@src, '16x16')) and not(contains(@src, '20x20')) and not(contains(@src, '24x24')) and not(contains(@src, '32x32'))]/@src",
+    ".//img[contains(@src, 'fbcdn.net') and not(contains(@src, 'emoji')) and not(contains(@src, 'icon'))]/@src",
+    ".//img[contains(@src, 'facebook.com') and not(contains(@src, 'emoji'))]/@src",
+    ".//img[@data-src and contains(@data-src, 'scontent') and not(contains(@data-src, 'emoji'))]/@data-src",
+    ".//img[@data-src and contains(@data-src, 'fbcdn') and not(contains(@data-src, 'emoji'))]/@data-src",
+    ".//img[contains(@class, 'x') and @src and not(contains(@alt, 'emoji')) and not(contains(@class, 'emoji')) and not(contains(@class, 'icon'))]/@src",
+    ".//*[contains(@style, 'background-image') and contains(@style, 'scontent') and not(contains(@style, 'emoji'))]/@style",
+]
+
+MATCH_HREF_XPATH = ".//a[contains(@href, '/posts/') or contains(@href, '/photo/')]/@href"
+
+
+def parse_with_xpath(article):
+    """The selector-by-selector extraction parse_article used to run"""
+    url = None
+    for selector in URL_SELECTORS:
+        urls = article.xpath(selector).getall()
+        if urls:
+            url = urls[0]
+            break
+
+    header_label = article.xpath(
+        FacebookPageSpider.article_header_xpath).xpath("./@aria-label").get()
+
+    content = ""
+    for selector in FacebookPageSpider.page_content_selectors:
+        descriptions = article.xpath(selector).getall()
+        if descriptions:
+            content = " ".join(descriptions).strip()
+            break
+
+    all_texts = article.xpath(".//text()").getall()
+    texts = [text.strip() for text in all_texts if text.strip()]
+
+    image_urls = []
+    for selector in IMAGE_SELECTORS:
+        image_urls.extend(article.xpath(selector).getall())
+
+    match_hrefs = article.xpath(MATCH_HREF_XPATH).getall()
+
+    return {
+        "url": url,
+        "header_label": header_label,
+        "content": content,
+        "texts": texts,
+        "image_urls": image_urls,
+        "match_href": match_hrefs[0] if match_hrefs else None,
+        "leading_text": " ".join(all_texts[:10]),
+    }
+
+
+def synthetic_page(articles):
+    """Page HTML with a Facebook-like article structure"""
+    parts = []
+    for i in range(articles):
+        images = "".join(
+            f'<img class="x1ey2m1c" src="https://scontent.xx.fbcdn.net/v/t39/{i}_{j}_n.jpg?stp=dst-jpg_s960x960&oh=00_A&oe=6" alt="photo">'
+            for j in range(4)
+        )
+        parts.append(f"""
+<div role="article"><div class="x1yztbdb">
+  <div><h2><span><a role="link" aria-label="{i + 1}h" href="/page/posts/pfbid0{i:08d}?__cft__[0]=abc">{i + 1}h</a></span></h2>
+  <span><img src="https://static.xx.fbcdn.net/images/emoji.php/v9/t4c/1/16/1f600.png" alt="emoji"></span></div>
+  <div data-ad-comet-preview="message"><div><span dir="auto"><div dir="auto">Post number {i} with some longer text about the page.</div>
+    <div dir="auto">Second paragraph #{i} <a href="/hashtag/test">#test</a></div></span></div></div>
+  <div>{images}</div>
+  <div><span dir="auto">Like</span><span dir="auto">Comment</span><span dir="auto">Share</span></div>
+</div></div>""")
+    return f"<html><body>{''.join(parts)}</body></html>"
+
+
+def load_pages(paths, synthetic):
+    pages = []
+    for path in paths:
+        with open(path, "rb") as f:
+            pages.append((os.path.basename(path), f.read()))
+    if synthetic:
+        pages.append((f"synthetic-{synthetic}", synthetic_page(synthetic).encode()))
+    return pages
+
+
+def time_parser(articles, parse, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for article in articles:
+            parse(article)
+    return (time.perf_counter() - start) / (repeat * max(1, len(articles)))
+
+
+def print_report(name, articles, xpath_time, walk_time, mismatches):
+    print(f"\n📄 {name}: {len(articles)} articles")
+    print(f"  {'xpath scans':<14}{xpath_time * 1000:>9.3f} ms/article")
+    print(f"  {'single pass':<14}{walk_time * 1000:>9.3f} ms/article"
+          f"   ({xpath_time / walk_time if walk_time else 0:.1f}x)")
+    if mismatches:
+        print(f"  ⚠️ {len(mismatches)} articles differ: {', '.join(mismatches[:5])}")
+    else:
+        print("  ✅ Both parsers agree on every article")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("pages", nargs="*", help="Saved page HTML files")
+    parser.add_argument("--synthetic", type=int, default=0,
+                        help="Also parse a generated page with N articles")
+    parser.add_argument("--repeat", type=int, default=20,
+                        help="Parse every article this many times")
+    args = parser.parse_args()
+
+    if not args.pages and not args.synthetic:
+        args.synthetic = 50
+
+    for name, body in load_pages(args.pages, args.synthetic):
+        response = HtmlResponse(url="https://www.facebook.com/", body=body,
+                                encoding="utf-8")
+        articles = response.xpath(FacebookPageSpider.articles_xpath)
+
+        mismatches = []
+        for i, article in enumerate(articles):
+            if parse_article_element(article.root)._asdict() != parse_with_xpath(article):
+                mismatches.append(str(i))
+
+        xpath_time = time_parser(articles, parse_with_xpath, args.repeat)
+        walk_time = time_parser(
+            articles, lambda a: parse_article_element(a.root), args.repeat)
+        print_report(name, articles, xpath_time, walk_time, mismatches)
+
+
+if __name__ == "__main__":
+    main()
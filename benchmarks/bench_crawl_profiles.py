@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+"""
+Benchmark Facebook crawl profiles
+
+Loads the same pages with every profile in CRAWL_PROFILES and reports bytes
+transferred and time-to-first-article.
+
+Usage:
+    python -m benchmarks.bench_crawl_profiles <pagename> [<pagename> ...]
+    python -m benchmarks.bench_crawl_profiles --url http://127.0.0.1:8000/test
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from common.chromedriver import resolve_chromedriver
+from facebook.page_readiness import ARTICLE_XPATH, PageReadiness, drain_network_events
+from facebook.selenium_config import (
+    CRAWL_PROFILES, get_chrome_options, get_blocked_url_patterns, apply_url_blocking,
+)
+
+
+def measure_page(driver, url, timeout=30):
+    """
+    Load one page and measure it
+
+    Returns:
+        dict: bytes, requests, blocked request count and time-to-first-article
+    """
+    drain_network_events(driver)
+
+    start = time.time()
+    driver.get(url)
+    try:
+        WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.XPATH, ARTICLE_XPATH)))
+        first_article = time.time() - start
+    except TimeoutException:
+        first_article = None
+
+    # Let the page settle so late requests are counted too
+    PageReadiness(page_timeout=timeout).wait_for_network_idle(driver)
+    total_time = time.time() - start
+
+    bytes_transferred = 0
+    requests_sent = 0
+    blocked = 0
+    for method, params in drain_network_events(driver) or []:
+        if method == "Network.requestWillBeSent":
+            requests_sent += 1
+        elif method == "Network.loadingFinished":
+            bytes_transferred += params.get("encodedDataLength", 0)
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            blocked += 1
+
+    return {
+        "bytes": bytes_transferred,
+        "requests": requests_sent,
+        "blocked": blocked,
+        "first_article": first_article,
+        "total": total_time,
+    }
+
+
+def run_profile(profile, urls, driver_path):
+    driver = webdriver.Chrome(
+        service=Service(driver_path), options=get_chrome_options(profile))
+    try:
+        apply_url_blocking(driver, get_blocked_url_patterns(profile))
+        return [measure_page(driver, url) for url in urls]
+    finally:
+        driver.quit()
+
+
+def print_report(results):
+    print("\n" + "=" * 80)
+    print("📊 CRAWL PROFILE BENCHMARK")
+    print("=" * 80)
+    print(f"{'profile':<10}{'pages':>6}{'MB':>10}{'requests':>10}"
+          f"{'blocked':>9}{'first article':>15}{'settled':>10}")
+    for profile, pages in results.items():
+        first = [p["first_article"] for p in pages if p["first_article"] is not None]
+        avg_first = f"{sum(first) / len(first):.2f}s" if first else "n/a"
+        print(
+            f"{profile:<10}{len(pages):>6}"
+            f"{sum(p['bytes'] for p in pages) / 1e6:>10.2f}"
+            f"{sum(p['requests'] for p in pages):>10}"
+            f"{sum(p['blocked'] for p in pages):>9}"
+            f"{avg_first:>15}"
+            f"{sum(p['total'] for p in pages) / len(pages):>9.2f}s"
+        )
+    print("=" * 80)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("pagenames", nargs="*", default=[])
+    parser.add_argument("--url", action="append", default=[],
+                        help="Full page URL (repeatable)")
+    parser.add_argument("--profile", action="append", default=[],
+                        help="Profiles to compare (default: all)")
+    args = parser.parse_args()
+
+    urls = args.url + [f"https://www.facebook.com/{name}" for name in args.pagenames]
+    if not urls:
+        parser.error("give at least one pagename or --url")
+
+    profiles = args.profile or list(CRAWL_PROFILES)
+    driver_path = resolve_chromedriver()
+
+    results = {}
+    for profile in profiles:
+        print(f"🚀 Profile '{profile}' over {len(urls)} page(s)...")
+        results[profile] = run_profile(profile, urls, driver_path)
+
+    print_report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Benchmark Chrome driver startup
+
+Starts Chrome in fresh processes, like cron-style per-page runs do, and
+reports chromedriver resolution and browser launch times for a cold start
+(webdriver_manager version check, new profile) and a warm start (cached
+chromedriver path, persistent profile reused from the previous run).
+
+Usage:
+    python -m benchmarks.bench_driver_startup --repeat 3
+    python -m benchmarks.bench_driver_startup --url https://www.facebook.com/somepage
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+RESULT_PREFIX = "STARTUP_RESULT "
+
+
+def child(mode, workdir, url):
+    """Measure one startup in this process and print it as a JSON line"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
+    from common.chromedriver import chrome_profile_dir, resolve_chromedriver
+    from facebook.selenium_config import get_chrome_options
+
+    cache_path = os.path.join(workdir, "chromedriver.json")
+    start = time.time()
+    driver_path = resolve_chromedriver(refresh=mode == "cold", cache_path=cache_path)
+    resolved = time.time()
+
+    if mode == "cold":
+        user_data_dir = tempfile.mkdtemp(prefix="chrome-cold-", dir=workdir)
+    else:
+        user_data_dir = chrome_profile_dir("bench", root=os.path.join(workdir, "profiles"))
+
+    driver = webdriver.Chrome(
+        service=Service(driver_path),
+        options=get_chrome_options("light", user_data_dir=user_data_dir))
+    launched = time.time()
+    try:
+        driver.get(url)
+        loaded = time.time()
+    finally:
+        driver.quit()
+
+    print(RESULT_PREFIX + json.dumps({
+        "resolve": resolved - start,
+        "launch": launched - resolved,
+        "first_page": loaded - launched,
+        "total": loaded - start,
+    }), flush=True)
+
+
+def run_child(mode, workdir, url):
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_driver_startup",
+         "--child", mode, "--workdir", workdir, "--url", url],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    for line in proc.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    raise RuntimeError(f"{mode} start failed (exit {proc.returncode}):\n{proc.stderr[-2000:]}")
+
+
+def print_report(results):
+    print(f"\n{'start':<8}{'resolve s':>11}{'launch s':>10}{'first page s':>14}{'total s':>10}")
+    for mode, runs in results.items():
+        mean = {key: sum(r[key] for r in runs) / len(runs) for key in runs[0]}
+        print(f"{mode:<8}{mean['resolve']:>11.2f}{mean['launch']:>10.2f}"
+              f"{mean['first_page']:>14.2f}{mean['total']:>10.2f}")
+
+    cold = sum(r["total"] for r in results["cold"]) / len(results["cold"])
+    warm = sum(r["total"] for r in results["warm"]) / len(results["warm"])
+    print(f"\n⚡ Warm start saves {cold - warm:.2f}s per run "
+          f"({(cold - warm) / cold * 100 if cold else 0:.0f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per start mode")
+    parser.add_argument("--url", default="about:blank", help="First page to load")
+    parser.add_argument("--child", choices=["cold", "warm"], help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return child(args.child, args.workdir, args.url)
+
+    workdir = tempfile.mkdtemp(prefix="bench-startup-")
+    try:
+        results = {"cold": [], "warm": []}
+        for i in range(args.repeat):
+            # Cold run first: it also fills the cache the warm run reads
+            for mode in ("cold", "warm"):
+                result = run_child(mode, workdir, args.url)
+                print(f"  {mode} #{i + 1}: {result['total']:.2f}s")
+                results[mode].append(result)
+        print_report(results)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+"""
+End-to-end crawl benchmark against a local fake Facebook site
+
+Starts the fake site (benchmarks/fake_facebook/server.py), crawls its pages
+with FacebookPageCrawler and reports pages/min, posts/min, images/sec, time
+spent waiting vs. working and peak RSS. Needs Chrome, but no network access.
+
+Usage:
+    python -m benchmarks.bench_fake_site --pages 3 --articles 10 --photos 6
+    python -m benchmarks.bench_fake_site --image-latency 0.2 --max-posts 10
+    python -m benchmarks.bench_fake_site --photos 4 --gallery-mode network
+"""
+
+import os
+import sys
+import json
+import time
+import resource
+import tempfile
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from benchmarks.fake_facebook.crawl import RESULT_PREFIX
+from benchmarks.fake_facebook.server import FakeFacebookServer, FakeFacebookSite
+
+
+def run_crawl(base_url, pagename, max_posts, workdir, gallery_mode=None, verbose=False):
+    """
+    Crawl one fake page in a child process
+
+    Returns:
+        dict: wall/cpu/max_rss_kb reported by the child plus the CPU time of
+            the browser processes it started
+    """
+    env = dict(
+        os.environ,
+        PYTHONPATH=ROOT,
+        MEDIA_STORE_DIR=os.path.join(workdir, "media_store"),
+        FACEBOOK_CRAWL_STATE=os.path.join(workdir, "state.sqlite3"),
+    )
+    before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    start = time.time()
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.fake_facebook.crawl",
+         "--base-url", base_url, "--pagename", pagename,
+         "--max-posts", str(max_posts)]
+        + (["--gallery-mode", gallery_mode] if gallery_mode else []),
+        cwd=workdir, env=env, capture_output=True, text=True,
+    )
+    wall = time.time() - start
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    if verbose:
+        print(proc.stdout)
+        print(proc.stderr, file=sys.stderr)
+
+    result = {}
+    for line in proc.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            result = json.loads(line[len(RESULT_PREFIX):])
+    if not result:
+        raise RuntimeError(
+            f"Crawl of {pagename} failed (exit {proc.returncode}):\n{proc.stderr[-2000:]}")
+
+    tree_cpu = (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+    result.update({
+        "process_wall": wall,
+        "browser_cpu": max(0.0, tree_cpu - result["total_cpu"]),
+        "tree_max_rss_kb": after.ru_maxrss,
+    })
+    return result
+
+
+def print_report(site, runs, elapsed):
+    stats = site.stats
+    pages = stats["pages"]
+    crawl_wall = sum(r["wall"] for r in runs)
+    crawler_cpu = sum(r["cpu"] for r in runs)
+    browser_cpu = sum(r["browser_cpu"] for r in runs)
+    waiting = max(0.0, crawl_wall - crawler_cpu)
+
+    print("\n📊 Fake-site benchmark")
+    if not pages:
+        print("  ⚠️ No page was loaded by Chrome, rerun with --verbose")
+    print(f"  pages          {pages} ({stats['feed_chunks']} feed chunks loaded by scrolling)")
+    print(f"  pages/min      {pages / elapsed * 60:8.2f}")
+    print(f"  photo pages    {stats['photo_pages']}")
+    print(f"  images/sec     {stats['images'] / elapsed:8.2f}"
+          f"  ({stats['images']} images, {stats['image_bytes'] / 1e6:.1f} MB)")
+    print(f"  crawl time     {crawl_wall:8.1f}s (+{elapsed - crawl_wall:.1f}s process startup)")
+    print(f"  working        {crawler_cpu:8.1f}s crawler CPU, {browser_cpu:.1f}s browser CPU")
+    print(f"  waiting        {waiting:8.1f}s ({waiting / crawl_wall * 100 if crawl_wall else 0:.0f}% of crawl time)")
+    print(f"  peak RSS       {max(r['max_rss_kb'] for r in runs) / 1024:8.1f} MB crawler, "
+          f"{max(r['tree_max_rss_kb'] for r in runs) / 1024:.1f} MB largest process")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pages", type=int, default=2, help="Fake pages to crawl")
+    parser.add_argument("--articles", type=int, default=10, help="Posts per page")
+    parser.add_argument("--photos", type=int, default=6, help="Photos per post")
+    parser.add_argument("--max-posts", type=int, default=None,
+                        help="Posts to crawl per page (default: all)")
+    parser.add_argument("--image-latency", type=float, default=0.05)
+    parser.add_argument("--page-latency", type=float, default=0.0)
+    parser.add_argument("--image-kb", type=int, default=60)
+    parser.add_argument("--no-cookie-banner", action="store_true")
+    parser.add_argument("--no-login-popup", action="store_true")
+    parser.add_argument("--gallery-mode", choices=["direct", "network", "dom"],
+                        help="Override GALLERY_EXTRACTION_MODE")
+    parser.add_argument("--verbose", action="store_true", help="Show crawler output")
+    args = parser.parse_args()
+
+    site = FakeFacebookSite(
+        articles=args.articles,
+        photos=args.photos,
+        image_latency=args.image_latency,
+        page_latency=args.page_latency,
+        image_kb=args.image_kb,
+        cookie_banner=not args.no_cookie_banner,
+        login_popup=not args.no_login_popup,
+    )
+
+    runs = []
+    with FakeFacebookServer(site) as server, tempfile.TemporaryDirectory() as workdir:
+        print(f"🧪 Fake site at {server.base_url}: {args.pages} pages x "
+              f"{args.articles} posts x {args.photos} photos")
+        start = time.time()
+        for i in range(1, args.pages + 1):
+            result = run_crawl(server.base_url, f"bench-{i}",
+                               args.max_posts or args.articles, workdir,
+                               args.gallery_mode, args.verbose)
+            print(f"  bench-{i}: {result['wall']:.1f}s")
+            runs.append(result)
+        elapsed = time.time() - start
+
+    print_report(site, runs, elapsed)
+
+
+if __name__ == "__main__":
+    main()
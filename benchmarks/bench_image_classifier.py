@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+"""
+Microbenchmark Facebook image URL filtering
+
+Runs a corpus of image URLs through the old substring-list filters and the
+classifier profiles (uncached and through classify_image_url), reports where the two disagree, the reason
+codes behind every decision and the time per URL.
+
+Usage:
+    python -m benchmarks.bench_image_classifier
+    python -m benchmarks.bench_image_classifier --corpus urls.txt --repeat 2000
+"""
+
+import os
+import sys
+import time
+import argparse
+from collections import Counter
+from urllib.parse import urlparse, parse_qs
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from facebook.image_classifier import CLASSIFIERS, classify_image_url
+
+
+DEFAULT_CORPUS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "fb_image_urls.txt")
+
+
+# Filters as they were before image_classifier, kept here as the baseline
+
+def legacy_article(url):
+    if not url or len(url) < 10:
+        return False
+    skip_patterns = [
+        'data:image', 'blank.gif', 'spacer.gif', 'transparent.gif', '1x1',
+        'pixel.png', '/assets/', '/static/', 'static.xx.fbcdn.net/rsrc.php',
+        'static.facebook.com/rsrc.php', '/rsrc.php', 'sprites/', 'icons/',
+        'emoji/', '/images/emoji.php', 'profile_pic_header', 'default_profile',
+        '/ui/', '/chrome/', '/images/icons/',
+    ]
+    for pattern in skip_patterns:
+        if pattern in url.lower():
+            return False
+    for invalid_domain in ['static.xx.fbcdn.net', 'static.facebook.com']:
+        if invalid_domain in url:
+            return False
+    return any(domain in url for domain in
+               ['scontent.com', 'scontent-', 'scontent.', 'cdninstagram.com'])
+
+
+def legacy_content(url):
+    if not url or len(url) < 20:
+        return False
+    skip_patterns = [
+        'emoji', 'icon', 'static', 'rsrc.php', '_16x16', '_20x20', '_24x24', '_32x32',
+        'blank.gif', 'spacer.gif', '1x1', 'pixel.png'
+    ]
+    for pattern in skip_patterns:
+        if pattern in url.lower():
+            return False
+    return any(domain in url for domain in
+               ['scontent.com', 'scontent-', 'scontent.', 'fbcdn.net', 'cdninstagram.com'])
+
+
+def _legacy_emoji_by_params(url):
+    parsed = urlparse(url)
+    if any(dim in url.lower() for dim in ['16x16', '20x20', '24x24', '32x32', '48x48']):
+        return True
+    indicators = ['emoji', 'icon', 'reaction', 'sticker', 'emoticon']
+    if any(indicator in parsed.path.lower() for indicator in indicators):
+        return True
+    for name, values in parse_qs(parsed.query).items():
+        param_str = f"{name}={','.join(values)}".lower()
+        if any(indicator in param_str for indicator in indicators):
+            return True
+    return False
+
+
+def legacy_post(url):
+    if not url or len(url) < 20:
+        return False
+    skip_patterns = [
+        'blank.gif', 'spacer.gif', '1x1', 'pixel.png', '/rsrc.php', 'sprites/',
+        'icons/', 'emoji/', 'profile_pic_header', '/assets/', '/static/',
+        'images/emoji.php', '/emoji/', '/emoticons/', '/reactions/', '/stickers/',
+        'emoji_', 'icon_', 'reaction_', 'static.xx.fbcdn.net/images/emoji',
+        'static.facebook.com/images/emoji', '/images/icons/', '/images/emoji/',
+        '_16x16', '_20x20', '_24x24', '_32x32', 'u00',
+    ]
+    for pattern in skip_patterns:
+        if pattern in url.lower():
+            return False
+    if _legacy_emoji_by_params(url):
+        return False
+    if not any(domain in url for domain in
+               ['scontent.com', 'scontent-', 'scontent.', 'fbcdn.net', 'cdninstagram.com']):
+        return False
+
+    emoji_patterns = [
+        'emoji', 'icon', 'reaction', 'sticker', 'emoticon',
+        '_16x16', '_20x20', '_24x24', '_32x32', '_48x48',
+        'u00', 'static.xx.fbcdn.net/images/emoji', 'static.facebook.com/images/emoji'
+    ]
+    for pattern in emoji_patterns:
+        if pattern in url.lower():
+            return False
+    if 'scontent' in url:
+        return True
+    return 'fbcdn.net' in url and 'static' not in url
+
+
+LEGACY = {"article": legacy_article, "content": legacy_content, "post": legacy_post}
+
+
+def load_corpus(path):
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f
+                if line.strip() and not line.startswith("#")]
+
+
+def per_url_time(urls, func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for url in urls:
+            func(url)
+    return (time.perf_counter() - start) / (repeat * len(urls))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS,
+                        help="File with one image URL per line")
+    parser.add_argument("--repeat", type=int, default=1000,
+                        help="Classify the corpus this many times")
+    args = parser.parse_args()
+
+    urls = load_corpus(args.corpus)
+    print(f"🖼️ {len(urls)} URLs from {args.corpus}")
+
+    for profile, classifier in CLASSIFIERS.items():
+        legacy = LEGACY[profile]
+        reasons = Counter()
+        disagreements = []
+        for url in urls:
+            decision = classifier.classify(url)
+            reasons[decision.reason] += 1
+            if decision.accepted != legacy(url):
+                disagreements.append((url, decision))
+
+        legacy_time = per_url_time(urls, legacy, args.repeat)
+        classifier_time = per_url_time(urls, classifier.classify, args.repeat)
+        classify_image_url.cache_clear()
+        cached_time = per_url_time(
+            urls, lambda url: classify_image_url(url, profile), args.repeat)
+
+        print(f"\n📋 {profile}")
+        print(f"  {'substring lists':<20}{legacy_time * 1e6:>8.2f} µs/url")
+        print(f"  {'classifier':<20}{classifier_time * 1e6:>8.2f} µs/url"
+              f"   ({legacy_time / classifier_time:.1f}x)")
+        print(f"  {'classifier + cache':<20}{cached_time * 1e6:>8.2f} µs/url"
+              f"   ({legacy_time / cached_time:.1f}x)")
+        print(f"  reasons: {', '.join(f'{r} {n}' for r, n in reasons.most_common())}")
+        for url, decision in disagreements:
+            print(f"  ⚠️ {decision.reason:<20} {url[:90]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+Import-time budget per main.py subcommand
+
+Runs ``python -X importtime`` for what each subcommand imports (main.py
+plus the platform module it loads lazily), reports the heaviest packages
+and fails when a subcommand pulls in a stack it does not need, exceeds
+its startup budget or cannot be imported at all.
+
+Usage:
+    python -m benchmarks.bench_import_time
+    python -m benchmarks.bench_import_time --repeat 5 --top 5
+"""
+
+import os
+import re
+import sys
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = {"selenium", "scrapy", "twisted", "telethon", "webdriver_manager", "lxml", "yt_dlp"}
+
+# Modules a subcommand imports before doing any work, its import budget
+# (ms, best of --repeat) and the heavy packages it must not load
+SUBCOMMANDS = {
+    "help": (["main"], 300, HEAVY),
+    "enqueue": (["main", "crawl_daemon"], 300, HEAVY),
+    "daemon": (["main", "crawl_daemon"], 300, HEAVY),
+    "twitter": (["main", "twitter.twitter_spider"], 600, HEAVY),
+    "telegram": (["main", "telegram.telegram_spider"], 1500, HEAVY - {"telethon"}),
+    # The Scrapy project (and yt_dlp) is only loaded once the crawl starts
+    "tiktok": (["main", "tiktok.tiktok_crawler"], 300, HEAVY),
+    "facebook": (["main", "facebook.facebook_spider"], 4000, {"telethon"}),
+}
+
+IMPORT_LINE_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure(modules):
+    """
+    Import modules in a fresh interpreter with -X importtime
+
+    Returns:
+        dict: total_ms (cumulative time of the requested imports), packages
+            (top-level import -> cumulative ms) and loaded (top-level
+            package names), or error if an import failed
+    """
+    code = "; ".join(f"import {module}" for module in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1]}
+
+    packages = {}
+    loaded = set()
+    total = 0
+    for line in proc.stderr.splitlines():
+        match = IMPORT_LINE_RE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)), match.group(3), match.group(4)
+        loaded.add(name.split(".")[0])
+        if len(indent) == 1:
+            # Top-level import of this interpreter run
+            packages[name] = packages.get(name, 0) + cumulative / 1000
+            if name != "site":
+                total += cumulative / 1000
+    return {"total_ms": total, "packages": packages, "loaded": loaded}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per subcommand (best is kept)")
+    parser.add_argument("--top", type=int, default=3, help="Heaviest packages shown")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'subcommand':<12}{'import ms':>10}{'budget':>8}  heaviest")
+    for name, (modules, budget, forbidden) in SUBCOMMANDS.items():
+        runs = [measure(modules) for _ in range(args.repeat)]
+        if "error" in runs[0]:
+            print(f"{name:<12}{'-':>10}{budget:>8}  ⚠️ {runs[0]['error']}")
+            failures.append(f"{name}: import failed ({runs[0]['error']})")
+            continue
+
+        best = min(runs, key=lambda run: run["total_ms"])
+        heaviest = sorted((item for item in best["packages"].items() if item[0] != "site"),
+                          key=lambda item: -item[1])[:args.top]
+        print(f"{name:<12}{best['total_ms']:>10.0f}{budget:>8}  "
+              + ", ".join(f"{module} {ms:.0f}ms" for module, ms in heaviest))
+
+        if best["total_ms"] > budget:
+            failures.append(f"{name}: {best['total_ms']:.0f}ms > {budget}ms budget")
+        if unexpected := sorted(best["loaded"] & forbidden):
+            failures.append(f"{name}: imports {', '.join(unexpected)}")
+
+    if failures:
+        print("\n❌ Startup check failed:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\n✅ Every subcommand is within its startup budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+"""
+Run one FacebookPageCrawler crawl against the fake site
+
+Started by bench_fake_site in a fresh process per page (Scrapy's reactor
+cannot be restarted) and prints its own timings as a JSON line.
+
+Usage:
+    python -m benchmarks.fake_facebook.crawl --base-url http://127.0.0.1:8000 --pagename bench-1
+"""
+
+import os
+import sys
+import json
+import time
+import resource
+import argparse
+from urllib.parse import urlsplit, urlunsplit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from requests.adapters import HTTPAdapter
+
+from benchmarks.fake_facebook.server import IMAGE_HOST
+from facebook.facebook_spider import FacebookPageCrawler
+from facebook.media_client import get_media_client
+
+
+RESULT_PREFIX = "BENCH_RESULT "
+
+
+class LoopbackAdapter(HTTPAdapter):
+    """Send *.localhost requests to 127.0.0.1, as Chrome does natively"""
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        if parts.hostname and parts.hostname.endswith(".localhost"):
+            request.headers["Host"] = parts.netloc
+            request.url = urlunsplit(
+                parts._replace(netloc=f"127.0.0.1:{parts.port or 80}"))
+        return super().send(request, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--base-url", required=True)
+    parser.add_argument("--pagename", default="bench-1")
+    parser.add_argument("--max-posts", type=int, default=5)
+    parser.add_argument("--gallery-mode", default=None)
+    args = parser.parse_args()
+
+    # The shared media client downloads the fake CDN images
+    get_media_client().session.mount(f"http://{IMAGE_HOST}", LoopbackAdapter())
+
+    def cpu_time():
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        return usage.ru_utime + usage.ru_stime
+
+    start, start_cpu = time.time(), cpu_time()
+    FacebookPageCrawler().crawl(
+        pagename=args.pagename,
+        max_posts=args.max_posts,
+        fresh=True,
+        base_url=args.base_url,
+        gallery_mode=args.gallery_mode,
+    )
+    wall, cpu = time.time() - start, cpu_time() - start_cpu
+
+    print(RESULT_PREFIX + json.dumps({
+        "wall": wall,
+        "cpu": cpu,
+        "total_cpu": cpu_time(),
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+#!/usr/bin/env python
+"""
+Local fake Facebook site for benchmarks
+
+Serves page feeds with N articles (more load on scroll), photo galleries of M
+images, photo pages for the linked thumbnails, a cookie banner, a login popup
+and CDN image endpoints with configurable latency. Image URLs use a ``scontent-bench.localhost`` host,
+which Chrome resolves to the loopback interface, so the crawler's CDN and
+content-image rules apply unchanged.
+
+Usage:
+    python -m benchmarks.fake_facebook.server --articles 20 --photos 8
+"""
+
+import html
+import json
+import re
+import threading
+import time
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+IMAGE_HOST = "scontent-bench.localhost"
+
+# Smallest valid JPEG; padded to the configured image size
+JPEG_HEADER = bytes.fromhex(
+    "ffd8ffe000104a46494600010100000100010000ffdb004300080606070605080707"
+    "070909080a0c140d0c0b0b0c1912130f141d1a1f1e1d1a1c1c20242e2720222c231c"
+    "1c2837292c30313434341f27393d38323c2e333432ffc0000b080001000101011100"
+    "ffc4001f0000010501010101010100000000000000000102030405060708090a0bff"
+    "da0008010100003f00d2cf20")
+JPEG_TRAILER = bytes.fromhex("ffd9")
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>
+  body {{ font-family: sans-serif; margin: 0 auto; max-width: 680px; }}
+  #cookie-banner, #login-popup {{ position: fixed; left: 0; right: 0; background: #fff;
+    border: 1px solid #ccc; padding: 16px; z-index: 10; }}
+  #cookie-banner {{ bottom: 0; }}
+  #login-popup {{ top: 30%; }}
+  .photoGrid img {{ width: 150px; height: 150px; }}
+  .viewer {{ position: fixed; inset: 0; background: #000; z-index: 20; }}
+  .viewer img {{ max-width: 100%; max-height: 100%; }}
+  article-spacer {{ display: block; height: 400px; }}
+</style></head>
+<body>
+{cookie_banner}
+<div id="feed">{articles}</div>
+<script>
+const PAGE = {page_json};
+let offset = {loaded}, loading = false;
+const total = {total};
+
+function dismissLater(id, delay) {{
+  const el = document.getElementById(id);
+  if (el) setTimeout(() => el.style.display = 'block', delay);
+}}
+{popup_script}
+
+window.addEventListener('scroll', () => {{
+  if (loading || offset >= total) return;
+  if (window.innerHeight + window.scrollY < document.body.scrollHeight - 200) return;
+  loading = true;
+  fetch(`/${{PAGE}}/more?offset=${{offset}}`).then(r => r.text()).then(chunk => {{
+    document.getElementById('feed').insertAdjacentHTML('beforeend', chunk);
+    offset += {page_size};
+    loading = false;
+  }});
+}});
+
+function openViewer(trigger) {{
+  const urls = JSON.parse(trigger.dataset.photos);
+  let index = 0;
+  const viewer = document.createElement('div');
+  viewer.className = 'viewer';
+  viewer.setAttribute('role', 'dialog');
+  viewer.setAttribute('aria-modal', 'true');
+  viewer.innerHTML = `<img data-visualcompletion="media-vc-image" src="${{urls[0]}}">`;
+  document.body.appendChild(viewer);
+  const prefetch = i => {{ if (i < urls.length) new Image().src = urls[i]; }};
+  prefetch(1);
+  const onKey = e => {{
+    if (e.key === 'ArrowRight' && index < urls.length - 1) {{
+      index += 1;
+      viewer.querySelector('img').src = urls[index];
+      prefetch(index + 1);
+    }} else if (e.key === 'Escape') {{
+      viewer.remove();
+      document.removeEventListener('keydown', onKey);
+    }}
+  }};
+  document.addEventListener('keydown', onKey);
+}}
+</script>
+</body></html>"""
+
+COOKIE_BANNER = """<div id="cookie-banner">Cookies
+  <div role="button" aria-label="Allow all cookies" tabindex="0"
+       onclick="document.getElementById('cookie-banner').remove()">Allow all cookies</div>
+</div>"""
+
+LOGIN_POPUP = """
+document.body.insertAdjacentHTML('beforeend',
+  '<div id="login-popup" style="display:none">Log in to see more' +
+  '<div role="button" aria-label="Close" onclick="this.parentNode.remove()">×</div></div>');
+dismissLater('login-popup', {delay});"""
+
+
+class FakeFacebookSite:
+    """Content and counters of the fake site (shared by request threads)"""
+
+    def __init__(self, articles=20, photos=6, page_size=5, image_latency=0.05,
+                 page_latency=0.0, image_kb=60, cookie_banner=True,
+                 login_popup=True, popup_delay=300):
+        """
+        Args:
+            articles: Posts per page feed
+            photos: Photos per post; more than 4 adds a "+N" gallery trigger
+            page_size: Posts in the initial HTML and per scroll chunk
+            image_latency: Seconds before an image response starts
+            page_latency: Seconds before a page/feed response starts
+            image_kb: Size of every image response
+            cookie_banner: Show the "Allow all cookies" banner
+            login_popup: Show a login popup with a Close button
+            popup_delay: Milliseconds before the login popup shows up
+        """
+        self.articles = articles
+        self.photos = photos
+        self.page_size = page_size
+        self.image_latency = image_latency
+        self.page_latency = page_latency
+        self.image_body = JPEG_HEADER + b"\0" * max(0, image_kb * 1024 - 200) + JPEG_TRAILER
+        self.cookie_banner = cookie_banner
+        self.login_popup = login_popup
+        self.popup_delay = popup_delay
+        self.base_url = None
+
+        self._lock = threading.Lock()
+        self.stats = {"pages": 0, "feed_chunks": 0, "photo_pages": 0,
+                      "images": 0, "image_bytes": 0}
+
+    def count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def image_url(self, page_index, post_index, photo_index, size="s960x960"):
+        port = urlsplit(self.base_url).port
+        # Asset names follow the CDN pattern url_keys expects
+        asset = f"{page_index + 1}{post_index:04d}{photo_index:03d}_{post_index + 1}_{photo_index + 1}_n.jpg"
+        return (f"http://{IMAGE_HOST}:{port}/v/t39.30808-6/{asset}"
+                f"?stp=dst-jpg_{size}&_nc_cat=1&oh=00_bench{int(time.time())}&oe=6800000")
+
+    def photo_id(self, page_index, post_index, photo_index):
+        return 7_000_000_000 + page_index * 1_000_000 + post_index * 1_000 + photo_index
+
+    def photo_html(self, photo_id):
+        page_index, rest = divmod(photo_id - 7_000_000_000, 1_000_000)
+        post_index, photo_index = divmod(rest, 1_000)
+        image = html.escape(self.image_url(page_index, post_index, photo_index))
+        return (f'<!DOCTYPE html><html><head><meta charset="utf-8">'
+                f'<meta property="og:image" content="{image}"></head>'
+                f'<body><img src="{image}"></body></html>')
+
+    def page_index(self, page):
+        match = re.search(r'(\d+)$', page)
+        return int(match.group(1)) if match else 0
+
+    def article_html(self, page, post_index):
+        page_index = self.page_index(page)
+        post_id = 9_000_000 + page_index * 10_000 + post_index
+        url = f"{self.base_url}/{page}/posts/{post_id}"
+        photos = [self.image_url(page_index, post_index, j) for j in range(self.photos)]
+        # Linked thumbnails open the viewer; the links lead to photo pages
+        thumbs = "".join(
+            f'<a href="{self.base_url}/photo/?fbid={self.photo_id(page_index, post_index, j)}&amp;set=pcb.{post_id}" '
+            f'onclick="return false"><img class="x1ey2m1c" alt="photo" '
+            f'src="{html.escape(u.replace("s960x960", "s600x600"))}"></a>'
+            for j, u in enumerate(photos[:4]))
+        more = f'<div class="more">+{self.photos - 4}</div>' if self.photos > 4 else ""
+        photo_json = html.escape(json.dumps(photos))
+        gallery = (
+            f'<div class="photoGrid" role="button" tabindex="0" data-photos="{photo_json}" '
+            f'onclick="openViewer(this)">{thumbs}{more}</div>' if photos else "")
+        return f"""
+<div role="article"><div class="x1yztbdb">
+  <div><h2><span><a role="link" aria-label="{post_index + 1}h" href="{url}">{post_index + 1}h</a></span></h2></div>
+  <div data-ad-comet-preview="message"><div><span dir="auto">
+    <div dir="auto">Benchmark post {post_index} on {page}: a paragraph of text long enough to look like content.</div>
+  </span></div></div>
+  <div>{gallery}</div>
+  <div><span dir="auto">Like</span> <span dir="auto">Comment</span> <span dir="auto">Share</span></div>
+  <article-spacer></article-spacer>
+</div></div>"""
+
+    def page_html(self, page):
+        loaded = min(self.page_size, self.articles)
+        return PAGE_TEMPLATE.format(
+            title=html.escape(page),
+            cookie_banner=COOKIE_BANNER if self.cookie_banner else "",
+            popup_script=LOGIN_POPUP.format(delay=self.popup_delay) if self.login_popup else "",
+            articles="".join(self.article_html(page, i) for i in range(loaded)),
+            page_json=json.dumps(page),
+            loaded=loaded,
+            total=self.articles,
+            page_size=self.page_size,
+        )
+
+    def feed_chunk(self, page, offset):
+        end = min(offset + self.page_size, self.articles)
+        return "".join(self.article_html(page, i) for i in range(offset, end))
+
+
+class FakeFacebookHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def site(self):
+        return self.server.site
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        path = parts.path
+
+        if path.startswith("/v/"):
+            time.sleep(self.site.image_latency)
+            body = self.site.image_body
+            self.site.count("images")
+            self.site.count("image_bytes", len(body))
+            return self._send(body, "image/jpeg", cache="no-store")
+
+        time.sleep(self.site.page_latency)
+        if path.rstrip("/") == "/photo":
+            fbid = int(parse_qs(parts.query).get("fbid", ["0"])[0])
+            self.site.count("photo_pages")
+            return self._send(self.site.photo_html(fbid).encode(), "text/html; charset=utf-8")
+
+        page_parts = [p for p in path.split("/") if p]
+        if len(page_parts) == 1:
+            self.site.count("pages")
+            return self._send(self.site.page_html(page_parts[0]).encode(), "text/html; charset=utf-8")
+        if len(page_parts) == 2 and page_parts[1] == "more":
+            offset = int(parse_qs(parts.query).get("offset", ["0"])[0])
+            self.site.count("feed_chunks")
+            return self._send(self.site.feed_chunk(page_parts[0], offset).encode(),
+                              "text/html; charset=utf-8")
+
+        self._send(b"not found", "text/plain", status=404)
+
+    def _send(self, body, content_type, status=200, cache="no-cache"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", cache)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeFacebookServer:
+    """ThreadingHTTPServer running the fake site in a background thread"""
+
+    def __init__(self, site=None, host="127.0.0.1", port=0):
+        self.site = site or FakeFacebookSite()
+        self.httpd = ThreadingHTTPServer((host, port), FakeFacebookHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.site = self.site
+        self.site.base_url = f"http://{host}:{self.httpd.server_address[1]}"
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return self.site.base_url
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, name="fake-facebook", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--articles", type=int, default=20)
+    parser.add_argument("--photos", type=int, default=6)
+    parser.add_argument("--image-latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    site = FakeFacebookSite(articles=args.articles, photos=args.photos,
+                            image_latency=args.image_latency)
+    server = FakeFacebookServer(site, port=args.port).start()
+    print(f"🧪 Fake Facebook at {server.base_url}/bench-1 (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+
+logger = logging.getLogger(__name__)
+
+# Resolved chromedriver path, reused by later runs without a version check
+CHROMEDRIVER_CACHE = "downloads/chromedriver.json"
+
+# Persistent Chrome profiles (cookies, consent), one directory per browser
+CHROME_PROFILE_DIR = "downloads/chrome_profiles"
+
+_resolved = None
+_resolve_lock = threading.Lock()
+
+
+def _is_executable(path):
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def resolve_chromedriver(refresh=False, cache_path=None):
+    """
+    Path of a usable chromedriver, without a network round-trip when possible
+
+    Tried in order: ``CHROMEDRIVER_PATH``, the path cached by an earlier run,
+    a chromedriver on PATH, and finally webdriver_manager (which checks the
+    installed Chrome version online) whose result is cached for next time.
+    Pass ``refresh`` after a Chrome upgrade breaks the cached driver.
+
+    Args:
+        refresh: Ignore the cache and ask webdriver_manager again
+        cache_path: Cache file (defaults to CHROMEDRIVER_CACHE or the
+            ``CHROMEDRIVER_CACHE`` environment variable)
+
+    Returns:
+        str: chromedriver executable path
+    """
+    global _resolved
+    cache_path = cache_path or os.environ.get("CHROMEDRIVER_CACHE", CHROMEDRIVER_CACHE)
+
+    with _resolve_lock:
+        if _resolved and not refresh and _is_executable(_resolved):
+            return _resolved
+
+        start = time.time()
+        path, source = None, None
+
+        if not refresh:
+            if _is_executable(os.environ.get("CHROMEDRIVER_PATH")):
+                path, source = os.environ["CHROMEDRIVER_PATH"], "env"
+            elif _is_executable(cached := _read_cache(cache_path)):
+                path, source = cached, "cache"
+            elif _is_executable(found := shutil.which("chromedriver")):
+                path, source = found, "PATH"
+
+        if path is None:
+            from webdriver_manager.chrome import ChromeDriverManager
+
+            path, source = ChromeDriverManager().install(), "webdriver_manager"
+            _write_cache(cache_path, path)
+
+        logger.info(f"🔧 chromedriver from {source} in {time.time() - start:.2f}s: {path}")
+        _resolved = path
+        return path
+
+
+def _read_cache(cache_path):
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            return json.load(f).get("path")
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(cache_path, path):
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    with open(cache_path, "w", encoding="utf-8") as f:
+        json.dump({"path": path, "resolved_at": time.time()}, f)
+
+
+def chrome_profile_dir(name, root=None):
+    """
+    Persistent ``--user-data-dir`` for one browser
+
+    Chrome locks a profile directory while it runs, so concurrent browsers
+    need distinct names (e.g. "facebook-0", "facebook-1").
+
+    Args:
+        name: Profile name
+        root: Parent directory (defaults to CHROME_PROFILE_DIR or the
+            ``CHROME_PROFILE_DIR`` environment variable)
+
+    Returns:
+        str: Absolute profile directory, created if missing
+    """
+    root = root or os.environ.get("CHROME_PROFILE_DIR", CHROME_PROFILE_DIR)
+    path = os.path.abspath(os.path.join(root, name))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    start = time.time()
+    print(resolve_chromedriver(refresh="--refresh" in sys.argv))
+    print(f"⏱️ {time.time() - start:.2f}s")
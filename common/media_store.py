@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+
+
+MEDIA_STORE_DIR = "downloads/media_store"
+
+
+class MediaStore:
+    """
+    Content-addressed media storage shared by all platforms
+
+    Every file is stored once under ``<root>/<aa>/<bb>/<sha256><ext>``. A
+    SQLite index maps source keys (URLs, or platform IDs such as a Telegram
+    photo id) to content hashes, so a known key skips the download entirely
+    and identical bytes fetched from different URLs are kept once. Callers
+    that need a platform-specific file name get a hard link to the blob.
+    """
+
+    def __init__(self, root=MEDIA_STORE_DIR):
+        """
+        Args:
+            root: Directory holding the blobs and the index database
+        """
+        self.root = root
+        self.tmp_dir = os.path.join(root, "tmp")
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(root, "index.sqlite3"),
+            timeout=30,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                digest TEXT PRIMARY KEY,
+                ext TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS sources (
+                source_key TEXT PRIMARY KEY,
+                digest TEXT NOT NULL REFERENCES blobs(digest),
+                created_at REAL NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+        self.stats = {"hits": 0, "stored": 0, "deduplicated": 0}
+
+    def blob_path(self, digest, ext):
+        """Sharded path of a blob: <root>/<aa>/<bb>/<digest><ext>"""
+        return os.path.join(self.root, digest[:2], digest[2:4], f"{digest}{ext}")
+
+    def lookup(self, source_key):
+        """
+        Find the blob already stored for a source key
+
+        Args:
+            source_key: URL or platform media ID
+
+        Returns:
+            str: Blob path, or None if the key is unknown
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT b.digest, b.ext FROM sources s "
+                "JOIN blobs b ON b.digest = s.digest WHERE s.source_key = ?",
+                (source_key,),
+            ).fetchone()
+
+        if not row:
+            return None
+
+        path = self.blob_path(*row)
+        if not os.path.exists(path):
+            return None
+
+        self.stats["hits"] += 1
+        return path
+
+    def put_stream(self, source_key, chunks, ext=""):
+        """
+        Store a byte stream, hashing it while it is written
+
+        Args:
+            source_key: URL or platform media ID the bytes came from
+            chunks: Iterable of bytes
+            ext: File extension including the dot (e.g. ".jpg")
+
+        Returns:
+            str: Blob path
+        """
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    if chunk:
+                        digest.update(chunk)
+                        size += len(chunk)
+                        f.write(chunk)
+            return self._commit(source_key, tmp_path, digest.hexdigest(), size, ext)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def put_file(self, source_key, path, ext=None):
+        """
+        Move an already downloaded file into the store
+
+        Args:
+            source_key: URL or platform media ID the file came from
+            path: File to ingest (it is moved, not copied)
+            ext: File extension (defaults to the file's own)
+
+        Returns:
+            str: Blob path
+        """
+        if ext is None:
+            ext = os.path.splitext(path)[1]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+
+        try:
+            return self._commit(
+                source_key, path, digest.hexdigest(), os.path.getsize(path), ext)
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def link(self, blob_path, dest_path):
+        """
+        Expose a blob under a platform-specific path without copying bytes
+
+        Args:
+            blob_path: Path returned by lookup/put_*
+            dest_path: Desired file path
+
+        Returns:
+            str: dest_path
+        """
+        os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+
+        if os.path.exists(dest_path):
+            if os.path.samefile(blob_path, dest_path):
+                return dest_path
+            os.remove(dest_path)
+
+        try:
+            os.link(blob_path, dest_path)
+        except OSError:
+            # Different filesystem or no hard link support
+            shutil.copyfile(blob_path, dest_path)
+        return dest_path
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _commit(self, source_key, tmp_path, digest, size, ext):
+        path = self.blob_path(digest, ext)
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT ext FROM blobs WHERE digest = ?", (digest,)).fetchone()
+
+            if row and os.path.exists(self.blob_path(digest, row[0])):
+                path = self.blob_path(digest, row[0])
+                self.stats["deduplicated"] += 1
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO blobs (digest, ext, size, created_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (digest, ext, size, time.time()),
+                )
+                self.stats["stored"] += 1
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sources (source_key, digest, created_at) "
+                "VALUES (?, ?, ?)",
+                (source_key, digest, time.time()),
+            )
+            self._conn.commit()
+
+        return path
+
+
+_media_store = None
+_media_store_lock = threading.Lock()
+
+
+def get_media_store():
+    """
+    Media store shared by every crawler in this process
+
+    Returns:
+        MediaStore
+    """
+    global _media_store
+    with _media_store_lock:
+        if _media_store is None:
+            _media_store = MediaStore(
+                os.environ.get("MEDIA_STORE_DIR", MEDIA_STORE_DIR))
+        return _media_store
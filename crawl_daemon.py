@@ -0,0 +1,328 @@
+#!/usr/bin/env python
+"""
+Long-running crawl daemon
+
+Keeps one Twisted reactor, one Chrome driver pool and the shared media HTTP
+session alive and runs crawl jobs as they are appended to a JSON-lines queue
+file, so a job costs a page load instead of a Python, Scrapy and Chrome
+startup.
+
+Usage:
+    python main.py daemon
+    python main.py enqueue facebook --pagename <pagename> --max_posts 10
+    python main.py enqueue twitter --profile <profile_name> --limit 50
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+
+QUEUE_PATH = "downloads/crawl_queue.jsonl"
+POLL_INTERVAL = 2.0
+REACTOR = "twisted.internet.asyncioreactor.AsyncioSelectorReactor"
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFile:
+    """
+    Append-only JSON-lines job queue
+
+    Producers append one job per line; the daemon reads from a byte offset
+    persisted next to the queue (``<queue>.offset``), so a restart resumes
+    after the last job it picked up. Finished jobs are appended to
+    ``<queue>.results``.
+    """
+
+    def __init__(self, path=QUEUE_PATH):
+        self.path = path
+        self.offset_path = f"{path}.offset"
+        self.results_path = f"{path}.results"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def submit(self, platform, **options):
+        """
+        Append a job
+
+        Args:
+            platform: "facebook", "twitter", "telegram" or "tiktok"
+            **options: Arguments of the platform's crawl command
+
+        Returns:
+            dict: The queued job
+        """
+        job = {"id": uuid.uuid4().hex[:12], "platform": platform,
+               "submitted_at": time.time(), **options}
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(job, ensure_ascii=False) + "\n")
+        return job
+
+    def read_new(self):
+        """
+        Jobs appended since the last call
+
+        Returns:
+            list: Job dicts (malformed lines are logged and skipped)
+        """
+        if not os.path.exists(self.path):
+            return []
+
+        offset = self._read_offset()
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+
+        # A producer may be mid-write: only consume complete lines
+        end = data.rfind(b"\n") + 1
+        if not end:
+            return []
+
+        jobs = []
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                jobs.append(json.loads(line))
+            except ValueError:
+                logger.error(f"❌ Skipping malformed job: {line[:200]!r}")
+
+        self._write_offset(offset + end)
+        return jobs
+
+    def record_result(self, job, status, seconds, error=None):
+        result = {"id": job.get("id"), "platform": job.get("platform"),
+                  "status": status, "seconds": round(seconds, 3),
+                  "finished_at": time.time()}
+        if error:
+            result["error"] = error
+        with open(self.results_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+    def _read_offset(self):
+        try:
+            with open(self.offset_path, encoding="utf-8") as f:
+                offset = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+        # Queue file truncated or replaced: start over
+        return offset if offset <= os.path.getsize(self.path) else 0
+
+    def _write_offset(self, offset):
+        tmp_path = f"{self.offset_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(str(offset))
+        os.replace(tmp_path, self.offset_path)
+
+
+class TelegramWorker:
+    """
+    One logged-in Telegram client on a dedicated event loop thread
+
+    Telethon clients are bound to the loop they were started on, so every
+    channel job runs on this loop and reuses the same session.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.client = None
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name="telegram-loop", daemon=True)
+        self._thread.start()
+
+    def crawl(self, channel, limit=None):
+        """Blocking: run one channel crawl on the worker loop"""
+        return asyncio.run_coroutine_threadsafe(
+            self._crawl(channel, limit), self.loop).result()
+
+    async def _crawl(self, channel, limit):
+        from telegram.telegram_spider import TelegramCrawler
+
+        crawler = TelegramCrawler()
+        if self.client is None:
+            self.client = await crawler.connect()
+        await crawler._crawl_async(channel, limit, client=self.client)
+
+    def stop(self):
+        if self.client is not None:
+            asyncio.run_coroutine_threadsafe(self.client.disconnect(), self.loop).result(timeout=10)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+class CrawlDaemon:
+    """
+    Run queued crawl jobs in one process
+
+    Facebook and TikTok jobs run as Scrapy crawls on the shared reactor, one
+    at a time per platform; Facebook crawls share the keep-alive driver pool
+    and media session (SELENIUM_KEEP_ALIVE). Twitter and Telegram jobs run on
+    reactor threads.
+    """
+
+    def __init__(self, queue_path=QUEUE_PATH, poll_interval=POLL_INTERVAL, trace=None):
+        """
+        Args:
+            queue_path: JSON-lines job file
+            poll_interval: Seconds between queue checks
+            trace: JSON-lines file for Facebook stage timings
+        """
+        self.queue = JobQueueFile(queue_path)
+        self.poll_interval = poll_interval
+        self.trace = trace
+        self.crawl_state = None
+        self.telegram = None
+        self.running = {}
+        self.stats = {"started": 0, "succeeded": 0, "failed": 0}
+
+    def run(self):
+        """Start the reactor and serve jobs until interrupted"""
+        from scrapy.utils.log import configure_logging
+        from scrapy.utils.reactor import install_reactor
+
+        install_reactor(REACTOR)
+        configure_logging(install_root_handler=False)
+
+        from twisted.internet import reactor
+        from twisted.internet.defer import DeferredLock
+        from twisted.internet.task import LoopingCall
+
+        from facebook.crawl_state import CrawlState, CRAWL_STATE_PATH
+
+        self.crawl_state = CrawlState(
+            os.environ.get("FACEBOOK_CRAWL_STATE", CRAWL_STATE_PATH))
+        self._locks = {"facebook": DeferredLock(), "tiktok": DeferredLock()}
+
+        reactor.suggestThreadPoolSize(16)
+        reactor.addSystemEventTrigger("before", "shutdown", self.shutdown)
+        LoopingCall(self.poll).start(self.poll_interval)
+
+        print(f"🛰️ Crawl daemon watching {self.queue.path} (Ctrl+C to stop)")
+        reactor.run()
+
+    def poll(self):
+        for job in self.queue.read_new():
+            self.dispatch(job)
+
+    def dispatch(self, job):
+        """
+        Start one job
+
+        Returns:
+            Deferred: Fires when the job finished (never errbacks)
+        """
+        from twisted.internet import defer
+
+        handlers = {
+            "facebook": self._facebook,
+            "tiktok": self._tiktok,
+            "twitter": self._twitter,
+            "telegram": self._telegram,
+        }
+        platform = job.get("platform")
+        job_id = job.setdefault("id", uuid.uuid4().hex[:12])
+        start = time.time()
+        self.running[job_id] = job
+        self.stats["started"] += 1
+        print(f"▶️ Job {job_id}: {platform} {self._describe(job)}")
+
+        def finished(_):
+            self.stats["succeeded"] += 1
+            self.queue.record_result(job, "done", time.time() - start)
+            print(f"✅ Job {job_id} done in {time.time() - start:.1f}s")
+
+        def failed(failure):
+            self.stats["failed"] += 1
+            error = f"{failure.type.__name__}: {failure.value}"
+            self.queue.record_result(job, "failed", time.time() - start, error)
+            print(f"❌ Job {job_id} failed after {time.time() - start:.1f}s: {error}")
+
+        if platform not in handlers:
+            d = defer.fail(ValueError(f"Unknown platform {platform!r}"))
+        else:
+            d = defer.maybeDeferred(handlers[platform], job)
+        d.addCallbacks(finished, failed)
+        d.addBoth(lambda _: self.running.pop(job_id, None))
+        return d
+
+    def _facebook(self, job):
+        from scrapy.crawler import CrawlerRunner
+        from facebook.facebook_spider import FacebookPageCrawler, FacebookPageSpider
+
+        settings = FacebookPageCrawler.build_settings(
+            snapshot=job.get("snapshot", False),
+            gallery_mode=job.get("gallery_mode"),
+            trace=self.trace,
+            crawl_profile=job.get("crawl_profile"),
+        )
+        settings["SELENIUM_KEEP_ALIVE"] = True
+        kwargs = FacebookPageCrawler.spider_kwargs(
+            job["pagename"],
+            max_posts=job.get("max_posts", 1),
+            since=job.get("since"),
+            crawl_state=None if job.get("fresh") else self.crawl_state,
+        )
+        # One crawl at a time: the pool is shared, leftovers are reclaimed
+        # when each crawl closes
+        return self._locks["facebook"].run(
+            lambda: CrawlerRunner(settings).crawl(FacebookPageSpider, **kwargs))
+
+    def _tiktok(self, job):
+        from scrapy.crawler import CrawlerRunner
+        from tiktok.tiktok_crawler import TikTokCrawler
+        from tiktok.tiktok_scraper.tiktok_scraper.spiders.tiktok_spider import TikTokSpider
+
+        settings = TikTokCrawler.build_settings()
+        return self._locks["tiktok"].run(
+            lambda: CrawlerRunner(settings).crawl(
+                TikTokSpider, profile=job.get("profile"), hashtag=job.get("hashtag"),
+                limit=job.get("limit")))
+
+    def _twitter(self, job):
+        from twisted.internet.threads import deferToThread
+        from twitter.twitter_spider import TwitterCrawler
+
+        return deferToThread(
+            _run_blocking, TwitterCrawler.crawl,
+            profile=job.get("profile"), hashtag=job.get("hashtag"), limit=job.get("limit"),
+            backfill=job.get("backfill", False))
+
+    def _telegram(self, job):
+        from twisted.internet.threads import deferToThread
+
+        if self.telegram is None:
+            self.telegram = TelegramWorker()
+        return deferToThread(
+            _run_blocking, self.telegram.crawl, job["channel"], job.get("limit"))
+
+    def shutdown(self):
+        print(f"🛑 Stopping daemon: {self.stats['succeeded']} jobs done, "
+              f"{self.stats['failed']} failed, {len(self.running)} interrupted")
+        from facebook.facebook_spider import SimpleSeleniumMiddleware
+
+        SimpleSeleniumMiddleware.close_shared()
+        if self.telegram is not None:
+            self.telegram.stop()
+        if self.crawl_state is not None:
+            self.crawl_state.close()
+
+    @staticmethod
+    def _describe(job):
+        return " ".join(f"{k}={v}" for k, v in job.items()
+                        if k not in ("id", "platform", "submitted_at"))
+
+
+def _run_blocking(func, *args, **kwargs):
+    """Run a CLI-style crawl function on a worker thread"""
+    try:
+        return func(*args, **kwargs)
+    except SystemExit as e:
+        # The Twitter crawler exits the process on API errors
+        raise RuntimeError(f"Crawler exited with status {e.code}") from None
+
+
+if __name__ == "__main__":
+    CrawlDaemon().run()
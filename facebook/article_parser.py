@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+
+from collections import namedtuple
+
+
+# Everything parse_article needs from one article, collected in one walk
+ParsedArticle = namedtuple("ParsedArticle", [
+    "url",            # First post permalink (raw href)
+    "header_label",   # aria-label of the header link (publish date label)
+    "content",        # Post text, from the most specific content block found
+    "texts",          # Stripped non-empty text nodes, in document order
+    "image_urls",     # Candidate image src/data-src/style values, in selector order
+    "match_href",     # First /posts/ or /photo/ href, used to match WebElements
+    "leading_text",   # First 10 text nodes joined, fallback for matching
+])
+
+# Permalink sources, most specific first
+URL_HEADER, URL_SPAN_LINK, URL_POSTS, URL_PHOTOS = range(4)
+
+# Content sources, most specific first (same order as the old XPath list)
+(CONTENT_MESSAGE, CONTENT_USER_CONTENT, CONTENT_TEXT_EXPOSED,
+ CONTENT_SPAN_DIR_AUTO, CONTENT_TEXT_ALIGN, CONTENT_ANY) = range(6)
+
+# Image sources, in the order the old XPath list returned them
+(IMG_SCONTENT_SRC, IMG_FBCDN_SRC, IMG_FACEBOOK_SRC, IMG_SCONTENT_DATA_SRC,
+ IMG_FBCDN_DATA_SRC, IMG_CLASS_SRC, IMG_BACKGROUND_STYLE) = range(7)
+
+SMALL_IMAGE_SIZES = ("16x16", "20x20", "24x24", "32x32")
+
+
+class _Context:
+    """Counters for the ancestors that make a text node content"""
+
+    __slots__ = ("div", "message", "message_span", "user_content",
+                 "user_content_span", "text_exposed", "span_dir_auto",
+                 "text_align")
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+
+def parse_article_element(root):
+    """
+    Extract URL, header label, content, text candidates and image URLs from
+    one article in a single tree walk
+
+    Produces the same values as the URL, content and image XPath lists that
+    FacebookPageSpider used to run one by one, without re-scanning the
+    subtree for each selector.
+
+    Args:
+        root: lxml element of the article (``selector.root`` for Scrapy)
+
+    Returns:
+        ParsedArticle
+    """
+    urls = [None] * 4
+    header_label = None
+    content = [[] for _ in range(6)]
+    texts = []
+    raw_texts = []
+    images = [[] for _ in range(7)]
+    match_href = None
+
+    ctx = _Context()
+    # Per open element: the flags it turned on, undone at its end event
+    stack = []
+
+    def add_text(text):
+        raw_texts.append(text)
+        stripped = text.strip()
+        if stripped:
+            texts.append(stripped)
+            if len(text) > 10:
+                content[CONTENT_ANY].append(text)
+        if ctx.message_span:
+            content[CONTENT_MESSAGE].append(text)
+        if ctx.user_content_span:
+            content[CONTENT_USER_CONTENT].append(text)
+        if ctx.text_exposed:
+            content[CONTENT_TEXT_EXPOSED].append(text)
+        if ctx.span_dir_auto:
+            content[CONTENT_SPAN_DIR_AUTO].append(text)
+        if ctx.text_align:
+            content[CONTENT_TEXT_ALIGN].append(text)
+
+    for event, el in _walk(root):
+        if event == "end":
+            if el is root:
+                break
+            for name in stack.pop():
+                setattr(ctx, name, getattr(ctx, name) - 1)
+            if el.tail:
+                add_text(el.tail)
+            continue
+
+        if el is root:
+            stack.append(())
+            if root.text:
+                add_text(root.text)
+            continue
+
+        tag = el.tag
+        if not isinstance(tag, str):
+            # Comments and processing instructions: only their tail is text
+            stack.append(())
+            continue
+
+        get = el.get
+        opened = []
+
+        if tag == "div":
+            cls = get("class") or ""
+            style = get("style") or ""
+            opened.append("div")
+            if get("data-ad-comet-preview") == "message":
+                opened.append("message")
+            if "userContent" in cls:
+                opened.append("user_content")
+            if "text_exposed_root" in cls:
+                opened.append("text_exposed")
+            if "text-align" in style:
+                opened.append("text_align")
+
+        elif tag == "span":
+            if get("dir") == "auto":
+                opened.append("span_dir_auto")
+                if ctx.message:
+                    opened.append("message_span")
+            if ctx.user_content:
+                opened.append("user_content_span")
+
+        elif tag == "a":
+            parent = el.getparent()
+            in_span = parent is not None and parent.tag == "span"
+            href = get("href")
+            if in_span and get("role") == "link":
+                label = get("aria-label")
+                # Any open div below the article root also contains the span
+                if label is not None and label != "Enlarge" and ctx.div:
+                    if header_label is None:
+                        header_label = label
+                    if href is not None and urls[URL_HEADER] is None:
+                        urls[URL_HEADER] = href
+                if href is not None and urls[URL_SPAN_LINK] is None:
+                    urls[URL_SPAN_LINK] = href
+            if href is not None:
+                if urls[URL_POSTS] is None and "/posts/" in href:
+                    urls[URL_POSTS] = href
+                if urls[URL_PHOTOS] is None and "/photos/" in href:
+                    urls[URL_PHOTOS] = href
+                if match_href is None and ("/posts/" in href or "/photo/" in href):
+                    match_href = href
+
+        elif tag == "img":
+            _collect_img(el, images)
+
+        style = get("style")
+        if style and "background-image" in style and "scontent" in style \
+                and "emoji" not in style:
+            images[IMG_BACKGROUND_STYLE].append(style)
+
+        for name in opened:
+            setattr(ctx, name, getattr(ctx, name) + 1)
+        stack.append(opened)
+
+        if el.text:
+            add_text(el.text)
+
+    url = next((u for u in urls if u is not None), None)
+    description = ""
+    for bucket in content:
+        if bucket:
+            description = " ".join(bucket).strip()
+            break
+
+    return ParsedArticle(
+        url=url,
+        header_label=header_label,
+        content=description,
+        texts=texts,
+        image_urls=[u for bucket in images for u in bucket],
+        match_href=match_href,
+        leading_text=" ".join(raw_texts[:10]),
+    )
+
+
+def _walk(root):
+    """
+    Yield ("start"|"end", node) in document order
+
+    Unlike etree.iterwalk this also yields comments, whose tails are text
+    nodes XPath ``text()`` sees.
+    """
+    yield "start", root
+    stack = [(root, iter(root))]
+    while stack:
+        node, children = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            yield "end", node
+        else:
+            yield "start", child
+            stack.append((child, iter(child)))
+
+
+def _collect_img(el, images):
+    src = el.get("src")
+    data_src = el.get("data-src")
+
+    if src is not None:
+        if "scontent" in src and not any(s in src for s in SMALL_IMAGE_SIZES):
+            images[IMG_SCONTENT_SRC].append(src)
+        if "fbcdn.net" in src and "emoji" not in src and "icon" not in src:
+            images[IMG_FBCDN_SRC].append(src)
+        if "facebook.com" in src and "emoji" not in src:
+            images[IMG_FACEBOOK_SRC].append(src)
+
+        cls = el.get("class") or ""
+        alt = el.get("alt") or ""
+        if "x" in cls and "emoji" not in alt and "emoji" not in cls \
+                and "icon" not in cls:
+            images[IMG_CLASS_SRC].append(src)
+
+    if data_src is not None and "emoji" not in data_src:
+        if "scontent" in data_src:
+            images[IMG_SCONTENT_DATA_SRC].append(data_src)
+        if "fbcdn" in data_src:
+            images[IMG_FBCDN_DATA_SRC].append(data_src)
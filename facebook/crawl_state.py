@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+
+CRAWL_STATE_PATH = "downloads/facebook_state.sqlite3"
+
+
+class CrawlState:
+    """
+    Per-page memory of what earlier Facebook crawls already handled
+
+    Each stored post keeps its permalink and publish time, so the next run
+    can stop at the last seen post before any gallery extraction or upload
+    happens again. Media is deduplicated by the shared media store, keyed by
+    canonical_image_key(), not here.
+    """
+
+    def __init__(self, path=CRAWL_STATE_PATH):
+        """
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS posts (
+                page TEXT NOT NULL,
+                post_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                published_at REAL,
+                crawled_at REAL NOT NULL,
+                PRIMARY KEY (page, post_id)
+            );
+        """)
+        self._conn.commit()
+
+    def known_posts(self, page):
+        """
+        Posts already stored for a page
+
+        Args:
+            page: Facebook page name
+
+        Returns:
+            dict: post_id -> publish time (epoch seconds, or None)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT post_id, published_at FROM posts WHERE page = ?",
+                (page,),
+            ).fetchall()
+        return dict(rows)
+
+    def record_post(self, page, post_id, url, published_at=None):
+        """
+        Remember a crawled post
+
+        Args:
+            page: Facebook page name
+            post_id: ID from url_keys.extract_post_id (or the permalink)
+            url: Post permalink
+            published_at: datetime of the post
+        """
+        if isinstance(published_at, datetime):
+            published_at = published_at.timestamp()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO posts "
+                "(page, post_id, url, published_at, crawled_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (page, post_id, url, published_at, time.time()),
+            )
+            self._conn.commit()
+
+    def page_summary(self, page):
+        """
+        Counters for one page
+
+        Returns:
+            dict: posts and the newest stored publish time
+        """
+        with self._lock:
+            posts, newest = self._conn.execute(
+                "SELECT COUNT(*), MAX(published_at) FROM posts WHERE page = ?",
+                (page,),
+            ).fetchone()
+        return {
+            "posts": posts,
+            "newest": datetime.fromtimestamp(newest).isoformat() if newest else None,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+if __name__ == "__main__":
+    import sys
+
+    state = CrawlState(os.environ.get("FACEBOOK_CRAWL_STATE", CRAWL_STATE_PATH))
+    for page in sys.argv[1:]:
+        print(f"📚 {page}: {json.dumps(state.page_summary(page))}")
+    state.close()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+
+# Worker threads per queue and concurrent downloads allowed per CDN host,
+# across every queue of the process
+DOWNLOAD_WORKERS = 4
+DOWNLOADS_PER_HOST = 2
+
+# Shared by all queues, so concurrent posts and pool drivers stay within
+# the per-host limit together
+_host_lock = threading.Lock()
+_host_slots = {}
+
+
+def host_slot(host, limit=DOWNLOADS_PER_HOST):
+    """
+    Process-wide semaphore limiting concurrent downloads from one host
+
+    Args:
+        host: Network location ("scontent.xx.fbcdn.net")
+        limit: Concurrent downloads allowed
+
+    Returns:
+        threading.BoundedSemaphore
+    """
+    with _host_lock:
+        slot = _host_slots.get((host, limit))
+        if slot is None:
+            slot = _host_slots[(host, limit)] = threading.BoundedSemaphore(limit)
+        return slot
+
+
+class DownloadQueue:
+    """
+    Background image downloads for one post
+
+    The DOM side only enqueues URLs and moves on to the next photo; a bounded
+    thread pool downloads them. Together with every other queue in the
+    process, no more than ``per_host`` requests run against the same CDN
+    host at once. ``wait`` returns the saved paths in the order
+    the URLs were enqueued, i.e. gallery order.
+    """
+
+    def __init__(self, download_func, max_workers=DOWNLOAD_WORKERS, per_host=DOWNLOADS_PER_HOST,
+                 key_func=None):
+        """
+        Args:
+            download_func: Callable(url) -> local path or None
+            max_workers: Number of download threads
+            per_host: Concurrent downloads allowed per host, shared with
+                every queue using the same limit
+            key_func: Callable(url) -> dedupe key (defaults to the URL itself)
+        """
+        self.download_func = download_func
+        self.key_func = key_func or (lambda url: url)
+        self.per_host = per_host
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="fb-download")
+        self._futures = []
+        self._seen = set()
+
+    def enqueue(self, url):
+        """
+        Schedule a download unless the same image is already queued
+
+        Args:
+            url: Image URL
+
+        Returns:
+            bool: True if a new download was scheduled
+        """
+        if not url:
+            return False
+        key = self.key_func(url)
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        self._futures.append(self._executor.submit(self._download, url))
+        return True
+
+    def wait(self, timeout=None):
+        """
+        Block until every queued download finished and shut the workers down
+
+        Args:
+            timeout: Seconds to wait before giving up on pending downloads
+
+        Returns:
+            list: Saved file paths in enqueue order (failed downloads skipped)
+        """
+        done, not_done = wait(self._futures, timeout=timeout)
+        for future in not_done:
+            future.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+        if not_done:
+            print(f"⏰ {len(not_done)} downloads still pending after {timeout}s")
+
+        paths = []
+        for future in self._futures:
+            if future in done and not future.exception():
+                if path := future.result():
+                    paths.append(path)
+        return paths
+
+    def __len__(self):
+        return len(self._futures)
+
+    def _download(self, url):
+        with host_slot(urlparse(url).netloc, self.per_host):
+            return self.download_func(url)
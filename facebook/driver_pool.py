@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from selenium.common.exceptions import WebDriverException
+
+
+logger = logging.getLogger(__name__)
+
+
+class DriverPoolTimeout(Exception):
+    """Raised when no driver becomes available within the acquire timeout"""
+
+
+class DriverPool:
+    """
+    Bounded pool of reusable Chrome drivers
+
+    Drivers are created lazily up to ``size``. A leased driver is health
+    checked before it is handed out, recycled after ``max_pages`` page loads
+    and replaced when it crashes, so one bad browser never blocks the pool.
+    """
+
+    def __init__(self, driver_factory, size=2, max_pages=50, acquire_timeout=300,
+                 on_quit=None):
+        """
+        Args:
+            driver_factory: Callable returning a new WebDriver instance
+            size: Maximum number of live drivers
+            max_pages: Recycle a driver after serving this many pages (0 = never)
+            acquire_timeout: Seconds to wait for a free driver before giving up
+            on_quit: Callable(driver) run after a driver was quit
+        """
+        self.driver_factory = driver_factory
+        self.on_quit = on_quit
+        self.size = max(1, int(size))
+        self.max_pages = int(max_pages or 0)
+        self.acquire_timeout = acquire_timeout
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._page_counts = {}
+        self._leased = set()
+        # Futures of drivers warm() is still starting, oldest first
+        self._warming = deque()
+        self._closed = False
+
+        self.stats = {
+            "created": 0,
+            "recycled": 0,
+            "replaced": 0,
+            "leases": 0,
+            "prewarmed": 0,
+            "startup_seconds": 0.0,
+        }
+
+    def acquire(self, timeout=None):
+        """
+        Lease a healthy driver, blocking until one is free
+
+        Args:
+            timeout: Seconds to wait (defaults to ``acquire_timeout``)
+
+        Returns:
+            WebDriver: Driver reserved for the caller until ``release``
+        """
+        if self._closed:
+            raise RuntimeError("Driver pool is closed")
+
+        timeout = self.acquire_timeout if timeout is None else timeout
+        if not self._slots.acquire(timeout=timeout):
+            raise DriverPoolTimeout(
+                f"No driver available after {timeout}s (pool size {self.size})")
+
+        try:
+            driver = self._checkout()
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._leased.add(driver)
+            self.stats["leases"] += 1
+        return driver
+
+    def release(self, driver, discard=False):
+        """
+        Return a leased driver to the pool
+
+        Args:
+            driver: Driver previously returned by ``acquire``
+            discard: Quit the driver instead of reusing it (e.g. after a crash)
+        """
+        with self._lock:
+            if driver not in self._leased:
+                return
+            self._leased.discard(driver)
+            self._page_counts[driver] = self._page_counts.get(driver, 0) + 1
+            pages = self._page_counts[driver]
+            recycle = bool(self.max_pages and pages >= self.max_pages)
+            if discard:
+                self.stats["replaced"] += 1
+            elif recycle:
+                self.stats["recycled"] += 1
+
+        try:
+            if discard:
+                self._quit(driver)
+            elif recycle:
+                logger.info(f"♻️ Recycling driver after {pages} pages")
+                self._quit(driver)
+            elif self._closed:
+                self._quit(driver)
+            else:
+                self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    def warm(self, count=None, wait=True):
+        """
+        Start browsers before the first request needs them
+
+        Launches up to ``count`` drivers in parallel (never more than free
+        pool slots) and parks them as idle. An ``acquire`` that finds no idle
+        driver while one is still starting takes that driver when it is up
+        rather than launching another browser from cold.
+
+        Args:
+            count: Drivers to start (defaults to the pool size)
+            wait: Block until the browsers are up; with False the slots are
+                reserved before returning and the browsers start in the
+                background
+
+        Returns:
+            int: Number of drivers started (launched, when not waiting)
+        """
+        count = self.size if count is None else min(int(count), self.size)
+        slots = 0
+        while slots < count and self._slots.acquire(blocking=False):
+            slots += 1
+        if not slots:
+            return 0
+
+        futures = [Future() for _ in range(slots)]
+        with self._lock:
+            self._warming.extend(futures)
+
+        def start_one(future):
+            try:
+                driver = self._create()
+            except Exception as e:
+                logger.warning(f"⚠️ Driver prewarm failed: {e}")
+                self._hand_over(future, error=e)
+                return False
+            else:
+                with self._lock:
+                    self.stats["prewarmed"] += 1
+                self._hand_over(future, driver=driver)
+                if self._closed:
+                    self.close()
+                return True
+            finally:
+                self._slots.release()
+
+        executor = ThreadPoolExecutor(max_workers=slots, thread_name_prefix="driver-warm")
+        results = [executor.submit(start_one, future) for future in futures]
+        executor.shutdown(wait=wait)
+        if not wait:
+            return slots
+        return sum(result.result() for result in results)
+
+    def is_healthy(self, driver):
+        """
+        Check that the browser behind a driver still answers commands
+
+        Args:
+            driver: WebDriver instance
+
+        Returns:
+            bool: True if the session is alive
+        """
+        try:
+            driver.execute_script("return 1;")
+            return True
+        except WebDriverException:
+            return False
+        except Exception:
+            return False
+
+    def leased_drivers(self):
+        """Snapshot of drivers currently leased out"""
+        with self._lock:
+            return list(self._leased)
+
+    def close(self):
+        """Quit every idle driver; leased drivers are quit when released"""
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(driver)
+
+    def _hand_over(self, future, driver=None, error=None):
+        """Give a prewarmed driver to the acquire waiting on it, or park it"""
+        with self._lock:
+            claimed = future not in self._warming
+            if not claimed:
+                self._warming.remove(future)
+        if claimed:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(driver)
+        elif driver is not None:
+            self._idle.put(driver)
+
+    def _checkout(self):
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    warming = self._warming.popleft() if self._warming else None
+                if warming is None:
+                    return self._create()
+                try:
+                    # A browser is already launching: waiting for it beats a
+                    # second cold start
+                    return warming.result()
+                except Exception:
+                    return self._create()
+
+            if self.is_healthy(driver):
+                return driver
+
+            logger.warning("⚠️ Driver failed health check, replacing it")
+            with self._lock:
+                self.stats["replaced"] += 1
+            self._quit(driver)
+
+    def _create(self):
+        start = time.time()
+        driver = self.driver_factory()
+        elapsed = time.time() - start
+        with self._lock:
+            self._page_counts[driver] = 0
+            self.stats["created"] += 1
+            self.stats["startup_seconds"] += elapsed
+        logger.info(f"🚗 Started driver in {elapsed:.1f}s")
+        return driver
+
+    def _quit(self, driver):
+        with self._lock:
+            self._page_counts.pop(driver, None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        if self.on_quit:
+            self.on_quit(driver)
+
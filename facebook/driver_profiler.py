@@ -0,0 +1,248 @@
+#!/usr/bin/env python
+
+import bisect
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+import selenium
+
+from .tracing import open_spans
+
+
+# Upper bounds (ms) of the latency histogram buckets; the last one is open
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+# A call site issuing more commands than this inside one span (counting
+# nested spans, so a loop around a traced helper is caught too) is a loop
+# worth batching (one execute_script instead of per-element round-trips)
+LOOP_THRESHOLD = 50
+
+# Frames from these files are never reported as call sites
+_SKIP_PATHS = (
+    os.path.dirname(selenium.__file__) + os.sep,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "tracing.py"),
+    os.path.abspath(__file__),
+)
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _call_site():
+    """
+    First frame outside Selenium and the instrumentation
+
+    Returns:
+        str: e.g. "facebook/media_extractor.py:512 find_photo_gallery_triggers"
+    """
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if not filename.startswith(_SKIP_PATHS):
+            path = os.path.relpath(filename, _ROOT) if filename.startswith(_ROOT) else filename
+            return f"{path}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "<unknown>"
+
+
+class LatencyHistogram:
+    """Command round-trip times in fixed millisecond buckets"""
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        ms = seconds * 1000
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, fraction):
+        """Upper bound (ms) of the bucket holding the given fraction"""
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS + [None], self.buckets):
+            seen += count
+            if seen >= target and count:
+                return bound if bound is not None else self.max * 1000
+        return 0
+
+    def as_dict(self):
+        labels = [f"<={b}ms" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return {
+            "count": self.count,
+            "total": round(self.total, 6),
+            "max": round(self.max, 6),
+            "buckets": {label: n for label, n in zip(labels, self.buckets) if n},
+        }
+
+
+class DriverProfiler:
+    """
+    Per command type and per call site WebDriver statistics
+
+    Wraps ``driver.execute`` (the single path every driver and WebElement
+    call takes) to time each round-trip and attribute it to the repo code
+    that issued it. Call sites that issue more than ``loop_threshold``
+    commands inside one tracing span, nested spans included, are flagged
+    as loops and reported against the innermost such span.
+    """
+
+    def __init__(self, loop_threshold=LOOP_THRESHOLD):
+        """
+        Args:
+            loop_threshold: Commands per call site and span before flagging
+        """
+        self.loop_threshold = loop_threshold
+        self.commands = {}
+        self.call_sites = {}
+        self.loops = {}
+        self._span_counts = threading.local()
+        self._lock = threading.Lock()
+
+    def attach(self, driver):
+        """
+        Profile every command a driver issues
+
+        Args:
+            driver: Selenium WebDriver instance
+
+        Returns:
+            The same driver
+        """
+        if getattr(driver, "_profiled_execute", False):
+            return driver
+
+        execute = driver.execute
+
+        @functools.wraps(execute)
+        def profiled_execute(driver_command, params=None):
+            site = _call_site()
+            start = time.perf_counter()
+            try:
+                return execute(driver_command, params)
+            finally:
+                self.record(driver_command, site, time.perf_counter() - start)
+
+        driver.execute = profiled_execute
+        driver._profiled_execute = True
+        return driver
+
+    def record(self, command, site, seconds):
+        """
+        Account one command
+
+        Args:
+            command: WebDriver command name ("findElements", "getElementAttribute"...)
+            site: Call site from _call_site()
+            seconds: Round-trip time
+        """
+        # Per open span instance (None outside any span): commands from
+        # each call site, dropped once the span has ended
+        spans = open_spans() or (None,)
+        previous = getattr(self._span_counts, "counts", {})
+        counts = self._span_counts.counts = {span: previous.get(span, {}) for span in spans}
+
+        span, in_span = None, 0
+        for open_span in spans:
+            sites = counts[open_span]
+            sites[site] = sites.get(site, 0) + 1
+            if sites[site] > self.loop_threshold:
+                span, in_span = open_span, sites[site]
+
+        with self._lock:
+            self.commands.setdefault(command, LatencyHistogram()).add(seconds)
+
+            stats = self.call_sites.setdefault(site, {"count": 0, "total": 0.0, "commands": {}})
+            stats["count"] += 1
+            stats["total"] += seconds
+            stats["commands"][command] = stats["commands"].get(command, 0) + 1
+
+            if in_span:
+                loop = self.loops.setdefault((site, span[1] if span else None), {
+                    "spans": set(), "max_commands": 0})
+                loop["spans"].add(span[0] if span else None)
+                loop["max_commands"] = max(loop["max_commands"], in_span)
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                "commands": {name: h.as_dict() for name, h in self.commands.items()},
+                "call_sites": {
+                    site: dict(stats, total=round(stats["total"], 6))
+                    for site, stats in self.call_sites.items()
+                },
+                "loops": [
+                    {"site": site, "span": span_name, "occurrences": len(loop["spans"]),
+                     "max_commands": loop["max_commands"]}
+                    for (site, span_name), loop in self.loops.items()
+                ],
+                "loop_threshold": self.loop_threshold,
+            }
+
+    def save(self, path):
+        """Write the profile as JSON"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.as_dict(), f, indent=2)
+        return path
+
+    def format_report(self, top=15):
+        """
+        Render the slowest commands, the chattiest call sites and loops
+
+        Args:
+            top: Rows per section
+
+        Returns:
+            str: Report text
+        """
+        with self._lock:
+            commands = sorted(self.commands.items(), key=lambda item: -item[1].total)
+            sites = sorted(self.call_sites.items(), key=lambda item: -item[1]["count"])
+            loops = sorted(self.loops.items(), key=lambda item: -item[1]["max_commands"])
+
+            total = sum(h.count for _, h in commands)
+            lines = [f"🔌 {total} WebDriver commands, "
+                     f"{sum(h.total for _, h in commands):.1f}s round-trip time"]
+
+            lines.append(f"  {'command':<32}{'count':>8}{'total s':>10}{'p50 ms':>9}"
+                         f"{'p95 ms':>9}{'max ms':>9}")
+            for name, h in commands[:top]:
+                lines.append(f"  {name:<32}{h.count:>8}{h.total:>10.2f}{h.percentile(0.5):>9.0f}"
+                             f"{h.percentile(0.95):>9.0f}{h.max * 1000:>9.0f}")
+
+            lines.append(f"  {'call site':<64}{'count':>8}{'total s':>10}  top commands")
+            for site, stats in sites[:top]:
+                top_commands = ", ".join(
+                    f"{name} x{n}" for name, n in sorted(
+                        stats["commands"].items(), key=lambda item: -item[1])[:3])
+                lines.append(f"  {site[-64:]:<64}{stats['count']:>8}{stats['total']:>10.2f}"
+                             f"  {top_commands}")
+
+            if loops:
+                lines.append(f"  ⚠️ Loops over {self.loop_threshold} commands per span "
+                             f"(batch these into one execute_script):")
+                for (site, span_name), loop in loops[:top]:
+                    lines.append(f"    {site} in {span_name or '-'}: up to "
+                                 f"{loop['max_commands']} commands, {len(loop['spans'])} time(s)")
+            return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python -m facebook.driver_profiler <profile.json>")
+        sys.exit(1)
+
+    with open(sys.argv[1], encoding="utf-8") as f:
+        profile = json.load(f)
+    for loop in sorted(profile["loops"], key=lambda loop: -loop["max_commands"]):
+        print(f"⚠️ {loop['site']} in {loop['span']}: up to {loop['max_commands']} commands")
+    for site, stats in sorted(profile["call_sites"].items(), key=lambda item: -item[1]["count"]):
+        print(f"{stats['count']:>8} {stats['total']:>9.2f}s  {site}")
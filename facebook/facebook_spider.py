@@ -1,26 +1,45 @@
 #!/usr/bin/env python
 
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.options import Options
 from selenium import webdriver
 from scrapy.http import HtmlResponse
+import os
 import time
 import logging
+import threading
 from typing import Any, Iterable
 
 import scrapy
+from scrapy import signals
 from scrapy.http import HtmlResponse, Request
 from scrapy.crawler import CrawlerProcess
-from selenium.common.exceptions import TimeoutException
+from scrapy.utils.defer import maybe_deferred_to_future
+from twisted.internet.threads import deferToThread
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 
 from .mock_models import MockFacebook
-from .time_parser import parse_relative_time
-from .selenium_config import get_selenium_settings, get_chrome_options
+from .time_parser import find_timestamp, parse_cutoff_date
+from .selenium_config import (
+    get_selenium_settings, get_chrome_options, get_blocked_url_patterns,
+    apply_url_blocking,
+)
+from .driver_pool import DriverPool
+from .media_client import close_media_client, format_connection_stats
+from .page_readiness import PageReadiness, drain_network_events, format_wait_results
 from .media_extractor import extract_images_from_article
+from .url_keys import extract_post_id
+from .article_parser import parse_article_element
+from .snapshots import SnapshotArchive, SNAPSHOT_DIR, begin_post_capture, capture_snapshot
+from .image_classifier import is_content_image
+from .crawl_state import CrawlState, CRAWL_STATE_PATH
+from .driver_profiler import DriverProfiler
+from common.chromedriver import chrome_profile_dir, resolve_chromedriver
+from .tracing import (
+    close_tracer, configure_tracer, format_trace_summary, instrument_driver,
+    span, traced,
+)
 
 
 logging.basicConfig(level=logging.WARNING, format='%(levelname)s: %(message)s')
@@ -32,25 +51,13 @@ logging.getLogger('webdriver_manager').setLevel(logging.ERROR)
 logging.getLogger('scrapy').setLevel(logging.ERROR)
 
 
-def click_allowed_cookies_button(driver):
-    labels = ["모든 쿠키 허용", "Allow all cookies"]
+def click_allowed_cookies_button(driver, readiness=None):
+    readiness = readiness or PageReadiness()
 
-    for label in labels:
-        allowed_cookies_button_xpath = (
-            ".//div[@role='button' "
-            f"and @aria-label='{label}' "
-            "and not(@aria-disabled)]"
-        )
-        try:
-            if button := WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable(
-                    (By.XPATH, allowed_cookies_button_xpath)
-                )
-            ):
-                button.click()
-                break
-        except TimeoutException:
-            pass
+    result, button = readiness.wait_for_cookie_banner(driver)
+    if button:
+        button.click()
+    return result
 
 
 class FacebookPageSpider(scrapy.Spider):
@@ -81,25 +88,45 @@ class FacebookPageSpider(scrapy.Spider):
         ".//div//span/a[@aria-label!='Enlarge' and @role='link']"
     )
 
-    def __init__(self, pagename, upload_callback, *args, **kwargs: Any):
+    def __init__(self, pagename, upload_callback, max_posts=1, since=None,
+                 known_post_ids=None, crawl_state=None, snapshot_captures=None,
+                 *args, **kwargs: Any):
         super().__init__(*args, **kwargs)
         self.pagename = pagename
         self.upload_callback = upload_callback
+        # Feed mode: keep scrolling until max_posts posts are parsed, a post
+        # is older than since, or a post ID from known_post_ids shows up
+        self.max_posts = int(max_posts)
+        self.since = parse_cutoff_date(since)
+        self.known_post_ids = set(known_post_ids or ())
+        # Replay: (url, snapshot path) pairs, one request per capture
+        self.snapshot_captures = list(snapshot_captures or ())
+
+        # Posts stored by earlier runs are boundaries too, so they are never
+        # parsed, downloaded or uploaded again
+        self.crawl_state = crawl_state
+        self.stored_posts = {}
+        if crawl_state is not None:
+            self.stored_posts = crawl_state.known_posts(pagename)
+            self.known_post_ids.update(self.stored_posts)
 
     def start_requests(self) -> Iterable[Request]:
         """Deprecated method - use start() instead"""
-        for url in self.start_urls:
-            yield Request(
-                url,
-                callback=self.parse,
-                meta={
-                    "callback": click_allowed_cookies_button,
-                },
-                dont_filter=True,
-            )
+        yield from self._initial_requests()
 
     async def start(self):
         """New async start method for Scrapy 2.13+"""
+        for request in self._initial_requests():
+            yield request
+
+    def _initial_requests(self):
+        if self.snapshot_captures:
+            # Several captures of one page share its URL, hence dont_filter
+            for url, path in self.snapshot_captures:
+                yield Request(url, callback=self.parse,
+                              meta={"snapshot_path": path}, dont_filter=True)
+            return
+
         for url in self.start_urls:
             yield Request(
                 url,
@@ -110,98 +137,182 @@ class FacebookPageSpider(scrapy.Spider):
                 dont_filter=True,
             )
 
-    def parse(self, response: HtmlResponse) -> dict:
-        articles = response.xpath(self.articles_xpath)
+    async def parse(self, response: HtmlResponse):
+        # Browser work blocks, so run it off the reactor thread; other pooled
+        # drivers keep loading pages meanwhile
+        try:
+            return await maybe_deferred_to_future(
+                deferToThread(self.parse_page, response))
+        finally:
+            release_driver(response.request)
+
+    @traced
+    def parse_page(self, response: HtmlResponse) -> list:
         driver = response.request.meta.get('driver')
+        readiness = response.meta.get('readiness') or PageReadiness()
 
         # Dismiss popups before proceeding
         if driver:
             from .media_extractor import dismiss_facebook_popup
-            dismiss_facebook_popup(driver)
+            dismiss_facebook_popup(driver, readiness=readiness)
+
+        if not (driver and self.settings.getbool("SNAPSHOT_CAPTURE")):
+            return self._parse_feed(response, driver, readiness)
+
+        # Keep the parsed HTML and gallery responses for offline replay
+        with capture_snapshot() as snapshot:
+            posts = self._parse_feed(response, driver, readiness, snapshot)
+        archive = SnapshotArchive(self.settings.get("SNAPSHOT_DIR") or SNAPSHOT_DIR)
+        path = archive.save(response.url, snapshot.html, snapshot.galleries,
+                            meta={"pagename": self.pagename, "posts": len(posts)})
+        print(f"📦 Snapshot saved: {path}")
+        return posts
+
+    def _parse_feed(self, response, driver, readiness, snapshot=None):
+        posts = []
+        seen_post_ids = set()
+        # Publish time of a stored post at the top of the feed, until the
+        # next post shows whether it is pinned
+        top_post_at = None
+        page = response
+        max_scrolls = self.settings.getint("FEED_MAX_SCROLLS", 30)
+
+        for scroll in range(max_scrolls + 1):
+            if snapshot is not None:
+                snapshot.html = page.text
+
+            for index, article in enumerate(page.xpath(self.articles_xpath)):
+                parsed = parse_article_element(article.root)
+                article_url = self._article_url(parsed)
+                post_id = extract_post_id(article_url) or article_url
+                if not post_id or post_id in seen_post_ids:
+                    continue
+                seen_post_ids.add(post_id)
+
+                # The first post may be pinned and out of date order, so a
+                # boundary there is skipped rather than ending the crawl
+                first_post = len(seen_post_ids) == 1
+                if post_id in self.known_post_ids:
+                    if first_post:
+                        top_post_at = self._known_post_timestamp(post_id, parsed)
+                        continue
+                    print(f"📍 Reached already stored post {post_id}, stopping")
+                    return posts
+                if top_post_at is not None:
+                    # A newer post below the stored top post means it is
+                    # pinned; an older one means it was the last post seen
+                    if self._article_timestamp(parsed) < top_post_at:
+                        print("📍 Top post is the last stored post, stopping")
+                        return posts
+                    top_post_at = None
+                if self.since and self._article_timestamp(parsed) < self.since:
+                    if first_post:
+                        continue
+                    print(f"📍 Reached posts older than {self.since:%Y-%m-%d}, stopping")
+                    return posts
+
+                if fb_article := self.parse_article(
+                        article, page, parsed=parsed, article_index=index):
+                    posts.append(fb_article)
+                    self._remember_post(post_id, fb_article)
+                    if len(posts) >= self.max_posts:
+                        return posts
+
+            if not driver or scroll == max_scrolls:
+                break
+            if not self._scroll_feed(driver, readiness):
+                print(f"📍 No more posts after {scroll + 1} scrolls")
+                break
 
-        # Process only the first article (latest post)
-        if articles:
-            article = articles[0]
-            if fb_article := self.parse_article(article, response):
-                if self.upload_callback:
-                    self.upload_callback(fb_article)
-                return fb_article
+            # Re-read the page; only articles not seen before get parsed
+            page = HtmlResponse(
+                url=response.url,
+                body=driver.page_source.encode('utf-8'),
+                encoding='utf-8',
+                request=response.request,
+            )
+
+        return posts
+
+    def _known_post_timestamp(self, post_id, parsed):
+        """
+        Publish time of an already stored post, from its date text or the
+        crawl state; None if neither has one
+        """
+        if timestamp := find_timestamp(parsed.texts):
+            return timestamp
+        if published_at := self.stored_posts.get(post_id):
+            from datetime import datetime, timezone
+            return datetime.fromtimestamp(published_at, timezone.utc)
+        return None
+
+    def _remember_post(self, post_id, fb_article):
+        if self.crawl_state is None:
+            return
+        self.crawl_state.record_post(
+            self.pagename,
+            post_id,
+            fb_article[MockFacebook.feed_url.name],
+            published_at=fb_article[MockFacebook.publish_date.name],
+        )
+        self.known_post_ids.add(post_id)
 
-    def parse_article(self, article, response):
+    def _scroll_feed(self, driver, readiness):
+        """
+        Scroll to the bottom of the already loaded page and wait for the feed
+        to append posts
+
+        Returns:
+            bool: True if new articles were loaded
+        """
+        count = len(driver.find_elements(By.XPATH, "//div[@role='article']"))
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        return readiness.wait_for_more_articles(driver, count).satisfied
+
+    def _article_url(self, parsed):
+        """Post permalink of a parsed article, made absolute"""
+        article_url = parsed.url
+        if article_url and article_url.startswith('/'):
+            article_url = f"https://www.facebook.com{article_url}"
+        return article_url
+
+    def _article_timestamp(self, parsed):
+        """Publish time from the article's relative/absolute date text"""
+        # One precompiled, memoized match per text node (see time_parser)
+        if timestamp := find_timestamp(parsed.texts):
+            return timestamp
+
+        from datetime import datetime, timezone
+        return datetime.now(timezone.utc)
+
+    @traced
+    def parse_article(self, article, response, parsed=None, article_index=None):
         """
         Parse individual Facebook page article/post and extract data
 
         Args:
             article: Scrapy selector for article element
             response: Scrapy response object
+            parsed: ParsedArticle if the caller already walked the article
+            article_index: Position among the page's articles, if known
 
         Returns:
             MockFacebook: Parsed Facebook post data or None if parsing failed
         """
-        url_selectors = [
-            ".//div//span/a[@aria-label!='Enlarge' and @role='link']/@href",
-            ".//span/a[@role='link']/@href",
-            ".//a[contains(@href, '/posts/')]/@href",
-            ".//a[contains(@href, '/photos/')]/@href",
-        ]
-
-        article_url = None
-        for selector in url_selectors:
-            urls = article.xpath(selector).getall()
-            if urls:
-                article_url = urls[0]
-                break
+        # One walk over the article replaces the URL, header, content and
+        # text XPath scans (see article_parser)
+        parsed = parsed or parse_article_element(article.root)
 
+        article_url = self._article_url(parsed)
         if not article_url:
             return None
 
-        if article_url and article_url.startswith('/'):
-            article_url = f"https://www.facebook.com{article_url}"
-
-        article_header = article.xpath(self.article_header_xpath)
-        publish_date = article_header.xpath("./@aria-label").get()
-
-        # Try multiple content selectors for different page structures
-        description = ""
-        for selector in self.page_content_selectors:
-            descriptions = article.xpath(selector).getall()
-            if descriptions:
-                description = " ".join(descriptions).strip()
-                break
+        publish_date = parsed.header_label
+        description = parsed.content
 
         actual_timestamp = None
         if article_url and description:
-            all_texts = article.xpath(".//text()").getall()
-            filtered_texts = [text.strip()
-                              for text in all_texts if text.strip()]
-
-            import re
-            patterns = [
-                r'\b\d+\s*[mhdwy](?:[a-z]*)?(?:\s+ago)?\b',
-                r'\b\d+\s+(?:min|hour|day|week|month|year)s?(?:\s+ago)?\b',
-                r'\b(?:yesterday|today)\b',
-                r'\b(?:just now|a moment ago)\b',
-                r'\b\d+\s*[분時日週月年](?:前|ago)?\b',
-                r'\b\d{1,2}\s+(?:january|february|march|april|may|june|july|august|september|october|november|december)\b',
-                r'\b(?:january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{1,2}\b',
-                r'\b\d{1,2}\s+(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\b',
-                r'\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+\d{1,2}\b',
-            ]
-
-            for text in filtered_texts:
-                text_lower = text.lower()
-                for pattern in patterns:
-                    if re.search(pattern, text_lower):
-                        parsed_time = parse_relative_time(text)
-                        if parsed_time:
-                            actual_timestamp = parsed_time
-                            break
-                if actual_timestamp:
-                    break
-
-            if not actual_timestamp:
-                from datetime import datetime, timezone
-                actual_timestamp = datetime.now(timezone.utc)
+            actual_timestamp = self._article_timestamp(parsed)
 
         if article_url and description:
             # Extract ALL images including hidden gallery images
@@ -209,12 +320,17 @@ class FacebookPageSpider(scrapy.Spider):
             images = []
 
             if driver:
+                # Galleries recorded for a snapshot belong to this post
+                begin_post_capture(article_url)
+
                 # Convert Scrapy selector to WebElement for advanced image extraction
                 try:
                     # Find the corresponding WebElement for this article
                     web_articles = driver.find_elements(
                         By.XPATH, "//div[@role='article']")
-                    article_index = self.get_article_index(article, response)
+                    if article_index is None:
+                        article_index = self.get_article_index(
+                            article, response, parsed=parsed)
 
                     if 0 <= article_index < len(web_articles):
                         article_web_element = web_articles[article_index]
@@ -222,7 +338,8 @@ class FacebookPageSpider(scrapy.Spider):
                         # Use new comprehensive image extraction
                         from .media_extractor import extract_all_images_from_facebook_post
                         downloaded_paths = extract_all_images_from_facebook_post(
-                            driver, article_web_element, save_dir="image_downloads"
+                            driver, article_web_element, save_dir="image_downloads",
+                            mode=self.settings.get("GALLERY_EXTRACTION_MODE"),
                         )
                         images.extend(downloaded_paths)
 
@@ -233,7 +350,7 @@ class FacebookPageSpider(scrapy.Spider):
                             f"⚠️  Could not find WebElement for article {article_index}")
                         # Fallback to old method
                         image_urls = self.extract_images_from_facebook_post(
-                            article)
+                            article, parsed=parsed)
                         if image_urls:
                             downloaded_paths = self.download_facebook_images(
                                 driver, image_urls, save_dir="image_downloads"
@@ -244,7 +361,7 @@ class FacebookPageSpider(scrapy.Spider):
                     print(f"❌ Error in advanced image extraction: {e}")
                     # Fallback to old method
                     image_urls = self.extract_images_from_facebook_post(
-                        article)
+                        article, parsed=parsed)
                     if image_urls:
                         downloaded_paths = self.download_facebook_images(
                             driver, image_urls, save_dir="image_downloads"
@@ -254,6 +371,13 @@ class FacebookPageSpider(scrapy.Spider):
                 # Also add screenshot as backup
                 # Screenshot functionality removed
                 pass
+            elif snapshot := response.meta.get('snapshot'):
+                # Offline replay: report image URLs, nothing is downloaded.
+                # Galleries recorded for the post replace its thumbnails,
+                # as in a live crawl
+                gallery_images = snapshot.get("gallery_images", {}).get(article_url)
+                images.extend(gallery_images or self.extract_images_from_facebook_post(
+                    article, parsed=parsed))
             else:
                 # Fallback - no screenshot needed
                 # Screenshot functionality removed
@@ -262,45 +386,32 @@ class FacebookPageSpider(scrapy.Spider):
             print(
                 f"✓ Crawled: {self.pagename} | Content: {description[:50]}... | Total images: {len(images)}")
 
+            fb_article = {
+                MockFacebook.kwrd.name: self.pagename,
+                MockFacebook.feed_url.name: article_url,
+                MockFacebook.publish_date.name: actual_timestamp,
+                MockFacebook.content.name: description,
+                MockFacebook.images.name: images,
+            }
             if self.upload_callback:
-                self.upload_callback({
-                    MockFacebook.kwrd.name: self.pagename,
-                    MockFacebook.feed_url.name: article_url,
-                    MockFacebook.publish_date.name: actual_timestamp,
-                    MockFacebook.content.name: description,
-                    MockFacebook.images.name: images,
-                })
-
-    def extract_images_from_facebook_post(self, article):
+                self.upload_callback(fb_article)
+            return fb_article
+
+    def extract_images_from_facebook_post(self, article, parsed=None):
         """
         Extract image URLs từ Facebook post article (exclude emoji/icons)
         """
         images = []
 
-        # Multiple XPath selectors for Facebook images (exclude small emoji images)
-        image_selectors = [
-            # Standard img tags with Facebook CDN sources, exclude small images
-            ".//img[contains(@src, 'scontent') and not(contains(@src, '16x16')) and not(contains(@src, '20x20')) and not(contains(@src, '24x24')) and not(contains(@src, '32x32'))]/@src",
-            ".//img[contains(@src, 'fbcdn.net') and not(contains(@src, 'emoji')) and not(contains(@src, 'icon'))]/@src",
-            ".//img[contains(@src, 'facebook.com') and not(contains(@src, 'emoji'))]/@src",
-            # Lazy loaded images
-            ".//img[@data-src and contains(@data-src, 'scontent') and not(contains(@data-src, 'emoji'))]/@data-src",
-            ".//img[@data-src and contains(@data-src, 'fbcdn') and not(contains(@data-src, 'emoji'))]/@data-src",
-            # General img tags but exclude obvious emoji classes and attributes
-            ".//img[contains(@class, 'x') and @src and not(contains(@alt, 'emoji')) and not(contains(@class, 'emoji')) and not(contains(@class, 'icon'))]/@src",
-            # Background images in style attributes
-            ".//*[contains(@style, 'background-image') and contains(@style, 'scontent') and not(contains(@style, 'emoji'))]/@style"
-        ]
-
-        for selector in image_selectors:
-            found_images = article.xpath(selector).getall()
-            for img_url in found_images:
-                # Clean and validate image URL
-                cleaned_url = self.clean_facebook_image_url(img_url)
-                if cleaned_url and self.is_valid_facebook_image(cleaned_url):
-                    # Additional size-based filtering for content images
-                    if self._is_likely_content_image(cleaned_url):
-                        images.append(cleaned_url)
+        # Candidate src/data-src/style values from the single-pass parser,
+        # in the same order the old per-selector XPath scans returned them
+        parsed = parsed or parse_article_element(article.root)
+
+        for img_url in parsed.image_urls:
+            # Clean and validate image URL
+            cleaned_url = self.clean_facebook_image_url(img_url)
+            if cleaned_url and self.is_valid_facebook_image(cleaned_url):
+                images.append(cleaned_url)
 
         print(
             f"🔍 Filtered to {len(images)} content images (excluded emoji/icons)")
@@ -308,39 +419,6 @@ class FacebookPageSpider(scrapy.Spider):
         # Remove duplicates while preserving order
         return list(dict.fromkeys(images))
 
-    def _is_likely_content_image(self, url):
-        """
-        Additional check to ensure image is likely content (not emoji/icon)
-        based on URL patterns and characteristics
-        """
-        # Skip if URL contains obvious emoji/icon indicators
-        emoji_patterns = [
-            'emoji', 'icon', 'reaction', 'sticker', 'emoticon',
-            '_16x16', '_20x20', '_24x24', '_32x32', '_48x48',
-            'u00', 'static.xx.fbcdn.net/images/emoji',
-            'static.facebook.com/images/emoji'
-        ]
-
-        for pattern in emoji_patterns:
-            if pattern in url.lower():
-                return False
-
-        # Content images usually have these characteristics:
-        # 1. From scontent CDN (user-uploaded content)
-        # 2. Larger dimensions or no explicit small dimensions
-        # 3. Not from static resources
-
-        if 'scontent' in url:
-            # This is likely user content from scontent CDN
-            return True
-
-        # Additional checks for other Facebook CDNs
-        if 'fbcdn.net' in url and 'static' not in url:
-            # Non-static fbcdn content
-            return True
-
-        return False
-
     def clean_facebook_image_url(self, img_url):
         """
         Clean Facebook image URL từ style attribute hoặc raw URL
@@ -369,111 +447,15 @@ class FacebookPageSpider(scrapy.Spider):
         """
         Validate if URL is valid Facebook content image (exclude emoji/icons)
         """
-        if not url or len(url) < 20:
-            return False
-
-        # Must be from Facebook content domains
-        valid_domains = [
-            'scontent.com',
-            'scontent-',  # scontent-xxx.xx.fbcdn.net
-            'scontent.',  # scontent.fsgn2-*.fna.fbcdn.net
-            'fbcdn.net',
-            'cdninstagram.com'
-        ]
-
-        # Skip UI elements, tiny images, placeholders, and EMOJI/ICONS
-        skip_patterns = [
-            'blank.gif',
-            'spacer.gif',
-            '1x1',
-            'pixel.png',
-            '/rsrc.php',  # Facebook static resources
-            'sprites/',
-            'icons/',
-            'emoji/',
-            'profile_pic_header',
-            '/assets/',
-            '/static/',
-            # Emoji/icon specific patterns
-            'images/emoji.php',
-            '/emoji/',
-            '/emoticons/',
-            '/reactions/',
-            '/stickers/',
-            'emoji_',
-            'icon_',
-            'reaction_',
-            # Facebook emoji URLs patterns
-            'static.xx.fbcdn.net/images/emoji',
-            'static.facebook.com/images/emoji',
-            '/images/icons/',
-            '/images/emoji/',
-            # Small image dimensions (likely emoji)
-            '_16x16',
-            '_20x20',
-            '_24x24',
-            '_32x32',
-            # Emoji Unicode patterns in URLs
-            'u00',  # Unicode emoji codes
-        ]
-
-        for pattern in skip_patterns:
-            if pattern in url.lower():
-                return False
-
-        # Additional emoji detection by checking URL parameters
-        if self._is_likely_emoji_by_params(url):
-            return False
-
-        return any(domain in url for domain in valid_domains)
-
-    def _is_likely_emoji_by_params(self, url):
-        """
-        Detect emoji images by URL parameters and characteristics
-        """
-        from urllib.parse import urlparse, parse_qs
-
-        try:
-            parsed = urlparse(url)
-
-            # Check if URL has very small dimensions (typical for emoji)
-            if any(dim in url.lower() for dim in ['16x16', '20x20', '24x24', '32x32', '48x48']):
-                return True
-
-            # Check for emoji-specific parameters in Facebook URLs
-            emoji_indicators = [
-                'emoji',
-                'icon',
-                'reaction',
-                'sticker',
-                'emoticon'
-            ]
-
-            # Check path for emoji indicators
-            path = parsed.path.lower()
-            if any(indicator in path for indicator in emoji_indicators):
-                return True
-
-            # Check query parameters
-            query_params = parse_qs(parsed.query)
-            for param_name, param_values in query_params.items():
-                param_str = f"{param_name}={','.join(param_values)}".lower()
-                if any(indicator in param_str for indicator in emoji_indicators):
-                    return True
-
-            return False
-
-        except Exception:
-            return False
+        return is_content_image(url, "post")
 
+    @traced
     def download_facebook_images(self, driver, image_urls, save_dir="image_downloads"):
         """
         Download Facebook images sử dụng Selenium session
         """
         import os
-        import requests
-        import hashlib
-        from urllib.parse import urlparse
+        from .media_extractor import store_facebook_image
 
         if not os.path.exists(save_dir):
             os.makedirs(save_dir)
@@ -486,73 +468,23 @@ class FacebookPageSpider(scrapy.Spider):
             try:
                 print(f"  {i}/{len(image_urls)}: {img_url[:50]}...")
 
-                # Get cookies from Selenium session
-                cookies = driver.get_cookies()
-                session = requests.Session()
-
-                # Transfer cookies from Selenium to requests
-                for cookie in cookies:
-                    session.cookies.set(
-                        cookie['name'],
-                        cookie['value'],
-                        domain=cookie.get('domain')
-                    )
-
-                # Set browser-like headers
+                # Set browser-like headers; cookies and user agent come from
+                # the shared media client
                 headers = {
-                    'User-Agent': driver.execute_script("return navigator.userAgent;"),
-                    'Referer': 'https://www.facebook.com/',
-                    'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
-                    'Accept-Language': 'en-US,en;q=0.9',
                     'Accept-Encoding': 'gzip, deflate, br',
-                    'Connection': 'keep-alive',
                     'Sec-Fetch-Dest': 'image',
                     'Sec-Fetch-Mode': 'no-cors',
                     'Sec-Fetch-Site': 'cross-site'
                 }
 
-                # Download image
-                response = session.get(
-                    img_url, headers=headers, stream=True, timeout=30)
-
-                if response.status_code == 200:
-                    # Generate unique filename từ URL
-                    url_hash = hashlib.md5(img_url.encode()).hexdigest()[:12]
-
-                    # Extract file extension from URL or Content-Type
-                    content_type = response.headers.get('content-type', '')
-                    if 'jpeg' in content_type or 'jpg' in content_type:
-                        ext = '.jpg'
-                    elif 'png' in content_type:
-                        ext = '.png'
-                    elif 'webp' in content_type:
-                        ext = '.webp'
-                    else:
-                        # Fallback: extract from URL
-                        parsed = urlparse(img_url)
-                        if '.jpg' in parsed.path:
-                            ext = '.jpg'
-                        elif '.png' in parsed.path:
-                            ext = '.png'
-                        else:
-                            ext = '.jpg'  # Default
-
-                    filename = f"fb_image_{url_hash}{ext}"
-                    filepath = os.path.join(save_dir, filename)
-
-                    # Save image
-                    with open(filepath, 'wb') as f:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
+                # Download image (or reuse it from the media store)
+                filepath = store_facebook_image(
+                    img_url, save_dir, "fb_image", driver=driver, headers=headers)
 
+                if filepath:
                     downloaded_paths.append(filepath)
                     print(f"    ✅ Saved: {filepath}")
 
-                else:
-                    print(
-                        f"    ❌ HTTP {response.status_code}: {img_url[:50]}...")
-
             except Exception as e:
                 print(f"    ❌ Error: {e}")
                 continue
@@ -560,45 +492,34 @@ class FacebookPageSpider(scrapy.Spider):
         print(f"✅ Downloaded {len(downloaded_paths)}/{len(image_urls)} images")
         return downloaded_paths
 
-    def get_article_index(self, scrapy_article, response):
+    def get_article_index(self, scrapy_article, response, parsed=None):
         """
         Find the index of Scrapy article selector in the list of all articles
 
         Args:
             scrapy_article: Scrapy selector for the article
             response: Scrapy response object
+            parsed: ParsedArticle of scrapy_article, if already available
 
         Returns:
             int: Index of the article or -1 if not found
         """
         try:
-            # Get all articles from the response
-            all_articles = response.xpath(self.articles_xpath)
+            target = parsed or parse_article_element(scrapy_article.root)
 
             # Try to find matching article by comparing some unique attributes
-            for i, article in enumerate(all_articles):
-                # Compare article content or URLs to find the match
-                try:
-                    # Compare URLs as unique identifier
-                    current_urls = article.xpath(
-                        ".//a[contains(@href, '/posts/') or contains(@href, '/photo/')]/@href").getall()
-                    target_urls = scrapy_article.xpath(
-                        ".//a[contains(@href, '/posts/') or contains(@href, '/photo/')]/@href").getall()
-
-                    if current_urls and target_urls and current_urls[0] == target_urls[0]:
-                        return i
+            for i, article in enumerate(response.xpath(self.articles_xpath)):
+                current = parse_article_element(article.root)
 
-                    # Fallback: compare text content
-                    current_text = ' '.join(article.xpath(
-                        ".//text()").getall()[:10])  # First 10 text nodes
-                    target_text = ' '.join(
-                        scrapy_article.xpath(".//text()").getall()[:10])
+                # Compare URLs as unique identifier
+                if current.match_href and target.match_href \
+                        and current.match_href == target.match_href:
+                    return i
 
-                    if current_text and target_text and current_text == target_text:
-                        return i
-
-                except Exception:
-                    continue
+                # Fallback: compare text content (first 10 text nodes)
+                if current.leading_text and target.leading_text \
+                        and current.leading_text == target.leading_text:
+                    return i
 
             return -1  # Not found
 
@@ -608,43 +529,258 @@ class FacebookPageSpider(scrapy.Spider):
 
 
 class SimpleSeleniumMiddleware:
-    def __init__(self):
-        self.driver = None
+    def __init__(self, pool_size=1, max_pages_per_driver=50, acquire_timeout=300,
+                 readiness=None, crawl_profile="full", blocked_url_patterns=None,
+                 profiler=None, profile_path=None, user_data_root=None, prewarm=0):
+        self.readiness = readiness or PageReadiness()
+        # Optional DriverProfiler counting every WebDriver command
+        self.profiler = profiler
+        self.profile_path = profile_path
+        self.crawl_profile = crawl_profile
+        self.blocked_url_patterns = blocked_url_patterns or []
+        self.driver_path = None
+        # Persistent Chrome profiles, one per live browser (Chrome locks the
+        # directory), so cookies and consent survive between runs
+        self.user_data_root = user_data_root
+        self.prewarm = int(prewarm or 0)
+        self._profile_lock = threading.Lock()
+        self._claimed_profiles = set()
+        self._driver_profiles = {}
+        self.pool = DriverPool(
+            self._init_driver,
+            size=pool_size,
+            max_pages=max_pages_per_driver,
+            acquire_timeout=acquire_timeout,
+            on_quit=self._release_profile,
+        )
+
+    # Process-wide instance used with SELENIUM_KEEP_ALIVE (see shared())
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        if settings.getbool("SELENIUM_KEEP_ALIVE"):
+            # Long-running process: browsers, sessions and the trace outlive
+            # this crawl; only its leftover leases are returned at the end
+            middleware = cls.shared(settings)
+            crawler.signals.connect(middleware.release_leased,
+                                    signal=signals.spider_closed)
+            return middleware
+
+        middleware = cls._build(settings)
+        crawler.signals.connect(middleware.engine_started,
+                                signal=signals.engine_started)
+        crawler.signals.connect(middleware.spider_closed,
+                                signal=signals.spider_closed)
+        return middleware
+
+    @classmethod
+    def shared(cls, settings):
+        """
+        Middleware shared by every crawl of this process
 
-    def _init_driver(self, spider):
-        if self.driver is None:
-            chrome_options = get_chrome_options()
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(
-                service=service, options=chrome_options)
+        Created (and its browsers prewarmed) by the first crawl; closed with
+        close_shared() when the process shuts down.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls._build(settings)
+                cls._shared.engine_started()
+            return cls._shared
+
+    @classmethod
+    def close_shared(cls):
+        with cls._shared_lock:
+            middleware, cls._shared = cls._shared, None
+        if middleware is not None:
+            middleware.close()
+
+    @classmethod
+    def _build(cls, settings):
+        middleware = cls(
+            pool_size=settings.getint("SELENIUM_POOL_SIZE", 1),
+            max_pages_per_driver=settings.getint(
+                "SELENIUM_MAX_PAGES_PER_DRIVER", 50),
+            acquire_timeout=settings.getfloat("SELENIUM_ACQUIRE_TIMEOUT", 300),
+            readiness=PageReadiness.from_settings(settings),
+            crawl_profile=settings.get("SELENIUM_CRAWL_PROFILE", "full"),
+            blocked_url_patterns=get_blocked_url_patterns(
+                settings.get("SELENIUM_CRAWL_PROFILE", "full"),
+                resource_types=settings.getlist(
+                    "SELENIUM_BLOCKED_RESOURCE_TYPES") or None,
+                extra_patterns=settings.getlist(
+                    "SELENIUM_BLOCKED_URL_PATTERNS"),
+            ),
+            profiler=DriverProfiler(
+                loop_threshold=settings.getint("DRIVER_PROFILE_LOOP_THRESHOLD", 50),
+            ) if settings.getbool("DRIVER_PROFILE") else None,
+            profile_path=settings.get("DRIVER_PROFILE_FILE"),
+            user_data_root=settings.get("SELENIUM_PROFILE_DIR"),
+            prewarm=settings.getint("SELENIUM_PREWARM", 0),
+        )
+        configure_tracer(settings.get("TRACE_FILE"))
+        return middleware
 
-    def process_request(self, request, spider):
-        if self.driver is None:
-            self._init_driver(spider)
+    def engine_started(self):
+        # Launch browsers while Scrapy schedules the first requests. The
+        # slots are reserved before this returns, so a request that finds no
+        # idle driver waits for a warming one instead of starting another
+        if self.prewarm:
+            self.pool.warm(self.prewarm, wait=False)
 
-        self.driver.get(request.url)
+    def _init_driver(self, spider=None):
+        # Cached path: no webdriver_manager version check on every run
+        self.driver_path = resolve_chromedriver()
 
-        if 'callback' in request.meta:
-            callback = request.meta['callback']
-            if callback:
-                callback(self.driver)
+        slot = self._claim_profile()
+        try:
+            driver = self._start_chrome(slot)
+        except WebDriverException as e:
+            if slot is None:
+                raise
+            # e.g. another crawl process still holds this profile
+            logger.warning(f"⚠️ Chrome profile {slot} unusable ({e.msg}), using a temporary one")
+            self._free_profile(slot)
+            slot = None
+            driver = self._start_chrome(None)
+
+        if slot is not None:
+            with self._profile_lock:
+                self._driver_profiles[driver] = slot
+
+        apply_url_blocking(driver, self.blocked_url_patterns)
+        instrument_driver(driver)
+        if self.profiler:
+            self.profiler.attach(driver)
+        return driver
+
+    def _start_chrome(self, slot):
+        user_data_dir = None
+        if slot is not None:
+            user_data_dir = chrome_profile_dir(f"facebook-{slot}", root=self.user_data_root)
+        chrome_options = get_chrome_options(self.crawl_profile, user_data_dir=user_data_dir)
+        service = Service(self.driver_path)
+        return webdriver.Chrome(service=service, options=chrome_options)
+
+    def _claim_profile(self):
+        """Lowest profile slot no live browser is using, or None if disabled"""
+        if not self.user_data_root:
+            return None
+        with self._profile_lock:
+            slot = 0
+            while slot in self._claimed_profiles:
+                slot += 1
+            self._claimed_profiles.add(slot)
+            return slot
+
+    def _free_profile(self, slot):
+        with self._profile_lock:
+            self._claimed_profiles.discard(slot)
+
+    def _release_profile(self, driver):
+        with self._profile_lock:
+            slot = self._driver_profiles.pop(driver, None)
+        if slot is not None:
+            self._free_profile(slot)
+
+    async def process_request(self, request, spider=None):
+        # Page loads block on the browser, so run them on the reactor thread
+        # pool; each request leases its own driver from the pool
+        return await maybe_deferred_to_future(deferToThread(self._render, request))
+
+    def _render(self, request):
+        with span("process_request", url=request.url):
+            return self._render_page(request)
+
+    def _render_page(self, request):
+        with span("driver_pool.acquire"):
+            driver = self.pool.acquire()
 
-        time.sleep(3)
+        try:
+            # Clear network events left over from the previous page
+            drain_network_events(driver)
+            with span("driver.get"):
+                driver.get(request.url)
+
+            wait_results = []
+            if 'callback' in request.meta:
+                callback = request.meta['callback']
+                if callback:
+                    with span(f"callback.{getattr(callback, '__name__', 'meta')}"):
+                        result = callback(driver, readiness=self.readiness)
+                    if result:
+                        wait_results.append(result)
+
+            with span("wait_for_page"):
+                wait_results.extend(self.readiness.wait_for_page(driver))
+            logger.info(
+                f"⏱️ Ready {request.url}: {format_wait_results(wait_results)}")
+
+            with span("page_source"):
+                body = driver.page_source.encode('utf-8')
+        except WebDriverException:
+            self.pool.release(driver, discard=True)
+            raise
+        except Exception:
+            self.pool.release(driver)
+            raise
 
-        body = self.driver.page_source.encode('utf-8')
         response = HtmlResponse(
             url=request.url,
             body=body,
             encoding='utf-8',
             request=request
         )
-        # Store driver in request meta for access in parse methods
-        request.meta['driver'] = self.driver
+        # Store driver in request meta for access in parse methods; the
+        # spider hands it back to the pool with release_driver()
+        request.meta['driver'] = driver
+        request.meta['driver_pool'] = self.pool
+        request.meta['readiness'] = self.readiness
+        request.meta['readiness_timings'] = [
+            result._asdict() for result in wait_results]
         return response
 
+    def release_leased(self, spider=None):
+        """Return drivers a finished crawl never handed back"""
+        for driver in self.pool.leased_drivers():
+            self.pool.release(driver)
+
     def spider_closed(self, spider):
-        if self.driver:
-            self.driver.quit()
+        self.close()
+
+    def close(self):
+        self.release_leased()
+        self.pool.close()
+        logger.info(f"🚗 Driver pool stats: {self.pool.stats}")
+        if created := self.pool.stats["created"]:
+            print(f"🚗 Browser startup: {created} started ({self.pool.stats['prewarmed']} prewarmed), "
+                  f"{self.pool.stats['startup_seconds'] / created:.1f}s each")
+
+        if stats := close_media_client():
+            print(f"🌐 Media downloads: {format_connection_stats(stats)}")
+
+        if totals := close_tracer():
+            print(f"⏱️ Stage timings:\n{format_trace_summary(totals)}")
+
+        if self.profiler:
+            print(self.profiler.format_report())
+            if self.profile_path:
+                print(f"🔌 Driver profile saved: {self.profiler.save(self.profile_path)}")
+
+
+def release_driver(request):
+    """
+    Return the driver leased for a request to its pool
+
+    Args:
+        request: Scrapy request rendered by SimpleSeleniumMiddleware
+    """
+    pool = request.meta.pop('driver_pool', None)
+    driver = request.meta.get('driver')
+    if pool and driver:
+        pool.release(driver)
 
 
 def test_callback_page(data):
@@ -670,25 +806,118 @@ def test_callback_page(data):
 # Runner class for Fire
 # =========================================
 class FacebookPageCrawler:
-    def crawl(self, pagename="test"):
-        """Crawl Facebook page posts"""
+    def crawl(self, pagename="test", max_posts=1, since=None, fresh=False,
+              snapshot=False, base_url="https://www.facebook.com", gallery_mode=None,
+              trace=None, profile_driver=False, crawl_profile=None):
+        """
+        Crawl Facebook page posts
+
+        Args:
+            pagename: Facebook page name
+            max_posts: Number of posts to collect by scrolling the feed
+            since: Stop at posts older than this date ("2024-05-01", "3d")
+            fresh: Ignore posts stored by earlier runs
+            snapshot: Save each parsed page to the snapshot archive
+            base_url: Site to crawl (a local fake site for benchmarks)
+            gallery_mode: Override GALLERY_EXTRACTION_MODE ("direct",
+                "network" or "dom")
+            trace: JSON-lines file to write per-stage timing spans to
+            profile_driver: Count WebDriver commands per type and call site
+                (True, or a path to also save the profile as JSON)
+            crawl_profile: Override SELENIUM_CRAWL_PROFILE ("full" or "light")
+        """
         logging.info(f"🚀 Starting page crawl for: {pagename}")
+        # Reject a bad cutoff before any browser starts
+        since = parse_cutoff_date(since)
 
-        start_urls = [f"https://www.facebook.com/{pagename}"]
-        settings = get_selenium_settings()
+        settings = self.build_settings(snapshot=snapshot, gallery_mode=gallery_mode,
+                                       trace=trace, profile_driver=profile_driver,
+                                       crawl_profile=crawl_profile)
+        crawl_state = CrawlState(
+            os.environ.get("FACEBOOK_CRAWL_STATE", CRAWL_STATE_PATH))
 
         try:
             process = CrawlerProcess(settings)
             process.crawl(
                 FacebookPageSpider,
-                pagename=pagename,
-                upload_callback=test_callback_page,
-                start_urls=start_urls
+                **self.spider_kwargs(pagename, max_posts=max_posts, since=since,
+                                     crawl_state=None if fresh else crawl_state,
+                                     base_url=base_url),
             )
             process.start()
             logging.info("✅ Page crawl completed!")
         except Exception as e:
             logging.error(f"❌ Error: {e}")
+        finally:
+            crawl_state.close()
+
+    @staticmethod
+    def build_settings(snapshot=False, gallery_mode=None, trace=None, profile_driver=False,
+                       crawl_profile=None):
+        """Scrapy settings for a page crawl (see crawl() for the arguments)"""
+        settings = get_selenium_settings()
+        settings["SNAPSHOT_CAPTURE"] = bool(snapshot)
+        if gallery_mode:
+            settings["GALLERY_EXTRACTION_MODE"] = gallery_mode
+        if crawl_profile:
+            settings["SELENIUM_CRAWL_PROFILE"] = crawl_profile
+        if trace:
+            settings["TRACE_FILE"] = trace
+        if profile_driver:
+            settings["DRIVER_PROFILE"] = True
+            if isinstance(profile_driver, str):
+                settings["DRIVER_PROFILE_FILE"] = profile_driver
+        return settings
+
+    @staticmethod
+    def spider_kwargs(pagename, max_posts=1, since=None, crawl_state=None,
+                      base_url="https://www.facebook.com"):
+        """FacebookPageSpider arguments for one page"""
+        return {
+            "pagename": pagename,
+            "upload_callback": test_callback_page,
+            "start_urls": [f"{base_url.rstrip('/')}/{pagename}"],
+            "max_posts": max_posts,
+            "since": since,
+            "crawl_state": crawl_state,
+        }
+
+    def replay(self, snapshot_dir=SNAPSHOT_DIR, max_posts=1000):
+        """
+        Re-run extraction over every archived capture, without a browser
+
+        Args:
+            snapshot_dir: Archive written by crawl(snapshot=True)
+            max_posts: Posts to parse per page
+        """
+        captures = SnapshotArchive(snapshot_dir).all_captures()
+        if not captures:
+            logging.error(f"❌ No snapshots in {snapshot_dir}")
+            return
+
+        settings = get_selenium_settings()
+        settings.update({
+            "DOWNLOADER_MIDDLEWARES": {
+                "facebook.snapshots.SnapshotReplayMiddleware": 585,
+            },
+            "SNAPSHOT_DIR": snapshot_dir,
+            "CONCURRENT_REQUESTS": 16,
+            "DOWNLOAD_DELAY": 0,
+            "AUTOTHROTTLE_ENABLED": False,
+        })
+
+        start = time.time()
+        process = CrawlerProcess(settings)
+        process.crawl(
+            FacebookPageSpider,
+            pagename="replay",
+            upload_callback=None,
+            snapshot_captures=captures,
+            max_posts=max_posts,
+        )
+        process.start()
+        print(f"🔁 Replayed {len(captures)} captures of {len({url for url, _ in captures})} "
+              f"pages in {time.time() - start:.1f}s")
 
 
 def run_facebook_page_spider(pagename="test"):
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+
+import re
+import time
+from urllib.parse import urlparse
+
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.keys import Keys
+
+from .page_readiness import drain_network_events
+from .url_keys import asset_id
+from .snapshots import begin_gallery_capture, compact_gallery_events
+
+
+# Facebook user content is served from scontent-*.fbcdn.net hosts
+CDN_IMAGE_HOST_RE = re.compile(r'^scontent|\.fbcdn\.net$')
+
+
+class GalleryNetworkRecorder:
+    """
+    Collect full-resolution gallery images from DevTools network events
+
+    The photo viewer prefetches neighbouring photos, so the image URLs show up
+    in ``Network.responseReceived`` before the DOM ever displays them. Each
+    photo is keyed by its CDN asset name; when the same photo arrives in
+    several sizes the largest transfer wins.
+    """
+
+    def __init__(self, is_content_image, record=True):
+        """
+        Args:
+            is_content_image: Callable filtering out emoji/icon URLs
+            record: Add the events to an active snapshot capture
+        """
+        self.is_content_image = is_content_image
+        self._snapshot_events = begin_gallery_capture() if record else None
+        self._request_urls = {}
+        self._assets = {}
+        self._order = []
+
+    def feed(self, events):
+        """
+        Consume (method, params) events from drain_network_events()
+
+        Returns:
+            int: Number of photos seen for the first time
+        """
+        if self._snapshot_events is not None:
+            self._snapshot_events.extend(compact_gallery_events(events))
+
+        new_assets = 0
+        for method, params in events:
+            if method == "Network.responseReceived":
+                response = params.get("response", {})
+                url = response.get("url", "")
+                if not response.get("mimeType", "").startswith("image/"):
+                    continue
+                if not self._is_cdn_image(url):
+                    continue
+
+                self._request_urls[params.get("requestId")] = url
+                asset = asset_id(url)
+                if asset not in self._assets:
+                    self._assets[asset] = (url, 0)
+                    self._order.append(asset)
+                    new_assets += 1
+
+            elif method == "Network.loadingFinished":
+                url = self._request_urls.pop(params.get("requestId"), None)
+                if not url:
+                    continue
+                asset = asset_id(url)
+                size = params.get("encodedDataLength", 0)
+                if size >= self._assets[asset][1]:
+                    self._assets[asset] = (url, size)
+
+        return new_assets
+
+    def image_urls(self):
+        """Full-resolution URLs in the order the viewer loaded them"""
+        return [self._assets[asset][0] for asset in self._order]
+
+    def _is_cdn_image(self, url):
+        host = urlparse(url).netloc.lower()
+        if not CDN_IMAGE_HOST_RE.search(host):
+            return False
+        return self.is_content_image(url)
+
+
+def capture_gallery_image_urls(driver, is_content_image, max_images=50,
+                               idle_time=1.5, open_timeout=5, timeout=60,
+                               poll_frequency=0.2):
+    """
+    Page through an open photo viewer with arrow keys and record image
+    responses, without polling the DOM
+
+    The caller should drain the performance log before opening the viewer so
+    the first photo's response is captured as well.
+
+    Args:
+        driver: Selenium WebDriver with performance logging enabled
+        is_content_image: Callable filtering out emoji/icon URLs
+        max_images: Safety limit on photos per gallery
+        idle_time: Stop when a key press brings no new photo for this long
+        open_timeout: How long to wait for the viewer's first photo
+        timeout: Upper bound for the whole capture
+        poll_frequency: Seconds between performance log reads
+
+    Returns:
+        list: Image URLs in gallery order, or None if performance logging is off
+    """
+    recorder = GalleryNetworkRecorder(is_content_image)
+    start = time.time()
+
+    events = drain_network_events(driver)
+    if events is None:
+        return None
+    recorder.feed(events)
+
+    # Wait for the viewer to load its first photo before stepping
+    if not recorder.image_urls():
+        if not _wait_for_new_assets(driver, recorder, open_timeout, poll_frequency):
+            print("⚠️ Photo viewer loaded no images")
+            return []
+
+    while len(recorder.image_urls()) < max_images:
+        if time.time() - start > timeout:
+            print(f"⏰ Network capture timeout ({timeout}s)")
+            break
+
+        # The viewer prefetches the next photo, so stepping forward keeps
+        # pulling new responses until the end of the gallery
+        ActionChains(driver).send_keys(Keys.ARROW_RIGHT).perform()
+
+        if not _wait_for_new_assets(driver, recorder, idle_time, poll_frequency):
+            break
+
+    urls = recorder.image_urls()[:max_images]
+    print(
+        f"📡 Captured {len(urls)} gallery images from network in {time.time() - start:.1f}s")
+    return urls
+
+
+def _wait_for_new_assets(driver, recorder, timeout, poll_frequency):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        time.sleep(poll_frequency)
+        if recorder.feed(drain_network_events(driver) or []):
+            return True
+    return False
@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+
+from collections import namedtuple
+from functools import lru_cache
+from urllib.parse import unquote
+
+
+# accepted: bool, reason: short code explaining the decision
+ImageDecision = namedtuple("ImageDecision", ["accepted", "reason"])
+
+# Placeholders and static UI resources, never post content
+PLACEHOLDER_PATTERNS = [
+    'data:image', 'blank.gif', 'spacer.gif', 'transparent.gif', '1x1',
+    'pixel.png',
+]
+UI_PATTERNS = [
+    '/assets/', '/static/', 'static.xx.fbcdn.net/rsrc.php',
+    'static.facebook.com/rsrc.php', '/rsrc.php', 'sprites/', 'icons/',
+    'emoji/', '/images/emoji.php', 'profile_pic_header', 'default_profile',
+    '/ui/', '/chrome/', '/images/icons/',
+]
+EMOJI_PATTERNS = [
+    'emoji', 'icon', 'reaction', 'sticker', 'emoticon', 'u00',
+    '16x16', '20x20', '24x24', '32x32', '48x48',
+]
+
+CONTENT_DOMAINS = ['scontent.com', 'scontent-', 'scontent.', 'cdninstagram.com']
+STATIC_DOMAINS = ['static.xx.fbcdn.net', 'static.facebook.com']
+
+
+def _patterns(patterns):
+    """Unique patterns, longest first so a reason is the most specific one"""
+    return tuple(sorted(set(patterns), key=lambda pattern: (-len(pattern), pattern)))
+
+
+def _first_match(patterns, text):
+    return next((pattern for pattern in patterns if pattern in text), None)
+
+
+class ImageUrlClassifier:
+    """
+    One pass decision on whether an image URL is Facebook post content
+
+    The URL is lowercased once and every substring rule runs against that
+    string; repeated URLs are answered by classify_image_url's cache. Decisions carry
+    a reason code ("skip:emoji", "blocked_host", "content:scontent"...) so
+    filtering can be audited.
+    """
+
+    def __init__(self, name, skip_patterns, allow_domains, min_length=20,
+                 blocked_domains=(), require_content_host=False):
+        """
+        Args:
+            name: Profile name used in reports
+            skip_patterns: Substrings that reject a URL
+            allow_domains: Substrings of which at least one must be present
+            min_length: Shorter URLs are rejected
+            blocked_domains: Hosts rejected even if an allow domain matches
+            require_content_host: Also require a scontent or non-static
+                fbcdn.net host (the spider's "likely content" rule)
+        """
+        self.name = name
+        self.min_length = min_length
+        self.require_content_host = require_content_host
+        self._skip = _patterns(skip_patterns)
+        self._allow = _patterns(allow_domains)
+        self._blocked = _patterns(blocked_domains)
+
+    def classify(self, url):
+        """
+        Args:
+            url: Image URL
+
+        Returns:
+            ImageDecision
+        """
+        if not url or len(url) < self.min_length:
+            return ImageDecision(False, "too_short")
+
+        lowered = url.lower()
+
+        match = _first_match(self._skip, lowered)
+        if match is None and "%" in lowered:
+            # Percent-encoded query values, e.g. "...&name=%65moji"
+            match = _first_match(self._skip, unquote(lowered))
+        if match:
+            return ImageDecision(False, f"skip:{match}")
+
+        if _first_match(self._blocked, lowered):
+            return ImageDecision(False, "blocked_host")
+
+        if not _first_match(self._allow, lowered):
+            return ImageDecision(False, "not_cdn")
+
+        if self.require_content_host:
+            if 'scontent' in lowered:
+                return ImageDecision(True, "content:scontent")
+            if 'fbcdn.net' in lowered and 'static' not in lowered:
+                return ImageDecision(True, "content:fbcdn")
+            return ImageDecision(False, "not_content_host")
+
+        return ImageDecision(True, "cdn")
+
+    def __call__(self, url):
+        return self.classify(url).accepted
+
+
+CLASSIFIERS = {
+    # Images found while scraping an article's HTML
+    "article": ImageUrlClassifier(
+        "article",
+        PLACEHOLDER_PATTERNS + UI_PATTERNS,
+        CONTENT_DOMAINS,
+        min_length=10,
+        blocked_domains=STATIC_DOMAINS,
+    ),
+    # Images seen in the live DOM and in gallery network responses
+    "content": ImageUrlClassifier(
+        "content",
+        PLACEHOLDER_PATTERNS + ['emoji', 'icon', 'static', 'rsrc.php',
+                                '_16x16', '_20x20', '_24x24', '_32x32'],
+        CONTENT_DOMAINS + ['fbcdn.net'],
+    ),
+    # Images taken from a post by the spider's fallback path
+    "post": ImageUrlClassifier(
+        "post",
+        PLACEHOLDER_PATTERNS + UI_PATTERNS + EMOJI_PATTERNS + [
+            '/emoticons/', '/reactions/', '/stickers/', 'emoji_', 'icon_',
+            'reaction_', 'static.xx.fbcdn.net/images/emoji',
+            'static.facebook.com/images/emoji', '/images/emoji/',
+        ],
+        CONTENT_DOMAINS + ['fbcdn.net'],
+        require_content_host=True,
+    ),
+}
+
+
+@lru_cache(maxsize=8192)
+def classify_image_url(url, profile="content"):
+    """
+    Classify an image URL with one of the CLASSIFIERS profiles
+
+    Memoized: the DOM and gallery loops see the same URLs many times.
+
+    Args:
+        url: Image URL
+        profile: "article", "content" or "post"
+
+    Returns:
+        ImageDecision
+    """
+    return CLASSIFIERS[profile].classify(url)
+
+
+def is_content_image(url, profile="content"):
+    """True if ``url`` passes the given classifier profile"""
+    return classify_image_url(url, profile).accepted
@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+DEFAULT_HEADERS = {
+    'Referer': 'https://www.facebook.com/',
+    'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Connection': 'keep-alive',
+}
+
+
+class MediaDownloadClient:
+    """
+    Long-lived HTTP client for Facebook media downloads
+
+    One ``requests.Session`` is shared by every download of a crawl, so TLS
+    connections to each CDN host are pooled and reused. Cookies and the user
+    agent are copied from the browser once per driver and re-synced only after
+    ``cookie_ttl`` seconds or when the CDN rejects a request.
+    """
+
+    def __init__(self, pool_connections=16, pool_maxsize=8, cookie_ttl=300, timeout=30):
+        """
+        Args:
+            pool_connections: Number of per-host connection pools kept
+            pool_maxsize: Connections kept alive per CDN host
+            cookie_ttl: Seconds before cookies are re-read from a driver
+            timeout: Request timeout in seconds
+        """
+        self.cookie_ttl = cookie_ttl
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._lock = threading.Lock()
+        self._synced_at = {}
+        self._cookie_fingerprints = {}
+        self.stats = {
+            "downloads": 0,
+            "cookie_reads": 0,
+            "cookie_updates": 0,
+            "retries": 0,
+        }
+
+    def sync_from_driver(self, driver, force=False):
+        """
+        Copy cookies and user agent from a Selenium session if they are stale
+
+        Args:
+            driver: Selenium WebDriver instance
+            force: Re-read cookies even if the last sync is recent
+
+        Returns:
+            bool: True if the session cookies changed
+        """
+        key = getattr(driver, "session_id", None) or id(driver)
+
+        with self._lock:
+            synced_at = self._synced_at.get(key)
+            if not force and synced_at and time.time() - synced_at < self.cookie_ttl:
+                return False
+
+            if synced_at is None:
+                user_agent = driver.execute_script("return navigator.userAgent;")
+                if user_agent:
+                    self.session.headers['User-Agent'] = user_agent
+
+            cookies = driver.get_cookies()
+            self.stats["cookie_reads"] += 1
+            self._synced_at[key] = time.time()
+
+            fingerprint = tuple(sorted(
+                (c['name'], c['value'], c.get('domain')) for c in cookies))
+            if fingerprint == self._cookie_fingerprints.get(key):
+                return False
+
+            for cookie in cookies:
+                self.session.cookies.set(
+                    cookie['name'],
+                    cookie['value'],
+                    domain=cookie.get('domain')
+                )
+            self._cookie_fingerprints[key] = fingerprint
+            self.stats["cookie_updates"] += 1
+            return True
+
+    def get(self, url, driver=None, headers=None, stream=True):
+        """
+        GET a media URL through the shared session
+
+        Args:
+            url: Media URL
+            driver: Driver to take cookies from (optional)
+            headers: Extra request headers
+            stream: Stream the response body
+
+        Returns:
+            requests.Response
+        """
+        if driver is not None:
+            self.sync_from_driver(driver)
+
+        response = self.session.get(
+            url, headers=headers, stream=stream, timeout=self.timeout)
+
+        if response.status_code in (401, 403) and driver is not None:
+            # Cookies may have rotated in the browser since the last sync
+            if self.sync_from_driver(driver, force=True):
+                with self._lock:
+                    self.stats["retries"] += 1
+                response.close()
+                response = self.session.get(
+                    url, headers=headers, stream=stream, timeout=self.timeout)
+
+        # Called from the DownloadQueue worker threads
+        with self._lock:
+            self.stats["downloads"] += 1
+        return response
+
+    def connection_stats(self):
+        """
+        Connection reuse counters per CDN host
+
+        Returns:
+            dict: totals plus a per-host breakdown of requests and new connections
+        """
+        hosts = {}
+        for adapter in set(self.session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for pool_key in list(pools.keys()):
+                pool = pools.get(pool_key)
+                if pool is None:
+                    continue
+                host = hosts.setdefault(pool.host, {"requests": 0, "connections": 0})
+                host["requests"] += pool.num_requests
+                host["connections"] += pool.num_connections
+
+        for host in hosts.values():
+            host["reused"] = max(0, host["requests"] - host["connections"])
+
+        return {
+            "requests": sum(h["requests"] for h in hosts.values()),
+            "connections": sum(h["connections"] for h in hosts.values()),
+            "reused": sum(h["reused"] for h in hosts.values()),
+            "hosts": hosts,
+        }
+
+    def close(self):
+        self.session.close()
+
+
+_media_client = None
+_media_client_lock = threading.Lock()
+
+
+def get_media_client():
+    """
+    Media client shared by every download in this process
+
+    Returns:
+        MediaDownloadClient
+    """
+    global _media_client
+    with _media_client_lock:
+        if _media_client is None:
+            _media_client = MediaDownloadClient()
+        return _media_client
+
+
+def close_media_client():
+    """Close the shared client and return its final counters"""
+    global _media_client
+    with _media_client_lock:
+        client, _media_client = _media_client, None
+    if client is None:
+        return None
+
+    with client._lock:
+        stats = dict(client.stats)
+    stats.update(client.connection_stats())
+    client.close()
+    return stats
+
+
+def format_connection_stats(stats):
+    """
+    Render media client counters as a short report
+
+    Args:
+        stats: Dict from close_media_client()
+
+    Returns:
+        str: e.g. "12 downloads, 12 requests over 2 connections (10 reused)"
+    """
+    lines = [
+        f"{stats['downloads']} downloads, {stats['requests']} requests over "
+        f"{stats['connections']} connections ({stats['reused']} reused), "
+        f"{stats['cookie_reads']} cookie reads"
+    ]
+    for host, counts in sorted(stats["hosts"].items()):
+        lines.append(
+            f"  {host}: {counts['requests']} requests / {counts['connections']} connections")
+    return "\n".join(lines)
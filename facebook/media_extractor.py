@@ -12,6 +12,25 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 import time
 
+from .page_readiness import PageReadiness, drain_network_events
+from .gallery_network import capture_gallery_image_urls
+from .media_client import get_media_client
+from .download_queue import DownloadQueue
+from .url_keys import canonical_image_key
+from .image_classifier import is_content_image
+from .photo_pages import collect_photo_links, resolve_photo_images
+from .snapshots import record_photo_page_images
+from .tracing import traced
+from common.media_store import get_media_store
+
+# How gallery images are collected:
+# "direct" fetches the post's photo pages in parallel and reads og:image,
+# falling back to "network" when photos are only reachable in the viewer,
+# "network" records image responses from DevTools performance logs once
+# the photo viewer is open,
+# "dom" clicks through the viewer and polls the displayed image
+GALLERY_EXTRACTION_MODE = "direct"
+
 
 def extract_images_from_article(article):
     """
@@ -121,62 +140,10 @@ def is_valid_image_url(url):
     Returns:
         bool: True if valid image URL
     """
-    if not url or len(url) < 10:
-        return False
-
-    # Skip data URLs, placeholder images, and tiny images
-    skip_patterns = [
-        'data:image',
-        'blank.gif',
-        'spacer.gif',
-        'transparent.gif',
-        '1x1',
-        'pixel.png',
-        '/assets/',
-        '/static/',
-        # Facebook static UI resources (not content images)
-        'static.xx.fbcdn.net/rsrc.php',
-        'static.facebook.com/rsrc.php',
-        '/rsrc.php',
-        # Common Facebook UI icons and sprites
-        'sprites/',
-        'icons/',
-        'emoji/',
-        '/images/emoji.php',
-        # Profile picture placeholders
-        'profile_pic_header',
-        'default_profile',
-        # UI elements
-        '/ui/',
-        '/chrome/',
-        '/images/icons/',
-    ]
-
-    for pattern in skip_patterns:
-        if pattern in url.lower():
-            return False
-
-    # Must be from Facebook content domains (not static UI domains)
-    valid_domains = [
-        'scontent.com',
-        'scontent-',       # scontent-xxx.xx.fbcdn.net
-        'scontent.',       # scontent.fsgn2-*.fna.fbcdn.net
-        'cdninstagram.com',
-    ]
-
-    # But exclude static resource domains
-    invalid_domains = [
-        'static.xx.fbcdn.net',
-        'static.facebook.com',
-    ]
-
-    for invalid_domain in invalid_domains:
-        if invalid_domain in url:
-            return False
-
-    return any(domain in url for domain in valid_domains)
+    return is_content_image(url, "article")
 
 
+@traced
 def download_image_during_crawl(driver, img_url, save_dir="downloaded_images"):
     """
     Download image using the same browser session and save locally
@@ -196,38 +163,7 @@ def download_image_during_crawl(driver, img_url, save_dir="downloaded_images"):
         # Use selenium to get image with same session/cookies
         driver.get(img_url)
 
-        # Get image content from page source or use requests with driver's cookies
-        cookies = driver.get_cookies()
-        session = requests.Session()
-
-        # Transfer cookies from selenium to requests
-        for cookie in cookies:
-            session.cookies.set(
-                cookie['name'], cookie['value'], domain=cookie.get('domain'))
-
-        # Set same headers as browser
-        headers = {
-            'User-Agent': driver.execute_script("return navigator.userAgent;"),
-            'Referer': 'https://www.facebook.com/',
-            'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
-        }
-
-        response = session.get(img_url, headers=headers, stream=True)
-
-        if response.status_code == 200:
-            # Generate filename from URL hash
-            url_hash = hashlib.md5(img_url.encode()).hexdigest()[:12]
-            filename = f"fb_image_{url_hash}.jpg"
-            filepath = os.path.join(save_dir, filename)
-
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
-            return filepath
-        else:
-            print(f"❌ Failed to download image: HTTP {response.status_code}")
-            return None
+        return store_facebook_image(img_url, save_dir, "fb_image", driver=driver)
 
     except Exception as e:
         print(f"❌ Error downloading image: {e}")
@@ -265,20 +201,37 @@ def extract_and_download_images_from_article(article, driver, save_dir="download
     return local_paths
 
 
-def dismiss_facebook_popup(driver):
+@traced
+def dismiss_facebook_popup(driver, readiness=None):
     """
     Dismiss Facebook login popup/modal that blocks content
 
     Args:
         driver: Selenium WebDriver instance
+        readiness: PageReadiness bounding how long to wait for the popup
 
     Returns:
         bool: True if popup was found and dismissed, False otherwise
     """
     try:
-        # Wait a moment for popup to appear
-        import time
-        time.sleep(2)
+        # Wait for a popup to actually show up instead of sleeping blindly
+        readiness = readiness or PageReadiness()
+        result, close_button = readiness.wait_for_popup(driver)
+        print(f"⏱️ Popup wait: {result.elapsed:.1f}s")
+
+        if not result.satisfied:
+            print("ℹ️  No popup found to dismiss")
+            return False
+
+        try:
+            close_button.click()
+            WebDriverWait(driver, 1).until(
+                EC.invisibility_of_element(close_button))
+            print("✅ Dismissed popup")
+            return True
+        except Exception:
+            # Fall through to the individual selectors below
+            pass
 
         # Multiple selectors for close button on Facebook login popup
         close_selectors = [
@@ -315,7 +268,11 @@ def dismiss_facebook_popup(driver):
                             element.click()
                             print(
                                 f"✅ Dismissed popup using selector: {selector}")
-                            time.sleep(1)  # Wait for popup to close
+                            try:
+                                WebDriverWait(driver, 1).until(
+                                    EC.invisibility_of_element(element))
+                            except TimeoutException:
+                                pass
                             return True
             except Exception as e:
                 # Continue trying other selectors
@@ -341,7 +298,9 @@ def dismiss_facebook_popup(driver):
         return False
 
 
-def extract_all_images_from_facebook_post(driver, article_element, save_dir="image_downloads"):
+@traced
+def extract_all_images_from_facebook_post(driver, article_element, save_dir="image_downloads",
+                                          mode=None):
     """
     Extract ALL images from Facebook post by clicking through photo galleries
 
@@ -349,11 +308,20 @@ def extract_all_images_from_facebook_post(driver, article_element, save_dir="ima
         driver: Selenium WebDriver instance
         article_element: WebElement for the article/post
         save_dir: Directory to save images
+        mode: Gallery extraction mode ("direct", "network" or "dom")
 
     Returns:
-        list: List of downloaded image file paths
+        list: List of downloaded image file paths, in gallery order
     """
     downloaded_images = []
+    mode = mode or GALLERY_EXTRACTION_MODE
+
+    # Browser navigation only enqueues URLs; downloads run in the background.
+    # Cookies are synced here so worker threads never touch the driver
+    get_media_client().sync_from_driver(driver)
+    queue = DownloadQueue(
+        lambda img_url: download_facebook_image_with_session(None, img_url, save_dir),
+        key_func=canonical_image_key)
 
     try:
         print("🔍 Looking for photo galleries in post...")
@@ -361,6 +329,14 @@ def extract_all_images_from_facebook_post(driver, article_element, save_dir="ima
         # Skip visible images extraction - they're duplicates of gallery images
         # visible_images = extract_visible_images_from_post(driver, article_element)
 
+        if mode == "direct":
+            if fetch_photo_page_images(driver, article_element, queue):
+                print(f"⏳ Waiting for {len(queue)} queued downloads...")
+                unique_images = list(dict.fromkeys(queue.wait()))
+                print(f"✅ Total unique images extracted: {len(unique_images)}")
+                return unique_images
+            mode = "network"
+
         # Find photo gallery triggers
         gallery_triggers = find_photo_gallery_triggers(driver, article_element)
 
@@ -371,7 +347,7 @@ def extract_all_images_from_facebook_post(driver, article_element, save_dir="ima
                 print(f"📂 Processing gallery {i+1}/{len(gallery_triggers)}")
 
                 gallery_images = extract_images_from_gallery(
-                    driver, trigger, save_dir)
+                    driver, trigger, save_dir, mode=mode, queue=queue)
 
                 downloaded_images.extend(gallery_images)
 
@@ -386,10 +362,10 @@ def extract_all_images_from_facebook_post(driver, article_element, save_dir="ima
                 print(
                     f"📷 Found {len(visible_images)} directly visible images as fallback")
                 for img_url in visible_images:
-                    downloaded_path = download_facebook_image_with_session(
-                        driver, img_url, save_dir)
-                    if downloaded_path:
-                        downloaded_images.append(downloaded_path)
+                    queue.enqueue(img_url)
+
+        print(f"⏳ Waiting for {len(queue)} queued downloads...")
+        downloaded_images.extend(queue.wait())
 
         # Remove any duplicates at the end level
         unique_images = list(dict.fromkeys(downloaded_images))
@@ -399,9 +375,147 @@ def extract_all_images_from_facebook_post(driver, article_element, save_dir="ima
 
     except Exception as e:
         print(f"❌ Error extracting images from post: {e}")
-        return downloaded_images
+        downloaded_images.extend(queue.wait())
+        return list(dict.fromkeys(downloaded_images))
 
 
+@traced
+def fetch_photo_page_images(driver, article_element, queue):
+    """
+    Queue every photo of a post from its photo pages, without the viewer
+
+    Photo page links are read from the article in one script call and
+    resolved to full-resolution URLs in parallel over the shared media
+    session, so gallery time no longer grows with photos x click latency.
+
+    Args:
+        driver: Selenium WebDriver instance
+        article_element: WebElement for the article/post
+        queue: DownloadQueue to hand image URLs to
+
+    Returns:
+        bool: True if every photo was queued; False if the post has photos
+            only reachable through the viewer ("+N") or a page did not resolve
+    """
+    try:
+        photo_urls, hidden = collect_photo_links(driver, article_element)
+    except Exception as e:
+        print(f"❌ Error reading photo links: {e}")
+        return False
+
+    if not photo_urls:
+        return False
+    if hidden:
+        print(f"🔒 {hidden} more photo(s) only in the viewer, opening gallery instead")
+        return False
+
+    print(f"🔗 Resolving {len(photo_urls)} photo page(s) directly...")
+    image_urls = resolve_photo_images(photo_urls)
+    if not all(image_urls):
+        print(f"⚠️ {image_urls.count(None)} photo page(s) did not resolve, opening gallery instead")
+        return False
+
+    record_photo_page_images(image_urls)
+    for img_url in image_urls:
+        queue.enqueue(img_url)
+    return True
+
+
+# Photo gallery trigger candidates inside an article, most specific first
+GALLERY_TRIGGER_SELECTORS = [
+    # Photo count indicators like "+5 more photos"
+    ".//div[contains(text(), 'more photo') or contains(text(), '+')]",
+    ".//span[contains(text(), 'more photo') or contains(text(), '+')]",
+
+    # Photo grid containers (multiple photos in a grid)
+    ".//div[contains(@class, 'photoGrid') or contains(@class, 'photo-grid')]",
+    ".//div[contains(@class, 'photoContainer') and count(.//img) > 1]",
+
+    # Clickable photo containers
+    ".//div[@role='button'][.//img]",
+    ".//a[@role='link'][.//img]",
+
+    # Facebook specific photo gallery triggers
+    ".//div[contains(@class, 'uiMediaThumb')]",
+    ".//div[contains(@class, 'scaledImageFitWidth')][@role='button']",
+
+    # Images that are clickable (lead to galleries)
+    ".//img[@role='button' or @tabindex='0']",
+    ".//img[parent::div[@role='button'] or parent::a[@role='link']]",
+]
+
+# Evaluates every selector against the article and returns, per matched
+# element, everything classification and dedupe need in one round-trip
+GALLERY_TRIGGER_SCRIPT = """
+const [article, selectors, maxImages] = arguments;
+const nodes = [], seen = new Set(), parents = new Map();
+for (const xpath of selectors) {
+  let result;
+  try {
+    result = document.evaluate(
+      xpath, article, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+  } catch (e) {
+    continue;
+  }
+  for (let i = 0; i < result.snapshotLength; i++) {
+    const el = result.snapshotItem(i);
+    if (!seen.has(el)) {
+      seen.add(el);
+      nodes.push(el);
+    }
+  }
+}
+return nodes.map(el => {
+  const rect = el.getBoundingClientRect();
+  const style = window.getComputedStyle(el);
+  const images = Array.from(el.getElementsByTagName('img'));
+  const parent = el.parentElement;
+  if (!parents.has(parent)) parents.set(parent, parents.size);
+  return {
+    element: el,
+    text: (el.innerText || '').trim(),
+    image_count: images.length,
+    image_srcs: images.slice(0, maxImages).map(img => img.src),
+    class_name: el.getAttribute('class') || '',
+    displayed: rect.width > 0 && rect.height > 0
+      && style.visibility !== 'hidden' && style.display !== 'none',
+    enabled: !el.disabled,
+    x: rect.left + window.scrollX,
+    y: rect.top + window.scrollY,
+    parent: parents.get(parent),
+  };
+});
+"""
+
+GALLERY_INDICATORS = [
+    'more photo', '+', 'photos', 'see all', 'view all',
+    'more images', 'additional', 'others'
+]
+GALLERY_CLASSES = [
+    'photo', 'gallery', 'media', 'grid', 'thumb',
+    'container', 'viewer', 'lightbox'
+]
+
+
+def snapshot_gallery_triggers(driver, article_element, max_images=2):
+    """
+    Collect every gallery trigger candidate of an article in one script call
+
+    Args:
+        driver: Selenium WebDriver instance
+        article_element: WebElement for the article/post
+        max_images: Image srcs kept per candidate (used for dedupe)
+
+    Returns:
+        list: Dicts with element, text, image_count, image_srcs, class_name,
+            displayed, enabled, x, y and parent (container id)
+    """
+    return driver.execute_script(
+        GALLERY_TRIGGER_SCRIPT, article_element, GALLERY_TRIGGER_SELECTORS,
+        max_images) or []
+
+
+@traced
 def find_photo_gallery_triggers(driver, article_element):
     """
     Find clickable elements that open photo galleries in Facebook posts
@@ -416,39 +530,13 @@ def find_photo_gallery_triggers(driver, article_element):
     triggers = []
 
     try:
-        # Multiple selectors for photo gallery triggers
-        gallery_selectors = [
-            # Photo count indicators like "+5 more photos"
-            ".//div[contains(text(), 'more photo') or contains(text(), '+')]",
-            ".//span[contains(text(), 'more photo') or contains(text(), '+')]",
-
-            # Photo grid containers (multiple photos in a grid)
-            ".//div[contains(@class, 'photoGrid') or contains(@class, 'photo-grid')]",
-            ".//div[contains(@class, 'photoContainer') and count(.//img) > 1]",
-
-            # Clickable photo containers
-            ".//div[@role='button'][.//img]",
-            ".//a[@role='link'][.//img]",
-
-            # Facebook specific photo gallery triggers
-            ".//div[contains(@class, 'uiMediaThumb')]",
-            ".//div[contains(@class, 'scaledImageFitWidth')][@role='button']",
-
-            # Images that are clickable (lead to galleries)
-            ".//img[@role='button' or @tabindex='0']",
-            ".//img[parent::div[@role='button'] or parent::a[@role='link']]",
-        ]
-
-        for selector in gallery_selectors:
-            try:
-                elements = article_element.find_elements(By.XPATH, selector)
-                for element in elements:
-                    if element.is_displayed() and element.is_enabled():
-                        # Check if element might lead to a gallery
-                        if is_likely_gallery_trigger(element):
-                            triggers.append(element)
-            except Exception:
-                continue
+        # One execute_script instead of find_elements/is_displayed/.text/...
+        # round-trips per candidate; classification runs on the snapshot
+        for candidate in snapshot_gallery_triggers(driver, article_element):
+            if candidate["displayed"] and candidate["enabled"]:
+                # Check if element might lead to a gallery
+                if is_likely_gallery_trigger(candidate):
+                    triggers.append(candidate)
 
     except Exception as e:
         print(f"❌ Error finding gallery triggers: {e}")
@@ -460,7 +548,7 @@ def find_photo_gallery_triggers(driver, article_element):
         print(
             f"🔍 Found {len(triggers)} potential triggers, deduplicated to {len(unique_triggers)} unique galleries")
 
-    return unique_triggers
+    return [trigger["element"] for trigger in unique_triggers]
 
 
 def deduplicate_gallery_triggers(triggers):
@@ -468,7 +556,7 @@ def deduplicate_gallery_triggers(triggers):
     Remove duplicate triggers that lead to the same gallery
 
     Args:
-        triggers: List of WebElements that can trigger galleries
+        triggers: Candidate dicts from snapshot_gallery_triggers()
 
     Returns:
         list: Deduplicated list of unique gallery triggers
@@ -478,119 +566,80 @@ def deduplicate_gallery_triggers(triggers):
     seen_containers = set()
 
     for trigger in triggers:
-        try:
-            # Method 1: Check if triggers are in the same container/parent
-            parent_element = trigger.find_element(By.XPATH, "./..")
-            parent_id = id(parent_element)
+        # Method 1: Check if triggers are in the same container/parent
+        if trigger["parent"] in seen_containers:
+            print(f"  🔄 Skipping duplicate trigger in same container")
+            continue
 
-            if parent_id in seen_containers:
-                print(f"  🔄 Skipping duplicate trigger in same container")
-                continue
+        # Method 2: Check location proximity (triggers close together likely same gallery)
+        # Group by 50px grid
+        location_key = (
+            int(trigger["x"]) // 50,
+            int(trigger["y"]) // 50
+        )
 
-            # Method 2: Check location proximity (triggers close together likely same gallery)
-            location = trigger.location
-            # Group by 50px grid
-            location_key = (
-                location['x'] // 50,
-                location['y'] // 50
-            )
+        if location_key in seen_locations:
+            print(f"  🔄 Skipping duplicate trigger at similar location")
+            continue
 
-            if location_key in seen_locations:
-                print(f"  🔄 Skipping duplicate trigger at similar location")
-                continue
+        seen_locations.add(location_key)
+        seen_containers.add(trigger["parent"])
 
-            seen_locations.add(location_key)
-            seen_containers.add(parent_id)
-
-            # Method 3: Check content similarity
-            current_text = trigger.text.strip()
-            current_images = trigger.find_elements(By.TAG_NAME, "img")
-            current_image_srcs = [img.get_attribute(
-                "src") for img in current_images[:2]]  # First 2 images
-
-            # Check if content is too similar to existing triggers
-            is_similar = False
-            for existing_trigger in unique_triggers:
-                try:
-                    existing_text = existing_trigger.text.strip()
-                    existing_images = existing_trigger.find_elements(
-                        By.TAG_NAME, "img")
-                    existing_image_srcs = [img.get_attribute(
-                        "src") for img in existing_images[:2]]
-
-                    # Check text similarity
-                    if current_text and existing_text and current_text == existing_text:
-                        is_similar = True
-                        break
-
-                    # Check image similarity
-                    if current_image_srcs and existing_image_srcs:
-                        if any(src in existing_image_srcs for src in current_image_srcs if src):
-                            is_similar = True
-                            break
+        # Method 3: Check content similarity
+        current_text = trigger["text"]
+        current_image_srcs = [src for src in trigger["image_srcs"] if src]
 
-                except Exception:
-                    continue
+        # Check if content is too similar to existing triggers
+        is_similar = False
+        for existing_trigger in unique_triggers:
+            existing_text = existing_trigger["text"]
 
-            if is_similar:
-                print(f"  🔄 Skipping duplicate trigger with similar content")
-                continue
+            # Check text similarity
+            if current_text and existing_text and current_text == existing_text:
+                is_similar = True
+                break
 
-            unique_triggers.append(trigger)
+            # Check image similarity
+            if any(src in existing_trigger["image_srcs"] for src in current_image_srcs):
+                is_similar = True
+                break
 
-        except Exception as e:
-            # If we can't analyze this trigger, include it to be safe
-            unique_triggers.append(trigger)
+        if is_similar:
+            print(f"  🔄 Skipping duplicate trigger with similar content")
             continue
 
+        unique_triggers.append(trigger)
+
     return unique_triggers
 
 
-def is_likely_gallery_trigger(element):
+def is_likely_gallery_trigger(trigger):
     """
     Check if element is likely to trigger a photo gallery
 
     Args:
-        element: WebElement to check
+        trigger: Candidate dict from snapshot_gallery_triggers()
 
     Returns:
         bool: True if likely a gallery trigger
     """
-    try:
-        # Check text content for gallery indicators
-        text = element.text.lower()
-        gallery_indicators = [
-            'more photo', '+', 'photos', 'see all', 'view all',
-            'more images', 'additional', 'others'
-        ]
+    # Check text content for gallery indicators
+    text = trigger["text"].lower()
+    if any(indicator in text for indicator in GALLERY_INDICATORS):
+        return True
 
-        for indicator in gallery_indicators:
-            if indicator in text:
-                return True
+    # Check if element contains multiple images
+    if trigger["image_count"] > 1:
+        return True
 
-        # Check if element contains multiple images
-        images = element.find_elements(By.TAG_NAME, "img")
-        if len(images) > 1:
-            return True
-
-        # Check for gallery-related attributes or classes
-        class_name = element.get_attribute("class") or ""
-        gallery_classes = [
-            'photo', 'gallery', 'media', 'grid', 'thumb',
-            'container', 'viewer', 'lightbox'
-        ]
-
-        for gallery_class in gallery_classes:
-            if gallery_class in class_name.lower():
-                return True
-
-        return False
-
-    except Exception:
-        return False
+    # Check for gallery-related attributes or classes
+    class_name = trigger["class_name"].lower()
+    return any(gallery_class in class_name for gallery_class in GALLERY_CLASSES)
 
 
-def extract_images_from_gallery(driver, gallery_trigger, save_dir="image_downloads"):
+@traced
+def extract_images_from_gallery(driver, gallery_trigger, save_dir="image_downloads", mode=None,
+                                queue=None):
     """
     Click on gallery trigger and extract all images from the opened gallery
 
@@ -598,13 +647,20 @@ def extract_images_from_gallery(driver, gallery_trigger, save_dir="image_downloa
         driver: Selenium WebDriver instance
         gallery_trigger: WebElement that opens the gallery
         save_dir: Directory to save images
+        mode: "network" to read image URLs from DevTools network events,
+            "dom" to click through the viewer (default: "network" when
+            GALLERY_EXTRACTION_MODE is "direct")
+        queue: DownloadQueue to hand image URLs to instead of downloading inline
 
     Returns:
-        list: List of downloaded image file paths
+        list: List of downloaded image file paths (empty when queued)
     """
     gallery_images = []
     start_time = time.time()
     max_gallery_time = 300  # 5 minutes max per gallery
+    mode = mode or GALLERY_EXTRACTION_MODE
+    if mode == "direct":
+        mode = "network"
 
     try:
         print("🖱️ Clicking gallery trigger...")
@@ -614,6 +670,10 @@ def extract_images_from_gallery(driver, gallery_trigger, save_dir="image_downloa
             "arguments[0].scrollIntoView({block: 'center'});", gallery_trigger)
         time.sleep(1)
 
+        if mode == "network":
+            # Only responses caused by opening the viewer should be recorded
+            drain_network_events(driver)
+
         # Try to click the trigger
         try:
             gallery_trigger.click()
@@ -621,18 +681,31 @@ def extract_images_from_gallery(driver, gallery_trigger, save_dir="image_downloa
             # Fallback: JavaScript click
             driver.execute_script("arguments[0].click();", gallery_trigger)
 
-        time.sleep(2)  # Wait for gallery to open
+        if mode == "network":
+            image_urls = capture_gallery_image_urls(
+                driver, is_valid_facebook_content_image)
+            if image_urls:
+                for img_url in image_urls:
+                    if queue is not None:
+                        queue.enqueue(img_url)
+                    elif downloaded_path := download_facebook_image_with_session(
+                            driver, img_url, save_dir):
+                        gallery_images.append(downloaded_path)
+                return gallery_images
+            print("⚠️ No images captured from network, falling back to DOM navigation")
+        else:
+            time.sleep(2)  # Wait for gallery to open
 
         # Check if photo viewer/modal opened
         if is_photo_viewer_open(driver):
             print("📸 Photo viewer opened, extracting images...")
             gallery_images = navigate_and_extract_gallery_images(
-                driver, save_dir)
+                driver, save_dir, queue=queue)
         else:
             print("⚠️ Photo viewer did not open, trying direct image extraction...")
             # Fallback: try to extract images from current page
             gallery_images = extract_visible_images_after_click(
-                driver, save_dir)
+                driver, save_dir, queue=queue)
 
         # Check if we've been processing too long
         elapsed_time = time.time() - start_time
@@ -686,7 +759,9 @@ def is_photo_viewer_open(driver):
         return False
 
 
-def navigate_and_extract_gallery_images(driver, save_dir="image_downloads", max_images=50):
+@traced
+def navigate_and_extract_gallery_images(driver, save_dir="image_downloads", max_images=50,
+                                        queue=None):
     """
     Navigate through Facebook photo gallery and extract all images
 
@@ -694,9 +769,10 @@ def navigate_and_extract_gallery_images(driver, save_dir="image_downloads", max_
         driver: Selenium WebDriver instance
         save_dir: Directory to save images
         max_images: Maximum number of images to extract (safety limit)
+        queue: DownloadQueue to hand image URLs to instead of downloading inline
 
     Returns:
-        list: List of downloaded image file paths
+        list: List of downloaded image file paths (empty when queued)
     """
     extracted_images = []
     seen_images = set()
@@ -740,22 +816,31 @@ def navigate_and_extract_gallery_images(driver, save_dir="image_downloads", max_
                 consecutive_failures = 0  # Reset counter when we get a new image
                 last_image_url = current_image_url
 
-            if current_image_url and current_image_url not in seen_images:
-                seen_images.add(current_image_url)
-
-                # Download current image
-                downloaded_path = download_facebook_image_with_session(
-                    driver, current_image_url, save_dir
-                )
-                if downloaded_path:
-                    extracted_images.append(downloaded_path)
-                    print(
-                        f"  ✅ Downloaded: {os.path.basename(downloaded_path)}")
+            # Same photo may come back with fresh signature params
+            current_image_key = canonical_image_key(
+                current_image_url) if current_image_url else None
+
+            if current_image_url and current_image_key not in seen_images:
+                seen_images.add(current_image_key)
+
+                if queue is not None:
+                    # Download in the background and move on to the next photo
+                    queue.enqueue(current_image_url)
+                    print(f"  📥 Queued: {current_image_url[:50]}...")
                 else:
-                    print(
-                        f"  ❌ Failed to download: {current_image_url[:50]}...")
+                    # Download current image
+                    downloaded_path = download_facebook_image_with_session(
+                        driver, current_image_url, save_dir
+                    )
+                    if downloaded_path:
+                        extracted_images.append(downloaded_path)
+                        print(
+                            f"  ✅ Downloaded: {os.path.basename(downloaded_path)}")
+                    else:
+                        print(
+                            f"  ❌ Failed to download: {current_image_url[:50]}...")
 
-            elif current_image_url in seen_images:
+            elif current_image_key in seen_images:
                 print(f"  ⏭️ Already processed this image")
                 consecutive_failures += 1
                 if consecutive_failures >= max_consecutive_failures:
@@ -1094,16 +1179,17 @@ def extract_visible_images_from_post(driver, article_element):
     return list(dict.fromkeys(images))  # Remove duplicates
 
 
-def extract_visible_images_after_click(driver, save_dir):
+def extract_visible_images_after_click(driver, save_dir, queue=None):
     """
     Extract images from page after clicking (fallback when modal doesn't open)
 
     Args:
         driver: Selenium WebDriver instance
         save_dir: Directory to save images
+        queue: DownloadQueue to hand image URLs to instead of downloading inline
 
     Returns:
-        list: List of downloaded image file paths
+        list: List of downloaded image file paths (empty when queued)
     """
     downloaded_images = []
 
@@ -1118,6 +1204,9 @@ def extract_visible_images_after_click(driver, save_dir):
             if img.is_displayed():
                 src = img.get_attribute('src')
                 if src and is_valid_facebook_content_image(src):
+                    if queue is not None:
+                        queue.enqueue(src)
+                        continue
                     downloaded_path = download_facebook_image_with_session(
                         driver, src, save_dir)
                     if downloaded_path:
@@ -1139,29 +1228,7 @@ def is_valid_facebook_content_image(url):
     Returns:
         bool: True if valid content image
     """
-    if not url or len(url) < 20:
-        return False
-
-    # Must be from Facebook content domains
-    valid_domains = [
-        'scontent.com',
-        'scontent-',
-        'scontent.',
-        'fbcdn.net',
-        'cdninstagram.com'
-    ]
-
-    # Skip UI elements and emoji
-    skip_patterns = [
-        'emoji', 'icon', 'static', 'rsrc.php', '_16x16', '_20x20', '_24x24', '_32x32',
-        'blank.gif', 'spacer.gif', '1x1', 'pixel.png'
-    ]
-
-    for pattern in skip_patterns:
-        if pattern in url.lower():
-            return False
-
-    return any(domain in url for domain in valid_domains)
+    return is_content_image(url, "content")
 
 
 def download_facebook_image_with_session(driver, img_url, save_dir="image_downloads"):
@@ -1169,7 +1236,8 @@ def download_facebook_image_with_session(driver, img_url, save_dir="image_downlo
     Download Facebook image using Selenium session cookies
 
     Args:
-        driver: Selenium WebDriver instance
+        driver: Selenium WebDriver instance, or None to use the cookies
+            already synced into the shared media client
         img_url: Image URL to download
         save_dir: Directory to save image
 
@@ -1177,63 +1245,80 @@ def download_facebook_image_with_session(driver, img_url, save_dir="image_downlo
         str: Local file path or None if failed
     """
     try:
-        if not os.path.exists(save_dir):
-            os.makedirs(save_dir)
+        os.makedirs(save_dir, exist_ok=True)
 
-        # Get cookies from Selenium session
-        cookies = driver.get_cookies()
-        session = requests.Session()
-
-        # Transfer cookies
-        for cookie in cookies:
-            session.cookies.set(
-                cookie['name'],
-                cookie['value'],
-                domain=cookie.get('domain')
-            )
-
-        # Set headers
-        headers = {
-            'User-Agent': driver.execute_script("return navigator.userAgent;"),
-            'Referer': 'https://www.facebook.com/',
-            'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
-        }
-
-        response = session.get(img_url, headers=headers,
-                               stream=True, timeout=30)
-
-        if response.status_code == 200:
-            # Generate filename
-            url_hash = hashlib.md5(img_url.encode()).hexdigest()[:12]
-
-            # Determine file extension
-            content_type = response.headers.get('content-type', '')
-            if 'jpeg' in content_type or 'jpg' in content_type:
-                ext = '.jpg'
-            elif 'png' in content_type:
-                ext = '.png'
-            elif 'webp' in content_type:
-                ext = '.webp'
-            else:
-                ext = '.jpg'  # Default
+        return store_facebook_image(img_url, save_dir, "fb_gallery", driver=driver)
 
-            filename = f"fb_gallery_{url_hash}{ext}"
-            filepath = os.path.join(save_dir, filename)
+    except Exception as e:
+        print(f"❌ Download error: {e}")
+        return None
 
-            # Save image
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
 
-            return filepath
-        else:
+def image_extension(response, img_url):
+    """
+    Pick a file extension from the Content-Type, falling back to the URL
+
+    Args:
+        response: requests.Response for the image
+        img_url: Image URL
+
+    Returns:
+        str: ".jpg", ".png" or ".webp"
+    """
+    content_type = response.headers.get('content-type', '')
+    if 'jpeg' in content_type or 'jpg' in content_type:
+        return '.jpg'
+    elif 'png' in content_type:
+        return '.png'
+    elif 'webp' in content_type:
+        return '.webp'
+
+    path = urlparse(img_url).path
+    if '.png' in path:
+        return '.png'
+    return '.jpg'  # Default
+
+
+@traced
+def store_facebook_image(img_url, save_dir, prefix, driver=None, headers=None):
+    """
+    Fetch a Facebook image through the shared media store
+
+    Images are keyed by canonical_image_key(), so a photo fetched in an
+    earlier crawl is served from the store without any network request even
+    though its signed URL changed; new bytes are stored once by content hash.
+    The returned file is a hard link into the store named
+    ``<prefix>_<key hash><ext>``, stable across crawls.
+
+    Args:
+        img_url: Image URL
+        save_dir: Directory for the named copy
+        prefix: File name prefix ("fb_image" or "fb_gallery")
+        driver: Selenium WebDriver to take cookies from (optional)
+        headers: Extra request headers
+
+    Returns:
+        str: Local file path or None if the download failed
+    """
+    store = get_media_store()
+    image_key = canonical_image_key(img_url)
+    url_hash = hashlib.md5(image_key.encode()).hexdigest()[:12]
+
+    if blob_path := store.lookup(image_key):
+        ext = os.path.splitext(blob_path)[1]
+        return store.link(blob_path, os.path.join(save_dir, f"{prefix}_{url_hash}{ext}"))
+
+    # Shared session: pooled CDN connections, cookies synced only when stale
+    # Streamed response: close it on every path to hand the connection back
+    with get_media_client().get(img_url, driver=driver, headers=headers) as response:
+        if response.status_code != 200:
             print(f"❌ HTTP {response.status_code}: {img_url[:50]}...")
             return None
 
-    except Exception as e:
-        print(f"❌ Download error: {e}")
-        return None
+        ext = image_extension(response, img_url)
+        blob_path = store.put_stream(
+            image_key, response.iter_content(chunk_size=8192), ext)
+    return store.link(blob_path, os.path.join(save_dir, f"{prefix}_{url_hash}{ext}"))
 
 
 if __name__ == "__main__":
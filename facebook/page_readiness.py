@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+
+import json
+import logging
+import time
+from collections import namedtuple
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+logger = logging.getLogger(__name__)
+
+ARTICLE_XPATH = "//div[@role='article']"
+
+COOKIE_LABELS = ["모든 쿠키 허용", "Allow all cookies"]
+COOKIE_BUTTON_XPATH = (
+    "//div[@role='button' and ("
+    + " or ".join(f"@aria-label='{label}'" for label in COOKIE_LABELS)
+    + ") and not(@aria-disabled)]"
+)
+
+# Union of the close buttons dismiss_facebook_popup knows about, so popup
+# detection costs one WebDriver round-trip per poll
+POPUP_CLOSE_XPATH = " | ".join([
+    "//div[@aria-label='Close']",
+    "//button[@aria-label='Close']",
+    "//div[text()='×']",
+    "//span[text()='×']",
+    "//a[contains(text(), 'Not Now')]",
+    "//button[contains(text(), 'Not Now')]",
+])
+
+NETWORK_START_EVENTS = {"Network.requestWillBeSent"}
+NETWORK_END_EVENTS = {"Network.loadingFinished", "Network.loadingFailed"}
+
+WaitResult = namedtuple("WaitResult", ["name", "satisfied", "elapsed"])
+
+
+def drain_network_events(driver):
+    """
+    Read pending DevTools network events from the performance log
+
+    Args:
+        driver: Selenium WebDriver with ``goog:loggingPrefs`` performance logging
+
+    Returns:
+        list: (method, params) tuples, or None if performance logging is off
+    """
+    try:
+        entries = driver.get_log("performance")
+    except WebDriverException:
+        return None
+    except Exception:
+        return None
+
+    events = []
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        method = message.get("method", "")
+        if method.startswith("Network."):
+            events.append((method, message.get("params", {})))
+    return events
+
+
+class PageReadiness:
+    """
+    Wait for concrete page conditions instead of fixed sleeps
+
+    Every wait is bounded by a configurable timeout and returns a WaitResult
+    with the time it actually took, so slow pages can be told apart from
+    slow sleeps.
+    """
+
+    def __init__(self, page_timeout=10, network_idle_time=0.5,
+                 network_max_inflight=2, cookie_timeout=5, popup_timeout=3,
+                 scroll_timeout=5, poll_frequency=0.1):
+        """
+        Args:
+            page_timeout: Upper bound for article and network-idle waits
+            network_idle_time: Quiet period that counts as network idle
+            network_max_inflight: Requests allowed in flight while idle
+                (Facebook keeps long-polling connections open)
+            cookie_timeout: Upper bound for the cookie banner wait
+            popup_timeout: Upper bound for the login popup wait
+            scroll_timeout: Upper bound for new feed articles after a scroll
+            poll_frequency: Seconds between condition checks
+        """
+        self.page_timeout = page_timeout
+        self.network_idle_time = network_idle_time
+        self.network_max_inflight = network_max_inflight
+        self.cookie_timeout = cookie_timeout
+        self.popup_timeout = popup_timeout
+        self.scroll_timeout = scroll_timeout
+        self.poll_frequency = poll_frequency
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(
+            page_timeout=settings.getfloat("PAGE_READY_TIMEOUT", 10),
+            network_idle_time=settings.getfloat("NETWORK_IDLE_TIME", 0.5),
+            network_max_inflight=settings.getint("NETWORK_MAX_INFLIGHT", 2),
+            cookie_timeout=settings.getfloat("COOKIE_BANNER_TIMEOUT", 5),
+            popup_timeout=settings.getfloat("POPUP_TIMEOUT", 3),
+            scroll_timeout=settings.getfloat("FEED_SCROLL_TIMEOUT", 5),
+        )
+
+    def wait_for_page(self, driver):
+        """
+        Wait until the first article is present and the network settles
+
+        Args:
+            driver: Selenium WebDriver instance
+
+        Returns:
+            list: WaitResult for each stage
+        """
+        results = [self.wait_for_articles(driver)]
+        results.append(self.wait_for_network_idle(driver))
+        return results
+
+    def wait_for_articles(self, driver):
+        """Wait for the first ``div[@role='article']``"""
+        return self._wait(
+            driver, "articles", self.page_timeout,
+            EC.presence_of_element_located((By.XPATH, ARTICLE_XPATH)),
+        )[0]
+
+    def wait_for_more_articles(self, driver, count):
+        """Wait until the feed holds more than ``count`` articles"""
+        return self._wait(
+            driver, "more_articles", self.scroll_timeout,
+            lambda d: len(d.find_elements(By.XPATH, ARTICLE_XPATH)) > count,
+        )[0]
+
+    def wait_for_cookie_banner(self, driver):
+        """
+        Wait for the cookie consent button, giving up as soon as articles
+        render without one
+
+        Returns:
+            tuple: (WaitResult, clickable button WebElement or None)
+        """
+        def banner_or_content(d):
+            buttons = d.find_elements(By.XPATH, COOKIE_BUTTON_XPATH)
+            for button in buttons:
+                if button.is_displayed() and button.is_enabled():
+                    return button
+            if d.find_elements(By.XPATH, ARTICLE_XPATH):
+                return "content"
+            return False
+
+        result, found = self._wait(
+            driver, "cookie_banner", self.cookie_timeout, banner_or_content)
+        if found == "content":
+            return result._replace(satisfied=False), None
+        return result, found
+
+    def wait_for_popup(self, driver):
+        """
+        Wait for a login popup close button to become visible, giving up as
+        soon as articles render without one
+
+        Returns:
+            tuple: (WaitResult, close button WebElement or None)
+        """
+        def close_button_or_content(d):
+            for element in d.find_elements(By.XPATH, POPUP_CLOSE_XPATH):
+                if element.is_displayed() and element.is_enabled():
+                    return element
+            if d.find_elements(By.XPATH, ARTICLE_XPATH):
+                return "content"
+            return False
+
+        result, found = self._wait(
+            driver, "popup", self.popup_timeout, close_button_or_content)
+        if found == "content":
+            return result._replace(satisfied=False), None
+        return result, found
+
+    def wait_for_network_idle(self, driver):
+        """
+        Wait until no more than ``network_max_inflight`` requests have been
+        in flight for ``network_idle_time`` seconds
+
+        Uses DevTools network events from the performance log; falls back to
+        the Resource Timing buffer when performance logging is disabled.
+        """
+        start = time.time()
+        deadline = start + self.page_timeout
+        inflight = set()
+        last_activity = start
+        last_resource_count = None
+
+        while True:
+            now = time.time()
+            events = drain_network_events(driver)
+
+            if events is None:
+                try:
+                    resource_count = driver.execute_script(
+                        "return performance.getEntriesByType('resource').length;")
+                except Exception:
+                    resource_count = last_resource_count
+                if resource_count != last_resource_count:
+                    last_resource_count = resource_count
+                    last_activity = now
+            else:
+                for method, params in events:
+                    request_id = params.get("requestId")
+                    if method in NETWORK_START_EVENTS:
+                        inflight.add(request_id)
+                        last_activity = now
+                    elif method in NETWORK_END_EVENTS:
+                        inflight.discard(request_id)
+                        last_activity = now
+
+            quiet = len(inflight) <= self.network_max_inflight
+            if quiet and now - last_activity >= self.network_idle_time:
+                return WaitResult("network_idle", True, now - start)
+            if now >= deadline:
+                return WaitResult("network_idle", False, now - start)
+            time.sleep(self.poll_frequency)
+
+    def _wait(self, driver, name, timeout, condition):
+        start = time.time()
+        try:
+            found = WebDriverWait(
+                driver, timeout, poll_frequency=self.poll_frequency
+            ).until(condition)
+            return WaitResult(name, True, time.time() - start), found
+        except TimeoutException:
+            return WaitResult(name, False, time.time() - start), None
+
+
+def format_wait_results(results):
+    """
+    Render wait results as a one-line report
+
+    Args:
+        results: Iterable of WaitResult
+
+    Returns:
+        str: e.g. "articles 1.2s ✓ | network_idle 0.8s ✓"
+    """
+    return " | ".join(
+        f"{r.name} {r.elapsed:.1f}s {'✓' if r.satisfied else '✗'}"
+        for r in results
+    )
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+
+import html
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from .media_client import get_media_client
+from .url_keys import extract_photo_id
+
+
+# Photo pages fetched concurrently per post
+PHOTO_PAGE_WORKERS = 4
+
+PHOTO_PAGE_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+}
+
+# Every link of the article plus the largest "+N" overlay (photos that are
+# not linked from the post and only reachable through the viewer)
+PHOTO_LINKS_SCRIPT = """
+const article = arguments[0];
+const hrefs = Array.from(article.querySelectorAll('a[href]'), a => a.href);
+let hidden = 0;
+const walker = document.createTreeWalker(article, NodeFilter.SHOW_TEXT);
+while (walker.nextNode()) {
+  const match = /^\\s*\\+\\s*(\\d+)\\s*$/.exec(walker.currentNode.nodeValue);
+  if (match) hidden = Math.max(hidden, parseInt(match[1], 10));
+}
+return {hrefs: hrefs, hidden: hidden};
+"""
+
+META_TAG_RE = re.compile(r'<meta\b[^>]*>', re.IGNORECASE)
+META_ATTR_RE = re.compile(r'\b(property|name|content)\s*=\s*(["\'])(.*?)\2',
+                          re.IGNORECASE | re.DOTALL)
+
+
+def photo_page_links(hrefs):
+    """
+    Photo page links of a post, one per photo
+
+    Args:
+        hrefs: Link targets in document order
+
+    Returns:
+        list: Photo page URLs in document order, deduplicated by photo ID
+    """
+    links = {}
+    for href in hrefs:
+        photo_id = extract_photo_id(href)
+        if photo_id and photo_id not in links:
+            links[photo_id] = href
+    return list(links.values())
+
+
+def collect_photo_links(driver, article_element):
+    """
+    Read the photo page links of a post in one script call
+
+    Args:
+        driver: Selenium WebDriver instance
+        article_element: WebElement for the article/post
+
+    Returns:
+        tuple: (photo page URLs, number of photos hidden behind a "+N" overlay)
+    """
+    result = driver.execute_script(PHOTO_LINKS_SCRIPT, article_element) or {}
+    return photo_page_links(result.get("hrefs") or []), int(result.get("hidden") or 0)
+
+
+def og_image_url(page_html):
+    """
+    Full-resolution image URL a photo page advertises in ``og:image``
+
+    Args:
+        page_html: Photo page HTML
+
+    Returns:
+        str: Image URL, or None if the page has no og:image
+    """
+    for tag in META_TAG_RE.finditer(page_html):
+        attrs = {name.lower(): value for name, _, value in META_ATTR_RE.findall(tag.group())}
+        if attrs.get("property", attrs.get("name")) == "og:image" and attrs.get("content"):
+            return html.unescape(attrs["content"])
+    return None
+
+
+def resolve_photo_image(photo_url, client=None):
+    """
+    Fetch one photo page and return its full-resolution image URL
+
+    Args:
+        photo_url: Photo page URL
+        client: MediaDownloadClient (defaults to the shared client, whose
+            cookies were synced from the driver)
+
+    Returns:
+        str: Image URL or None if the page could not be resolved
+    """
+    client = client or get_media_client()
+    try:
+        response = client.get(photo_url, headers=PHOTO_PAGE_HEADERS, stream=False)
+    except Exception as e:
+        print(f"❌ Photo page error: {e}")
+        return None
+
+    if response.status_code != 200:
+        print(f"❌ HTTP {response.status_code}: {photo_url[:50]}...")
+        return None
+    return og_image_url(response.text)
+
+
+def resolve_photo_images(photo_urls, max_workers=PHOTO_PAGE_WORKERS):
+    """
+    Resolve photo pages in parallel
+
+    Args:
+        photo_urls: Photo page URLs
+        max_workers: Concurrent photo page requests
+
+    Returns:
+        list: Image URL or None per photo page, in input order
+    """
+    if not photo_urls:
+        return []
+    client = get_media_client()
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(photo_urls)),
+                            thread_name_prefix="fb-photo-page") as executor:
+        return list(executor.map(lambda url: resolve_photo_image(url, client), photo_urls))
+
+
+if __name__ == "__main__":
+    sample = """<html><head>
+<meta property="og:title" content="Photo">
+<meta content="https://scontent.xx.fbcdn.net/v/t39.30808-6/1_2_3_n.jpg?stp=dst-jpg&amp;oh=00_A"
+      property="og:image" />
+</head></html>"""
+    print(f"🖼️ og:image → {og_image_url(sample)}")
+    print("🔗 Photo links:")
+    for link in photo_page_links([
+        "https://www.facebook.com/page/posts/123",
+        "https://www.facebook.com/photo/?fbid=111&set=pcb.123",
+        "https://www.facebook.com/photo/?fbid=111&set=pcb.123&__tn__=x",
+        "https://www.facebook.com/page/photos/a.9/222/",
+    ]):
+        print(f"  {link}")
@@ -1,5 +1,49 @@
 #!/usr/bin/env python
 
+# Number of Chrome drivers kept alive by SimpleSeleniumMiddleware; the
+# crawler runs this many page loads concurrently
+DRIVER_POOL_SIZE = 2
+
+# URL patterns (Network.setBlockedURLs wildcard syntax) per resource type.
+# We only read the article DOM and image URLs, so fonts, video and
+# tracking/ad beacons are dead weight
+BLOCKED_RESOURCE_PATTERNS = {
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": [
+        "*.mp4*", "*.webm*", "*.m4a*", "*.m3u8*", "*.mpd*",
+        "*://video*.fbcdn.net/*",
+    ],
+    "tracking": [
+        "*://www.facebook.com/tr*",
+        "*://pixel.facebook.com/*",
+        "*://connect.facebook.net/*",
+        "*/ajax/bz*",
+        "*/ajax/bnzai*",
+        "*google-analytics.com/*",
+        "*googletagmanager.com/*",
+    ],
+    "ads": [
+        "*://an.facebook.com/*",
+        "*doubleclick.net/*",
+        "*googlesyndication.com/*",
+        "*adservice.google.com/*",
+    ],
+}
+
+# "full" loads pages like a normal browser; "light" returns from driver.get
+# at DOMContentLoaded and blocks everything the parser never looks at
+CRAWL_PROFILES = {
+    "full": {
+        "page_load_strategy": "normal",
+        "blocked_resource_types": [],
+    },
+    "light": {
+        "page_load_strategy": "eager",
+        "blocked_resource_types": ["font", "media", "tracking", "ads"],
+    },
+}
+
+
 def get_selenium_settings():
     return {
         "USER_AGENT": (
@@ -10,38 +54,135 @@ def get_selenium_settings():
         "DOWNLOADER_MIDDLEWARES": {
             "facebook.facebook_spider.SimpleSeleniumMiddleware": 585,
         },
-        "CONCURRENT_REQUESTS": 1,
+        "CONCURRENT_REQUESTS": DRIVER_POOL_SIZE,
+        "SELENIUM_POOL_SIZE": DRIVER_POOL_SIZE,
+        "SELENIUM_MAX_PAGES_PER_DRIVER": 50,
+        "SELENIUM_ACQUIRE_TIMEOUT": 300,
+        # Persistent Chrome profile per pooled browser (None: throwaway
+        # profiles), and browsers launched before the first request
+        "SELENIUM_PROFILE_DIR": "downloads/chrome_profiles",
+        "SELENIUM_PREWARM": 1,
+        # Keep one driver pool, media session and trace for the whole
+        # process instead of per crawl (set by the crawl daemon)
+        "SELENIUM_KEEP_ALIVE": False,
+        "REACTOR_THREADPOOL_MAXSIZE": max(10, DRIVER_POOL_SIZE * 2),
+        # Page-load profile (see CRAWL_PROFILES, "light" is opt-in); the
+        # block lists override the profile's resource types and add extra
+        # URL patterns
+        "SELENIUM_CRAWL_PROFILE": "full",
+        "SELENIUM_BLOCKED_RESOURCE_TYPES": None,
+        "SELENIUM_BLOCKED_URL_PATTERNS": [],
+        # Upper bounds for the event-driven waits in page_readiness
+        "PAGE_READY_TIMEOUT": 10,
+        "NETWORK_IDLE_TIME": 0.5,
+        "NETWORK_MAX_INFLIGHT": 2,
+        "COOKIE_BANNER_TIMEOUT": 5,
+        "POPUP_TIMEOUT": 3,
+        # Feed mode: wait for lazy-loaded posts after each scroll, and give
+        # up after this many scrolls
+        "FEED_SCROLL_TIMEOUT": 5,
+        "FEED_MAX_SCROLLS": 30,
+        # Store each parsed page (HTML + gallery network responses) for
+        # offline replay with SnapshotReplayMiddleware
+        "SNAPSHOT_CAPTURE": False,
+        "SNAPSHOT_DIR": "downloads/snapshots",
+        # "direct" resolves the post's photo pages over HTTP (falls back to
+        # "network" for "+N" galleries), "network" reads gallery image URLs
+        # from DevTools network events, "dom" clicks through the photo viewer
+        "GALLERY_EXTRACTION_MODE": "direct",
+        # JSON-lines file for per-stage timing spans (facebook/tracing.py);
+        # the summary table is printed at the end of every crawl
+        "TRACE_FILE": None,
+        # Count and time every WebDriver command by type and call site
+        # (facebook/driver_profiler.py); call sites issuing more commands
+        # than the threshold inside one span are reported as loops
+        "DRIVER_PROFILE": False,
+        "DRIVER_PROFILE_FILE": None,
+        "DRIVER_PROFILE_LOOP_THRESHOLD": 50,
         "DOWNLOAD_DELAY": 2,
         "RANDOMIZE_DOWNLOAD_DELAY": True,
         "AUTOTHROTTLE_ENABLED": True,
         "AUTOTHROTTLE_START_DELAY": 2,
         "AUTOTHROTTLE_MAX_DELAY": 10,
-        "AUTOTHROTTLE_TARGET_CONCURRENCY": 1.0,
+        "AUTOTHROTTLE_TARGET_CONCURRENCY": float(DRIVER_POOL_SIZE),
         "HEADLESS": True,
         "LOG_ENABLED": False,
         "LOG_LEVEL": "CRITICAL",
     }
 
 
-def get_chrome_options():
+def get_chrome_options(profile="full", user_data_dir=None):
     from selenium.webdriver.chrome.options import Options
 
     chrome_options = Options()
+    if user_data_dir:
+        # Persistent profile: cookies, consent and cache survive restarts
+        chrome_options.add_argument(f'--user-data-dir={user_data_dir}')
     chrome_options.add_argument('--no-sandbox')
     chrome_options.add_argument('--disable-dev-shm-usage')
     chrome_options.add_argument('--disable-gpu')
     chrome_options.add_argument('--window-size=1920,1080')
     chrome_options.add_argument('--headless')
+    # DevTools network events feed the network-idle wait
+    chrome_options.set_capability(
+        'goog:loggingPrefs', {'performance': 'ALL'})
+
+    crawl_profile = CRAWL_PROFILES[profile]
+    chrome_options.page_load_strategy = crawl_profile["page_load_strategy"]
+    if crawl_profile["blocked_resource_types"]:
+        chrome_options.add_argument('--mute-audio')
+        chrome_options.add_argument(
+            '--autoplay-policy=user-gesture-required')
 
     return chrome_options
 
 
+def get_blocked_url_patterns(profile="full", resource_types=None, extra_patterns=None):
+    """
+    Build the URL block list for a crawl profile
+
+    Args:
+        profile: Key of CRAWL_PROFILES
+        resource_types: Override the profile's blocked resource types
+        extra_patterns: Additional URL patterns to block
+
+    Returns:
+        list: Unique URL patterns for Network.setBlockedURLs
+    """
+    if resource_types is None:
+        resource_types = CRAWL_PROFILES[profile]["blocked_resource_types"]
+
+    patterns = []
+    for resource_type in resource_types:
+        patterns.extend(BLOCKED_RESOURCE_PATTERNS[resource_type])
+    patterns.extend(extra_patterns or [])
+
+    return list(dict.fromkeys(patterns))
+
+
+def apply_url_blocking(driver, patterns):
+    """
+    Block URL patterns in a running Chrome through CDP
+
+    Args:
+        driver: Chrome WebDriver instance
+        patterns: URL patterns from get_blocked_url_patterns()
+    """
+    if not patterns:
+        return
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+
 if __name__ == "__main__":
     settings = get_selenium_settings()
     print("🔧 Selenium Settings:")
     for key, value in settings.items():
         print(f"  {key}: {value}")
 
-    print("\n🌐 Chrome Options:")
-    options = get_chrome_options()
-    print(f"  Arguments: {options.arguments}")
+    for profile in CRAWL_PROFILES:
+        print(f"\n🌐 Chrome Options ({profile}):")
+        options = get_chrome_options(profile)
+        print(f"  Arguments: {options.arguments}")
+        print(f"  Page load strategy: {options.page_load_strategy}")
+        print(f"  Blocked URLs: {get_blocked_url_patterns(profile)}")
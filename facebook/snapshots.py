@@ -0,0 +1,293 @@
+#!/usr/bin/env python
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from scrapy.exceptions import IgnoreRequest
+from scrapy.http import HtmlResponse
+
+
+SNAPSHOT_DIR = "downloads/snapshots"
+
+_capture = threading.local()
+
+
+class SnapshotArchive:
+    """
+    Compressed archive of rendered Facebook pages
+
+    Each capture is one gzip JSON file holding the parsed page HTML plus,
+    per post, the image responses seen while its galleries were open or the
+    image URLs resolved from its photo pages, stored as
+    ``<root>/<url hash>/<captured_at>.json.gz``. A small ``url`` file next to
+    the captures maps the directory back to the page URL, so the archive can
+    be listed without decompressing every snapshot.
+    """
+
+    def __init__(self, root=SNAPSHOT_DIR):
+        """
+        Args:
+            root: Archive directory
+        """
+        self.root = root
+
+    def page_dir(self, url):
+        return os.path.join(self.root, hashlib.sha1(url.encode()).hexdigest()[:16])
+
+    def save(self, url, html, galleries=(), meta=None):
+        """
+        Store one capture
+
+        Args:
+            url: Page URL
+            html: Page HTML the spider parsed
+            galleries: Per gallery, a dict with the post URL and either the
+                network events the recorder saw ("events") or the photo-page
+                image URLs ("image_urls")
+            meta: Extra JSON-serialisable information
+
+        Returns:
+            str: Snapshot file path
+        """
+        page_dir = self.page_dir(url)
+        os.makedirs(page_dir, exist_ok=True)
+        with open(os.path.join(page_dir, "url"), "w", encoding="utf-8") as f:
+            f.write(url)
+
+        captured_at = time.time()
+        path = os.path.join(page_dir, f"{captured_at:.3f}.json.gz")
+        snapshot = {
+            "url": url,
+            "captured_at": captured_at,
+            "html": html,
+            "galleries": [dict(gallery) for gallery in galleries],
+            "meta": meta or {},
+        }
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        return path
+
+    def load(self, path):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        snapshot["path"] = path
+        return snapshot
+
+    def captures(self, url):
+        """Snapshot paths for a URL, oldest first"""
+        page_dir = self.page_dir(url)
+        if not os.path.isdir(page_dir):
+            return []
+        return sorted(
+            os.path.join(page_dir, name) for name in os.listdir(page_dir)
+            if name.endswith(".json.gz"))
+
+    def latest(self, url):
+        """
+        Most recent capture of a page
+
+        Returns:
+            dict: Snapshot, or None if the page was never captured
+        """
+        paths = self.captures(url)
+        return self.load(paths[-1]) if paths else None
+
+    def all_captures(self):
+        """
+        Every capture in the archive
+
+        Returns:
+            list: (url, path) pairs, oldest capture of each page first
+        """
+        return [(url, path) for url in self.urls() for path in self.captures(url)]
+
+    def urls(self):
+        """URLs of every captured page"""
+        if not os.path.isdir(self.root):
+            return []
+        urls = []
+        for name in sorted(os.listdir(self.root)):
+            url_file = os.path.join(self.root, name, "url")
+            if os.path.exists(url_file):
+                with open(url_file, encoding="utf-8") as f:
+                    urls.append(f.read().strip())
+        return urls
+
+
+class SnapshotCapture:
+    """What one page parse saw, collected on the parsing thread"""
+
+    def __init__(self):
+        self.html = None
+        self.post = None
+        self.galleries = []
+
+
+@contextmanager
+def capture_snapshot():
+    """
+    Collect gallery network events for the page parsed on this thread
+
+    Yields:
+        SnapshotCapture
+    """
+    capture = SnapshotCapture()
+    _capture.current = capture
+    try:
+        yield capture
+    finally:
+        _capture.current = None
+
+
+def begin_post_capture(post_url):
+    """Attribute the galleries recorded next on this thread to a post"""
+    capture = getattr(_capture, "current", None)
+    if capture is not None:
+        capture.post = post_url
+
+
+def begin_gallery_capture():
+    """
+    Start recording a gallery if a snapshot capture is active
+
+    Returns:
+        list: Event list to append to, or None when not capturing
+    """
+    capture = getattr(_capture, "current", None)
+    if capture is None:
+        return None
+    events = []
+    capture.galleries.append({"post": capture.post, "events": events})
+    return events
+
+
+def record_photo_page_images(image_urls):
+    """Record the image URLs "direct" mode resolved for the current post"""
+    capture = getattr(_capture, "current", None)
+    if capture is not None:
+        capture.galleries.append({"post": capture.post, "image_urls": list(image_urls)})
+
+
+def compact_gallery_events(events):
+    """
+    Keep only what GalleryNetworkRecorder needs from network events
+
+    Args:
+        events: (method, params) pairs from drain_network_events()
+
+    Returns:
+        list: [method, params] pairs with image responses and finished loads
+    """
+    compact = []
+    for method, params in events:
+        if method == "Network.responseReceived":
+            response = params.get("response", {})
+            if not response.get("mimeType", "").startswith("image/"):
+                continue
+            compact.append([method, {
+                "requestId": params.get("requestId"),
+                "response": {
+                    "url": response.get("url"),
+                    "mimeType": response.get("mimeType"),
+                    "status": response.get("status"),
+                },
+            }])
+        elif method == "Network.loadingFinished":
+            compact.append([method, {
+                "requestId": params.get("requestId"),
+                "encodedDataLength": params.get("encodedDataLength", 0),
+            }])
+    return compact
+
+
+def replay_gallery_image_urls(snapshot, is_content_image):
+    """
+    Re-run gallery URL extraction over a snapshot's recorded galleries
+
+    Network events go through GalleryNetworkRecorder again; photo-page URLs
+    are filtered with the same classifier. Captures made before galleries
+    were tied to posts hold bare event lists, reported under None.
+
+    Args:
+        snapshot: Dict from SnapshotArchive.load()
+        is_content_image: Callable filtering out emoji/icon URLs
+
+    Returns:
+        dict: Post URL -> image URLs of its galleries, in capture order
+    """
+    from .gallery_network import GalleryNetworkRecorder
+
+    images = {}
+    for gallery in snapshot.get("galleries", []):
+        if not isinstance(gallery, dict):
+            gallery = {"post": None, "events": gallery}
+
+        if "image_urls" in gallery:
+            urls = [url for url in gallery["image_urls"] if is_content_image(url)]
+        else:
+            recorder = GalleryNetworkRecorder(is_content_image, record=False)
+            recorder.feed(gallery.get("events", []))
+            urls = recorder.image_urls()
+
+        post_images = images.setdefault(gallery.get("post"), [])
+        post_images.extend(url for url in urls if url not in post_images)
+    return images
+
+
+class SnapshotReplayMiddleware:
+    """
+    Serve archived pages instead of rendering them in Chrome
+
+    Drop-in replacement for SimpleSeleniumMiddleware: responses carry the
+    snapshot in ``meta['snapshot']`` (with the gallery image URLs replayed
+    per post) and no driver, so the spider parses at CPU speed and reports
+    image URLs instead of downloading them. A request with
+    ``meta['snapshot_path']`` gets that capture, any other the latest one.
+    """
+
+    def __init__(self, archive):
+        self.archive = archive
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(SnapshotArchive(
+            crawler.settings.get("SNAPSHOT_DIR") or SNAPSHOT_DIR))
+
+    def process_request(self, request, spider=None):
+        from .image_classifier import is_content_image
+
+        if path := request.meta.get('snapshot_path'):
+            snapshot = self.archive.load(path)
+        else:
+            snapshot = self.archive.latest(request.url)
+        if snapshot is None:
+            raise IgnoreRequest(f"No snapshot for {request.url}")
+
+        request.meta['snapshot'] = {
+            "path": snapshot["path"],
+            "captured_at": snapshot["captured_at"],
+            "galleries": snapshot["galleries"],
+            "gallery_images": replay_gallery_image_urls(
+                snapshot, lambda url: is_content_image(url, "content")),
+        }
+        return HtmlResponse(
+            url=request.url,
+            body=snapshot["html"].encode('utf-8'),
+            encoding='utf-8',
+            request=request,
+        )
+
+
+if __name__ == "__main__":
+    import sys
+
+    archive = SnapshotArchive(sys.argv[1] if len(sys.argv) > 1 else SNAPSHOT_DIR)
+    for url in archive.urls():
+        captures = archive.captures(url)
+        size = sum(os.path.getsize(path) for path in captures)
+        print(f"📦 {url}: {len(captures)} captures, {size / 1024:.0f} KB")
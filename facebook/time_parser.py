@@ -1,95 +1,223 @@
 #!/usr/bin/env python
 
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 import re
 
 
-def parse_relative_time(relative_text):
-    if not relative_text:
+MONTHS_MAP = {
+    'january': 1, 'jan': 1, 'february': 2, 'feb': 2, 'march': 3, 'mar': 3,
+    'april': 4, 'apr': 4, 'may': 5, 'june': 6, 'jun': 6,
+    'july': 7, 'jul': 7, 'august': 8, 'aug': 8, 'september': 9, 'sep': 9,
+    'october': 10, 'oct': 10, 'november': 11, 'nov': 11, 'december': 12, 'dec': 12
+}
+
+# Full names first so "june" is not cut short to "jun"
+_MONTHS = "|".join(sorted(MONTHS_MAP, key=len, reverse=True))
+
+RELATIVE_UNITS = {
+    'mo': 'months', 'm': 'minutes', 'h': 'hours', 'd': 'days',
+    'w': 'weeks', 'y': 'years',
+    '분': 'minutes', '時': 'hours', '日': 'days', '週': 'weeks',
+    '月': 'months', '年': 'years',
+}
+
+# Every timestamp form Facebook shows, detected and captured in one match.
+# Absolute dates come first so "15 Dec" is not read as 15 days.
+TIMESTAMP_RE = re.compile(rf"""
+    \b(?P<day>\d{{1,2}})\s+(?P<month>{_MONTHS})\b
+  | \b(?P<month_first>{_MONTHS})\s+(?P<day_after>\d{{1,2}})\b
+  | \b(?P<value>\d+)\s*(?P<unit>
+        mo(?:nths?)?
+      | m(?:ins?|inutes?)?
+      | h(?:rs?|ours?)?
+      | d(?:ays?)?
+      | w(?:ks?|eeks?)?
+      | y(?:rs?|ears?)?
+    )(?:\s+ago)?\b
+  | \b(?P<cjk_value>\d+)\s*(?P<cjk_unit>[분時日週月年])
+  | \b(?P<word>yesterday|today|just\ now|a\ moment\ ago|moment\ ago)\b
+""", re.IGNORECASE | re.VERBOSE)
+
+
+@lru_cache(maxsize=4096)
+def parse_timestamp_spec(text):
+    """
+    Parse a timestamp string into a "now"-independent spec
+
+    Memoized, so repeated strings such as "2h" or "Yesterday" are matched
+    once per process; only the final datetime depends on the current time.
+
+    Args:
+        text: Text that may contain a timestamp
+
+    Returns:
+        tuple: ("absolute", month, day), ("relative", unit, value),
+            ("yesterday",), ("now",), or None if no timestamp was found
+    """
+    for match in TIMESTAMP_RE.finditer(text):
+        group = match.group
+
+        if match.lastgroup in ("month", "day_after"):
+            if group("month"):
+                day, month = int(group("day")), MONTHS_MAP[group("month").lower()]
+            else:
+                day, month = int(group("day_after")), MONTHS_MAP[group("month_first").lower()]
+            if 1 <= day <= 31:
+                return ("absolute", month, day)
+            continue
+
+        if group("unit"):
+            unit = group("unit").lower()
+            unit = 'mo' if unit.startswith('mo') else unit[0]
+            return ("relative", RELATIVE_UNITS[unit], int(group("value")))
+
+        if group("cjk_unit"):
+            return ("relative", RELATIVE_UNITS[group("cjk_unit")], int(group("cjk_value")))
+
+        if group("word").lower() == "yesterday":
+            return ("yesterday",)
+        return ("now",)
+
+    return None
+
+
+def _spec_to_datetime(spec, now):
+    kind = spec[0]
+
+    if kind == "absolute":
+        try:
+            return datetime(now.year, spec[1], spec[2], tzinfo=timezone.utc)
+        except ValueError:
+            # e.g. "30 Feb"
+            return None
+
+    if kind == "relative":
+        unit, value = spec[1], spec[2]
+        if unit == 'months':
+            return now - timedelta(days=value * 30)
+        if unit == 'years':
+            return now - timedelta(days=value * 365)
+        return now - timedelta(**{unit: value})
+
+    if kind == "yesterday":
+        return now - timedelta(days=1)
+    return now
+
+
+def parse_timestamp(text, now=None):
+    """
+    Parse a Facebook timestamp ("2h", "3 days ago", "Yesterday", "30 June")
+
+    Args:
+        text: Text that may contain a timestamp
+        now: Reference time (defaults to the current UTC time)
+
+    Returns:
+        datetime: Aware UTC datetime, or None if the text has no timestamp
+    """
+    if not text:
+        return None
+    spec = parse_timestamp_spec(text)
+    if spec is None:
         return None
+    return _spec_to_datetime(spec, now or datetime.now(timezone.utc))
 
-    text = relative_text.lower().strip()
 
-    absolute_patterns = [
-        r'(\d{1,2})\s+(january|february|march|april|may|june|july|august|september|october|november|december)',
-        r'(january|february|march|april|may|june|july|august|september|october|november|december)\s+(\d{1,2})',
-        r'(\d{1,2})\s+(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)',
-        r'(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+(\d{1,2})',
-    ]
+def parse_timestamps(texts, now=None):
+    """
+    Parse many candidate strings in one call
 
-    months_map = {
-        'january': 1, 'jan': 1, 'february': 2, 'feb': 2, 'march': 3, 'mar': 3,
-        'april': 4, 'apr': 4, 'may': 5, 'june': 6, 'jun': 6,
-        'july': 7, 'jul': 7, 'august': 8, 'aug': 8, 'september': 9, 'sep': 9,
-        'october': 10, 'oct': 10, 'november': 11, 'nov': 11, 'december': 12, 'dec': 12
-    }
-
-    for pattern in absolute_patterns:
-        match = re.search(pattern, text)
-        if match:
-            try:
-                groups = match.groups()
-                if groups[0].isdigit():
-                    day = int(groups[0])
-                    month = months_map.get(groups[1])
-                else:
-                    month = months_map.get(groups[0])
-                    day = int(groups[1])
-
-                if month and 1 <= day <= 31:
-                    current_year = datetime.now().year
-                    return datetime(current_year, month, day, tzinfo=timezone.utc)
-            except (ValueError, KeyError):
-                continue
-
-    patterns = [
-        (r'(\d+)\s*m(?:in|inutes?)?(?:\s+ago)?', 'minutes'),
-        (r'(\d+)\s*h(?:r|rs|ours?)?(?:\s+ago)?', 'hours'),
-        (r'(\d+)\s*d(?:ay|ays?)?(?:\s+ago)?', 'days'),
-        (r'(\d+)\s*w(?:eek|eeks?)?(?:\s+ago)?', 'weeks'),
-        (r'(\d+)\s*mo(?:nth|nths?)?(?:\s+ago)?', 'months'),
-        (r'(\d+)\s*y(?:ear|ears?)?(?:\s+ago)?', 'years'),
-    ]
+    Args:
+        texts: Iterable of strings (e.g. every text node of a feed crawl)
+        now: Reference time shared by the whole batch
+
+    Returns:
+        list: datetime or None for each input, in input order
+    """
+    now = now or datetime.now(timezone.utc)
+    return [parse_timestamp(text, now) for text in texts]
 
-    for pattern, unit in patterns:
-        match = re.search(pattern, text)
-        if match:
-            value = int(match.group(1))
-            now = datetime.now(timezone.utc)
-
-            if unit == 'minutes':
-                return now - timedelta(minutes=value)
-            elif unit == 'hours':
-                return now - timedelta(hours=value)
-            elif unit == 'days':
-                return now - timedelta(days=value)
-            elif unit == 'weeks':
-                return now - timedelta(weeks=value)
-            elif unit == 'months':
-                return now - timedelta(days=value * 30)
-            elif unit == 'years':
-                return now - timedelta(days=value * 365)
-
-    if 'yesterday' in text:
-        return datetime.now(timezone.utc) - timedelta(days=1)
-    elif 'today' in text:
-        return datetime.now(timezone.utc)
-    elif any(word in text for word in ['just now', 'moment ago', 'now']):
-        return datetime.now(timezone.utc)
+
+def find_timestamp(texts, now=None):
+    """
+    First timestamp found in a sequence of text nodes
+
+    Args:
+        texts: Iterable of strings in document order
+        now: Reference time
+
+    Returns:
+        datetime: Aware UTC datetime, or None if no text is a timestamp
+    """
+    now = now or datetime.now(timezone.utc)
+    for text in texts:
+        if timestamp := parse_timestamp(text, now):
+            return timestamp
+    return None
+
+
+def parse_relative_time(relative_text):
+    if not relative_text:
+        return None
+
+    if timestamp := parse_timestamp(relative_text.strip()):
+        return timestamp
 
     print(f"⚠️ Cannot parse time: '{relative_text}', using current time")
     return datetime.now(timezone.utc)
 
 
+def parse_cutoff_date(value):
+    """
+    Turn a CLI date cutoff into an aware UTC datetime
+
+    Accepts a datetime, an ISO date ("2024-05-01"), an ISO timestamp, or a
+    relative expression understood by parse_timestamp ("3d", "2w").
+
+    Raises:
+        ValueError: If the value is neither; a typo must not silently
+            become "now" and end the crawl at its first post
+    """
+    if value is None or isinstance(value, datetime):
+        if value is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
+
+    text = str(value).strip()
+    try:
+        cutoff = datetime.fromisoformat(text)
+    except ValueError:
+        if cutoff := parse_timestamp(text):
+            return cutoff
+        raise ValueError(f"Cannot parse date cutoff {text!r}, "
+                         "expected an ISO date or e.g. '3d'") from None
+
+    if cutoff.tzinfo is None:
+        cutoff = cutoff.replace(tzinfo=timezone.utc)
+    return cutoff
+
+
 if __name__ == "__main__":
+    import time
+
     test_cases = [
         "12m", "2h", "3d", "1w", "2mo", "1y",
         "12 minutes ago", "2 hours ago", "3 days ago",
         "yesterday", "today", "just now",
-        "30 June", "July 15", "15 Dec", "Dec 25"
+        "30 June", "July 15", "15 Dec", "Dec 25",
+        "3時間", "2日前", "12 members", "Like",
     ]
 
     print("🧪 Testing time parser:")
     for case in test_cases:
-        result = parse_relative_time(case)
+        result = parse_timestamp(case)
         print(f"'{case}' → {result}")
+
+    texts = test_cases * 5000
+    parse_timestamp_spec.cache_clear()
+    start = time.perf_counter()
+    parse_timestamps(texts)
+    elapsed = time.perf_counter() - start
+    print(f"\n⏱️ {len(texts)} strings in {elapsed * 1000:.1f} ms "
+          f"({parse_timestamp_spec.cache_info().hits} cache hits)")
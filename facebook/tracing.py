@@ -0,0 +1,257 @@
+#!/usr/bin/env python
+
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+_local = threading.local()
+
+
+def _thread_state():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+        _local.commands = 0
+    return _local
+
+
+def open_spans():
+    """
+    Spans open on this thread, outermost first
+
+    Returns:
+        tuple: (span_id, name) per span, empty outside any span
+    """
+    return tuple(_thread_state().stack)
+
+
+def count_command(count=1):
+    """Add WebDriver commands to every span open on this thread"""
+    _thread_state().commands += count
+
+
+def instrument_driver(driver):
+    """
+    Count the WebDriver commands a driver issues
+
+    Wraps ``driver.execute``, which every driver and WebElement call goes
+    through, so spans report how many browser round-trips they caused.
+
+    Args:
+        driver: Selenium WebDriver instance
+
+    Returns:
+        The same driver
+    """
+    if getattr(driver, "_traced_execute", False):
+        return driver
+
+    execute = driver.execute
+
+    @functools.wraps(execute)
+    def traced_execute(driver_command, params=None):
+        count_command()
+        return execute(driver_command, params)
+
+    driver.execute = traced_execute
+    driver._traced_execute = True
+    return driver
+
+
+class Tracer:
+    """
+    Nested timing spans for the Facebook pipeline
+
+    Spans are kept per thread, so page renders, parses and background
+    downloads running concurrently each get their own parent chain. Every
+    finished span is appended to a JSON-lines file (if a path is given) and
+    folded into per-name totals for the end-of-run summary.
+    """
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path: JSON-lines trace file, or None to keep only the summary
+        """
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.totals = {}
+
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._file = open(path, "a", encoding="utf-8")
+
+    @contextmanager
+    def span(self, name, **attrs):
+        """
+        Time a block of work
+
+        Args:
+            name: Stage name ("driver.get", "parse_article"...)
+            **attrs: JSON-serialisable details stored with the span
+
+        Yields:
+            dict: The span's attributes, which the block may extend
+        """
+        state = _thread_state()
+        span_id = next(self._ids)
+        parent_id = state.stack[-1][0] if state.stack else None
+        state.stack.append((span_id, name))
+
+        started_at = time.time()
+        start = time.perf_counter()
+        commands = state.commands
+        error = None
+        try:
+            yield attrs
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            state.stack.pop()
+            self._finish({
+                "name": name,
+                "span_id": span_id,
+                "parent_id": parent_id,
+                "thread": threading.current_thread().name,
+                "start": round(started_at, 6),
+                "duration": round(time.perf_counter() - start, 6),
+                "commands": state.commands - commands,
+                "error": error,
+                **attrs,
+            })
+
+    def _finish(self, record):
+        with self._lock:
+            totals = self.totals.setdefault(record["name"], {
+                "count": 0, "total": 0.0, "max": 0.0, "commands": 0, "errors": 0})
+            totals["count"] += 1
+            totals["total"] += record["duration"]
+            totals["max"] = max(totals["max"], record["duration"])
+            totals["commands"] += record["commands"]
+            totals["errors"] += record["error"] is not None
+
+            if self._file:
+                self._file.write(json.dumps(record, default=str) + "\n")
+
+    def close(self):
+        """
+        Flush the trace file
+
+        Returns:
+            dict: Per span name totals (count, total, max, commands, errors)
+        """
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+            return dict(self.totals)
+
+
+_tracer = Tracer()
+_tracer_lock = threading.Lock()
+
+
+def get_tracer():
+    return _tracer
+
+
+def configure_tracer(path=None):
+    """
+    Start a new trace, replacing the current tracer
+
+    Args:
+        path: JSON-lines trace file (None: summary only)
+
+    Returns:
+        Tracer
+    """
+    global _tracer
+    with _tracer_lock:
+        _tracer.close()
+        _tracer = Tracer(path)
+        return _tracer
+
+
+def close_tracer():
+    """Close the current trace and return its per-span totals"""
+    with _tracer_lock:
+        return _tracer.close()
+
+
+def span(name, **attrs):
+    """Span on the current tracer (see Tracer.span)"""
+    return get_tracer().span(name, **attrs)
+
+
+def traced(func=None, *, name=None):
+    """
+    Decorator running a function inside a span named after it
+
+    Usable bare (``@traced``) or with a custom name (``@traced(name="x")``).
+    """
+    if func is None:
+        return functools.partial(traced, name=name)
+
+    span_name = name or func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with get_tracer().span(span_name):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def format_trace_summary(totals):
+    """
+    Render per-span totals as a table, slowest stage first
+
+    Args:
+        totals: Dict from close_tracer()
+
+    Returns:
+        str: Summary table
+    """
+    lines = [f"{'span':<40}{'count':>7}{'total s':>10}{'mean s':>9}"
+             f"{'max s':>9}{'commands':>10}{'cmd/call':>10}"]
+    for name, t in sorted(totals.items(), key=lambda item: -item[1]["total"]):
+        count = t["count"] or 1
+        errors = f"  ({t['errors']} errors)" if t["errors"] else ""
+        lines.append(
+            f"{name:<40}{t['count']:>7}{t['total']:>10.2f}{t['total'] / count:>9.3f}"
+            f"{t['max']:>9.3f}{t['commands']:>10}{t['commands'] / count:>10.1f}{errors}")
+    return "\n".join(lines)
+
+
+def summarize_trace_file(path):
+    """
+    Per-span totals of a JSON-lines trace file
+
+    Args:
+        path: File written by Tracer
+
+    Returns:
+        dict: Same shape as close_tracer()
+    """
+    tracer = Tracer()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                tracer._finish(json.loads(line))
+    return tracer.close()
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python -m facebook.tracing <trace.jsonl>")
+        sys.exit(1)
+    print(format_trace_summary(summarize_trace_file(sys.argv[1])))
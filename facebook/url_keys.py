@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+
+import os
+import re
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+
+# Query parameters that change between sessions/crawls for the same photo
+# (signatures, expiry, cache hints, routing)
+VOLATILE_PARAMS = {
+    "_nc_cat", "_nc_oc", "_nc_ohc", "_nc_ht", "_nc_gid", "_nc_sid",
+    "_nc_zt", "_nc_eui2", "_nc_aid", "_nc_ad", "_nc_cid", "_nc_rml",
+    "_nc_tpa", "_nc_ss", "_nc_eh", "_nc_x", "_nc_pt", "_nc_tp",
+    "ccb", "oh", "oe", "efg", "dl",
+}
+
+# Parameters that select a different rendition of the photo
+RENDITION_PARAMS = ("stp",)
+
+# e.g. 471234567_1234567890123456_123456789012345678_n.jpg
+CDN_ASSET_RE = re.compile(r'^(\d+(?:_\d+)+_[a-z])\.[a-z0-9]+$', re.IGNORECASE)
+
+
+def asset_id(url):
+    """
+    Photo identity on the CDN: the file name without signature params
+
+    Args:
+        url: CDN image URL
+
+    Returns:
+        str: e.g. "471234567_1234567890123456_123456789012345678_n.jpg"
+    """
+    return os.path.basename(urlparse(url).path)
+
+
+# Post identifiers in permalinks, most specific first
+POST_ID_PATTERNS = [
+    re.compile(r'/posts/(pfbid[0-9A-Za-z]+|\d+)'),
+    re.compile(r'/videos/(?:[^/]+/)?(\d+)'),
+    re.compile(r'/photos/(?:[^/]+/)?(\d+)'),
+    re.compile(r'/reel/(\d+)'),
+    re.compile(r'[?&](?:story_fbid|fbid|v)=(pfbid[0-9A-Za-z]+|\d+)'),
+]
+
+
+def extract_post_id(url):
+    """
+    Stable post identifier from a Facebook post permalink
+
+    Tracking parameters (``__cft__``, ``__tn__``) change on every page load,
+    so posts are identified by the ID inside the permalink instead.
+
+    Args:
+        url: Post URL as found in the article header
+
+    Returns:
+        str: e.g. "pfbid02abc..." or "1234567890", or None if not recognised
+    """
+    if not url:
+        return None
+    for pattern in POST_ID_PATTERNS:
+        match = pattern.search(url)
+        if match:
+            return match.group(1)
+    return None
+
+
+# Single photo identifiers in photo page links, most specific first
+PHOTO_ID_PATTERNS = [
+    re.compile(r'/photo(?:\.php)?/?\?(?:[^#]*&)?fbid=(\d+)'),
+    re.compile(r'/photos/(?:[^/]+/)?(\d+)'),
+]
+
+
+def extract_photo_id(url):
+    """
+    Photo identifier from a photo page link
+
+    Args:
+        url: Link found in a post, e.g. "/photo/?fbid=123&set=pcb.456" or
+            "/somepage/photos/a.789/123/"
+
+    Returns:
+        str: e.g. "123", or None if the link is not a photo page
+    """
+    if not url:
+        return None
+    for pattern in PHOTO_ID_PATTERNS:
+        match = pattern.search(url)
+        if match:
+            return match.group(1)
+    return None
+
+
+def canonical_image_key(url):
+    """
+    Stable cache key for a Facebook image URL
+
+    Signed CDN URLs differ on every crawl (``oh``, ``oe``, ``_nc_ohc``...), so
+    the key is built from the asset ID in the path plus the rendition
+    (``stp``), which identifies the same bytes across crawls and CDN hosts.
+    Non-CDN URLs fall back to host + path + non-volatile query parameters.
+
+    Args:
+        url: Image URL
+
+    Returns:
+        str: e.g. "fb:471234567_1234567890123456_123456789012345678_n:stp=dst-jpg_s960x960"
+    """
+    parsed = urlparse(url)
+    params = parse_qsl(parsed.query, keep_blank_values=True)
+    file_name = os.path.basename(parsed.path)
+
+    match = CDN_ASSET_RE.match(file_name)
+    if match:
+        rendition = [f"{k}={v}" for k, v in params if k in RENDITION_PARAMS]
+        return ":".join(["fb", match.group(1).lower()] + rendition)
+
+    stable = sorted((k, v) for k, v in params if k not in VOLATILE_PARAMS)
+    query = f"?{urlencode(stable)}" if stable else ""
+    return f"url:{parsed.netloc.lower()}{parsed.path}{query}"
+
+
+if __name__ == "__main__":
+    test_urls = [
+        "https://scontent-hkg4-1.xx.fbcdn.net/v/t39.30808-6/471234567_1234567890123456_123456789012345678_n.jpg?stp=dst-jpg_s960x960&_nc_cat=1&ccb=1-7&_nc_sid=127cfc&_nc_ohc=abc&oh=00_AYx&oe=67A1B2C3",
+        "https://scontent.fsgn2-3.fna.fbcdn.net/v/t39.30808-6/471234567_1234567890123456_123456789012345678_n.jpg?stp=dst-jpg_s960x960&_nc_cat=2&_nc_ohc=xyz&oh=00_BBB&oe=67FFFFFF",
+        "https://scontent.com/image.jpg?_nc_cat=123",
+    ]
+
+    print("🔑 Canonical image keys:")
+    for url in test_urls:
+        print(f"  {url[:60]}... → {canonical_image_key(url)}")
+
+    print("🆔 Post IDs:")
+    for url in [
+        "https://www.facebook.com/somepage/posts/pfbid02AbCdEf123?__cft__[0]=xyz&__tn__=%2CO",
+        "https://www.facebook.com/photo/?fbid=1234567890&set=a.987",
+        "https://www.facebook.com/somepage/videos/555666777/",
+    ]:
+        print(f"  {url[:60]}... → {extract_post_id(url)}")
+
+    print("📷 Photo IDs:")
+    for url in [
+        "https://www.facebook.com/photo/?fbid=1234567890&set=pcb.987",
+        "https://www.facebook.com/photo.php?fbid=1234567890",
+        "https://www.facebook.com/somepage/photos/a.987/1234567890/",
+        "https://www.facebook.com/somepage/posts/pfbid02AbCdEf123",
+    ]:
+        print(f"  {url[:60]}... → {extract_photo_id(url)}")
@@ -1,21 +1,64 @@
 import fire
-from twitter.twitter_spider import TwitterCrawler
-from telegram.telegram_spider import TelegramCrawler
-from facebook.facebook_spider import FacebookPageCrawler
 
+from crawl_daemon import QUEUE_PATH
 
+
+# Each subcommand imports its platform's stack when it runs, so e.g.
+# "main.py twitter" never loads Selenium, Scrapy, Twisted or Telethon
+# (benchmarks/bench_import_time.py guards this)
 class SpiderCrawler:
-    def twitter(self, profile=None, hashtag=None, limit=None):
+    def twitter(self, profile=None, hashtag=None, limit=None, backfill=False):
         """Crawl Twitter"""
-        TwitterCrawler().crawl(profile=profile, hashtag=hashtag, limit=limit)
+        from twitter.twitter_spider import TwitterCrawler
+
+        TwitterCrawler().crawl(profile=profile, hashtag=hashtag, limit=limit, backfill=backfill)
+
+    def twitter_export(self, profile=None, hashtag=None, output=None):
+        """Export stored tweets to a JSON array file"""
+        from twitter.twitter_spider import TwitterCrawler
+
+        TwitterCrawler.export(profile=profile, hashtag=hashtag, output=output)
 
     def telegram(self, channel=None, limit=None):
         """Crawl Telegram"""
+        from telegram.telegram_spider import TelegramCrawler
+
         TelegramCrawler().crawl(channel=channel, limit=limit)
 
-    def facebook(self, pagename=None):
+    def tiktok(self, profile=None, hashtag=None, limit=None):
+        """Crawl TikTok"""
+        from tiktok.tiktok_crawler import TikTokCrawler
+
+        TikTokCrawler.crawl(profile=profile, hashtag=hashtag, limit=limit)
+
+    def facebook(self, pagename=None, max_posts=1, since=None, fresh=False,
+                 snapshot=False, trace=None, profile_driver=False, crawl_profile=None):
         """Crawl Facebook page by pagename"""
-        FacebookPageCrawler().crawl(pagename=pagename)
+        from facebook.facebook_spider import FacebookPageCrawler
+
+        FacebookPageCrawler().crawl(
+            pagename=pagename, max_posts=max_posts, since=since, fresh=fresh,
+            snapshot=snapshot, trace=trace, profile_driver=profile_driver,
+            crawl_profile=crawl_profile)
+
+    def facebook_replay(self, snapshot_dir="downloads/snapshots", max_posts=1000):
+        """Re-parse saved Facebook page snapshots without a browser"""
+        from facebook.facebook_spider import FacebookPageCrawler
+
+        FacebookPageCrawler().replay(snapshot_dir=snapshot_dir, max_posts=max_posts)
+
+    def daemon(self, queue=QUEUE_PATH, poll_interval=2.0, trace=None):
+        """Run queued crawl jobs in one long-lived process"""
+        from crawl_daemon import CrawlDaemon
+
+        CrawlDaemon(queue_path=queue, poll_interval=poll_interval, trace=trace).run()
+
+    def enqueue(self, platform, queue=QUEUE_PATH, **options):
+        """Queue a crawl job for the daemon (same options as the platform command)"""
+        from crawl_daemon import JobQueueFile
+
+        job = JobQueueFile(queue).submit(platform, **options)
+        print(f"📨 Queued job {job['id']}: {platform} {options}")
 
 
 if __name__ == "__main__":
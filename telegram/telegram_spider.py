@@ -6,6 +6,8 @@ from telethon import TelegramClient
 from telethon.tl.types import MessageMediaPhoto, MessageMediaDocument
 from tqdm import tqdm
 
+from common.media_store import get_media_store
+
 # ====== LOGGING ======
 logging.basicConfig(
     level=logging.INFO,
@@ -21,10 +23,16 @@ OUTPUT_FOLDER = "downloads/telegram"
 
 
 class TelegramCrawler:
-    async def _crawl_async(self, channel: str, limit: int = None):
-        """Async crawler for Telegram channel messages"""
+    async def connect(self):
+        """Start a logged-in client; one client can crawl many channels"""
         client = TelegramClient(None, api_id, api_hash)
         await client.start(phone_number)
+        return client
+
+    async def _crawl_async(self, channel: str, limit: int = None, client=None):
+        """Async crawler for Telegram channel messages"""
+        if client is None:
+            client = await self.connect()
 
         safe_channel = channel.strip().replace("https://t.me/", "").replace("/", "_")
         channel_media_folder = os.path.join(OUTPUT_FOLDER, safe_channel)
@@ -51,6 +59,17 @@ class TelegramCrawler:
             if len(messages_data) > 0:
                 logging.info(f"💾 Saved {len(messages_data)} new messages")
 
+        store = get_media_store()
+
+        async def download_to_store(message, media_key, file_path, make_progress):
+            """Download message media once; forwards of the same file reuse it"""
+            blob_path = store.lookup(media_key)
+            if not blob_path:
+                tmp_path = os.path.join(store.tmp_dir, f"tg_{message.id}{os.path.splitext(file_path)[1]}")
+                await client.download_media(message, file=tmp_path, progress_callback=make_progress())
+                blob_path = store.put_file(media_key, tmp_path)
+            store.link(blob_path, file_path)
+
         async def process_message(message):
             if message.id in existing_ids:
                 return
@@ -82,8 +101,10 @@ class TelegramCrawler:
                 total = getattr(message.media.photo, "sizes", [None])[-1]
                 size = getattr(total, "size", 0) or None
 
-                progress_cb = make_progress_bar(f"Downloading photo {message.id}", size) if size else None
-                await client.download_media(message, file=file_path, progress_callback=progress_cb)
+                media_key = f"telegram:photo:{message.media.photo.id}"
+                await download_to_store(
+                    message, media_key, file_path,
+                    lambda: make_progress_bar(f"Downloading photo {message.id}", size) if size else None)
                 msg_dict["media_path"] = file_path
 
             # --- document ---
@@ -106,8 +127,10 @@ class TelegramCrawler:
                 file_path = os.path.join(channel_media_folder, f"{message.id}{ext}")
 
                 size = getattr(message.media.document, "size", 0) or None
-                progress_cb = make_progress_bar(f"Downloading doc {message.id}", size) if size else None
-                await client.download_media(message, file=file_path, progress_callback=progress_cb)
+                media_key = f"telegram:document:{message.media.document.id}"
+                await download_to_store(
+                    message, media_key, file_path,
+                    lambda: make_progress_bar(f"Downloading doc {message.id}", size) if size else None)
                 msg_dict["media_path"] = file_path
 
             messages_data.append(msg_dict)
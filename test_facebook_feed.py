@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""
+Tests for where a Facebook feed crawl stops
+"""
+
+import os
+import tempfile
+
+from scrapy import Request
+from scrapy.http import HtmlResponse
+from scrapy.utils.test import get_crawler
+
+from facebook.crawl_state import CrawlState
+from facebook.facebook_spider import FacebookPageSpider
+
+
+PAGE_URL = "https://www.facebook.com/page"
+
+
+def feed_page(posts):
+    """Feed HTML with one article per (post id, date text) pair"""
+    articles = "".join(f"""
+<div role="article"><div>
+  <div><h2><span><a role="link" aria-label="{date}" href="/page/posts/{post_id}">{date}</a></span></h2></div>
+  <div data-ad-comet-preview="message"><div><span dir="auto"><div dir="auto">Post {post_id} with some longer text about the page.</div></span></div></div>
+</div></div>""" for post_id, date in posts)
+    return HtmlResponse(url=PAGE_URL, body=f"<html><body>{articles}</body></html>",
+                        encoding="utf-8", request=Request(PAGE_URL))
+
+
+def crawl(state, posts, max_posts=1):
+    spider = FacebookPageSpider.from_crawler(
+        get_crawler(FacebookPageSpider), "page", upload_callback=None,
+        max_posts=max_posts, crawl_state=state)
+    return [post["url"] for post in spider._parse_feed(feed_page(posts), None, None)]
+
+
+def post_url(post_id):
+    return f"{PAGE_URL}/posts/{post_id}"
+
+
+def test_pinned_first_post_does_not_stop_later_runs():
+    with tempfile.TemporaryDirectory() as tmp:
+        state = CrawlState(os.path.join(tmp, "state.sqlite3"))
+
+        # First run stores only the pinned post
+        feed = [("pfbid0pinned", "5d"), ("pfbid0older", "6d")]
+        assert crawl(state, feed) == [post_url("pfbid0pinned")]
+
+        # A new post is listed under the pinned one
+        feed = [("pfbid0pinned", "5d"), ("pfbid0new", "1h"), ("pfbid0older", "6d")]
+        assert crawl(state, feed) == [post_url("pfbid0new")]
+        assert crawl(state, feed) == []
+        state.close()
+
+
+def test_stored_top_post_older_than_next_is_the_boundary():
+    with tempfile.TemporaryDirectory() as tmp:
+        state = CrawlState(os.path.join(tmp, "state.sqlite3"))
+
+        feed = [("pfbid0latest", "1h"), ("pfbid0older", "2h")]
+        assert crawl(state, feed) == [post_url("pfbid0latest")]
+        assert crawl(state, feed, max_posts=5) == []
+        state.close()
+
+
+if __name__ == "__main__":
+    test_pinned_first_post_does_not_stop_later_runs()
+    test_stored_top_post_older_than_next_is_the_boundary()
+    print("✅ Feed boundary tests passed")
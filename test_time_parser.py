@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+"""
+Tests for the Facebook timestamp parser
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from facebook.time_parser import find_timestamp, parse_cutoff_date, parse_timestamp_spec
+
+
+NOW = datetime(2024, 6, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def test_just_now_is_a_timestamp():
+    assert parse_timestamp_spec("Just now") == ("now",)
+    assert parse_timestamp_spec("a moment ago") == ("now",)
+
+
+def test_bare_now_is_not_a_timestamp():
+    assert parse_timestamp_spec("Shop now") is None
+    assert parse_timestamp_spec("Available now") is None
+
+
+def test_call_to_action_before_post_date():
+    texts = ["Shop now", "Available now", "3 June", "Like"]
+    assert find_timestamp(texts, now=NOW) == datetime(2024, 6, 3, tzinfo=timezone.utc)
+
+
+def test_cutoff_date():
+    assert parse_cutoff_date("2024-05-01") == datetime(2024, 5, 1, tzinfo=timezone.utc)
+    assert parse_cutoff_date("3d") < datetime.now(timezone.utc)
+    assert parse_cutoff_date(None) is None
+
+
+def test_unparsable_cutoff_date_is_rejected():
+    for value in ("yesterdayy", "2024-13-01", "Shop now"):
+        with pytest.raises(ValueError):
+            parse_cutoff_date(value)
+
+
+if __name__ == "__main__":
+    test_just_now_is_a_timestamp()
+    test_bare_now_is_not_a_timestamp()
+    test_call_to_action_before_post_date()
+    test_cutoff_date()
+    test_unparsable_cutoff_date_is_rejected()
+    print("✅ Time parser tests passed")
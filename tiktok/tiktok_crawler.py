@@ -0,0 +1,30 @@
+import logging
+
+# The Scrapy project, imported from the repository root so that it shares
+# the top-level packages (common) with the other crawlers
+PROJECT_PACKAGE = "tiktok.tiktok_scraper.tiktok_scraper"
+
+
+class TikTokCrawler:
+    @staticmethod
+    def build_settings():
+        """Scrapy settings of the TikTok project"""
+        from scrapy.settings import Settings
+
+        settings = Settings()
+        settings.setmodule(f"{PROJECT_PACKAGE}.settings", priority="project")
+        return settings
+
+    @staticmethod
+    def crawl(profile=None, hashtag=None, limit=None):
+        """Crawl TikTok videos by profile or hashtag."""
+        from scrapy.crawler import CrawlerProcess
+        from tiktok.tiktok_scraper.tiktok_scraper.spiders.tiktok_spider import TikTokSpider
+
+        if not profile and not hashtag:
+            logging.error("You must provide either a profile or a hashtag.")
+            return
+
+        process = CrawlerProcess(TikTokCrawler.build_settings())
+        process.crawl(TikTokSpider, profile=profile, hashtag=hashtag, limit=limit)
+        process.start()
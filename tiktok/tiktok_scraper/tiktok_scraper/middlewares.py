@@ -7,6 +7,9 @@ from scrapy import signals
 
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
+from scrapy_selenium import SeleniumMiddleware
+
+from common.chromedriver import chrome_profile_dir, resolve_chromedriver
 
 
 class TiktokScraperSpiderMiddleware:
@@ -98,3 +101,32 @@ class TiktokScraperDownloaderMiddleware:
 
     def spider_opened(self, spider):
         spider.logger.info("Spider opened: %s" % spider.name)
+
+
+class TiktokSeleniumMiddleware(SeleniumMiddleware):
+    """
+    scrapy_selenium's middleware with the driver resolved when the crawler
+    starts rather than in settings.py
+
+    SELENIUM_DRIVER_EXECUTABLE_PATH falls back to resolve_chromedriver()
+    (cached path, PATH, then webdriver_manager), and SELENIUM_PROFILE_NAME
+    adds a persistent --user-data-dir so cookies survive between runs.
+    """
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        driver_arguments = settings.getlist("SELENIUM_DRIVER_ARGUMENTS")
+        if profile := settings.get("SELENIUM_PROFILE_NAME"):
+            driver_arguments.append(f"--user-data-dir={chrome_profile_dir(profile)}")
+
+        middleware = cls(
+            driver_name=settings.get("SELENIUM_DRIVER_NAME"),
+            driver_executable_path=(settings.get("SELENIUM_DRIVER_EXECUTABLE_PATH")
+                                    or resolve_chromedriver()),
+            driver_arguments=driver_arguments,
+            browser_executable_path=settings.get("SELENIUM_BROWSER_EXECUTABLE_PATH"),
+            command_executor=settings.get("SELENIUM_COMMAND_EXECUTOR"),
+        )
+        crawler.signals.connect(middleware.spider_closed, signals.spider_closed)
+        return middleware
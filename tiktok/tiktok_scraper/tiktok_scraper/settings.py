@@ -9,8 +9,10 @@
 
 BOT_NAME = "tiktok_scraper"
 
-SPIDER_MODULES = ["tiktok_scraper.spiders"]
-NEWSPIDER_MODULE = "tiktok_scraper.spiders"
+# Relative to this package: the project runs from the repository root
+# (python main.py tiktok) as tiktok.tiktok_scraper.tiktok_scraper
+SPIDER_MODULES = [f"{__package__}.spiders"]
+NEWSPIDER_MODULE = f"{__package__}.spiders"
 
 ADDONS = {}
 
@@ -47,7 +49,7 @@ DOWNLOAD_DELAY = 1
 # Enable or disable downloader middlewares
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
 DOWNLOADER_MIDDLEWARES = {
-    "scrapy_selenium.SeleniumMiddleware": 800,
+    f"{__package__}.middlewares.TiktokSeleniumMiddleware": 800,
 }
 
 # Enable or disable extensions
@@ -86,13 +88,11 @@ DOWNLOADER_MIDDLEWARES = {
 # Set settings whose default value is deprecated to a future-proof value
 FEED_EXPORT_ENCODING = "utf-8"
 
-# Path to your WebDriver
-from shutil import which
+# WebDriver: TiktokSeleniumMiddleware resolves chromedriver when the crawl
+# starts if no path is set here (CHROMEDRIVER_PATH, cached path, PATH, then
+# webdriver_manager), and keeps a persistent profile so cookies survive
+# between runs
 SELENIUM_DRIVER_NAME = "chrome"
-SELENIUM_DRIVER_EXECUTABLE_PATH = r"C:\Users\dudaj\Tools\chromedriver-win64\chromedriver.exe"
+SELENIUM_DRIVER_EXECUTABLE_PATH = None
+SELENIUM_PROFILE_NAME = "tiktok"
 SELENIUM_DRIVER_ARGUMENTS = ["--no-sandbox", "--disable-dev-shm-usage"]  # remove --headless
-
-
-
-
-
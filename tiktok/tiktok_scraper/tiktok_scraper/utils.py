@@ -1,20 +1,30 @@
 import os, requests, json, logging, yt_dlp
 
+from common.media_store import get_media_store
+
 OUTPUT_FOLDER = "downloads/tiktok"
 
 def download_file(url, filename, folder=OUTPUT_FOLDER):
     os.makedirs(folder, exist_ok=True)
     path = os.path.join(folder, filename)
-    r = requests.get(url, stream=True)
-    if r.status_code == 200:
-        with open(path, "wb") as f:
-            for chunk in r.iter_content(1024):
-                f.write(chunk)
-        logging.info(f"Saved file: {path}")
+    store = get_media_store()
+
+    blob_path = store.lookup(url)
+    if blob_path:
+        store.link(blob_path, path)
+        logging.info(f"Reused file: {path}")
         return path
-    else:
-        logging.error(f"Failed to download {url}")
-        return None
+
+    with requests.get(url, stream=True) as r:
+        if r.status_code == 200:
+            blob_path = store.put_stream(
+                url, r.iter_content(64 * 1024), os.path.splitext(filename)[1])
+            store.link(blob_path, path)
+            logging.info(f"Saved file: {path}")
+            return path
+        else:
+            logging.error(f"Failed to download {url}")
+            return None
 
 
 def download_video(link, folder=OUTPUT_FOLDER):
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+TWEET_STORE_PATH = "downloads/twitter/tweets.sqlite3"
+
+
+class TweetStore:
+    """
+    Tweets saved per crawl target (profile or hashtag folder name)
+
+    Tweets live in one SQLite table keyed by (target, tweet id), so storing
+    a tweet is a single indexed insert that ignores duplicates, whatever
+    the size of the history. A watermark row per target keeps the newest
+    and oldest stored IDs, updated in the same transaction as each page,
+    so incremental crawls (since_id) and backfills (until_id) start without
+    scanning the history. ``export_json`` writes the JSON array format
+    of the old ``<target>.json`` files, ``import_json`` reads it back.
+    """
+
+    def __init__(self, path=TWEET_STORE_PATH):
+        """
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        has_watermarks = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'watermarks'",
+        ).fetchone()
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tweets (
+                target TEXT NOT NULL,
+                tweet_id INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                crawled_at REAL NOT NULL,
+                PRIMARY KEY (target, tweet_id)
+            );
+            CREATE TABLE IF NOT EXISTS watermarks (
+                target TEXT PRIMARY KEY,
+                newest_id INTEGER NOT NULL,
+                oldest_id INTEGER NOT NULL,
+                updated_at REAL NOT NULL
+            );
+        """)
+        if not has_watermarks:
+            # Stores written before watermarks existed: one scan, once
+            self._conn.execute(
+                "INSERT OR IGNORE INTO watermarks (target, newest_id, oldest_id, updated_at) "
+                "SELECT target, MAX(tweet_id), MIN(tweet_id), ? FROM tweets GROUP BY target",
+                (time.time(),),
+            )
+        self._conn.commit()
+
+    def add(self, target, tweets):
+        """
+        Store tweets, skipping IDs already saved for the target, and move
+        the target's watermark in the same transaction
+
+        Args:
+            target: Profile name or "hashtag_<tag>"
+            tweets: Tweet dicts from the API (with an "id")
+
+        Returns:
+            int: Number of new tweets
+        """
+        now = time.time()
+        rows = [(target, int(tweet["id"]), json.dumps(tweet, ensure_ascii=False), now)
+                for tweet in tweets]
+        if not rows:
+            return 0
+        ids = [row[1] for row in rows]
+
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO tweets (target, tweet_id, data, crawled_at) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            added = self._conn.total_changes - before
+            self._conn.execute(
+                "INSERT INTO watermarks (target, newest_id, oldest_id, updated_at) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT (target) DO UPDATE SET "
+                "newest_id = MAX(newest_id, excluded.newest_id), "
+                "oldest_id = MIN(oldest_id, excluded.oldest_id), "
+                "updated_at = excluded.updated_at",
+                (target, max(ids), min(ids), now),
+            )
+        return added
+
+    def count(self, target):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM tweets WHERE target = ?", (target,),
+            ).fetchone()[0]
+
+    def watermark(self, target):
+        """
+        Newest and oldest stored tweet IDs of a target
+
+        Returns:
+            dict: newest_id, oldest_id and updated_at, or None if nothing
+                is stored for the target
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT newest_id, oldest_id, updated_at FROM watermarks WHERE target = ?",
+                (target,),
+            ).fetchone()
+        if not row:
+            return None
+        return {"newest_id": row[0], "oldest_id": row[1], "updated_at": row[2]}
+
+    def latest_id(self, target):
+        """Newest stored tweet ID for a target, or None"""
+        mark = self.watermark(target)
+        return mark["newest_id"] if mark else None
+
+    def oldest_id(self, target):
+        """Oldest stored tweet ID for a target, or None"""
+        mark = self.watermark(target)
+        return mark["oldest_id"] if mark else None
+
+    def iter_tweets(self, target):
+        """Yield a target's tweets in the order they were stored"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM tweets WHERE target = ? ORDER BY rowid", (target,),
+            ).fetchall()
+        for (data,) in rows:
+            yield json.loads(data)
+
+    def export_json(self, target, path):
+        """
+        Write a target's tweets as one JSON array (the legacy file format)
+
+        Returns:
+            int: Number of exported tweets
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        count = 0
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("[")
+            for tweet in self.iter_tweets(target):
+                f.write(",\n" if count else "\n")
+                f.write(json.dumps(tweet, ensure_ascii=False, indent=2))
+                count += 1
+            f.write("\n]\n" if count else "]\n")
+        os.replace(tmp_path, path)
+        return count
+
+    def import_json(self, target, path):
+        """
+        Load a legacy JSON array file into the store
+
+        Returns:
+            int: Number of new tweets
+        """
+        with open(path, encoding="utf-8") as f:
+            tweets = json.load(f)
+        return self.add(target, [t for t in tweets if "id" in t])
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_tweet_store = None
+_tweet_store_lock = threading.Lock()
+
+
+def get_tweet_store():
+    """
+    Tweet store shared by every crawl in this process
+
+    Returns:
+        TweetStore
+    """
+    global _tweet_store
+    with _tweet_store_lock:
+        if _tweet_store is None:
+            _tweet_store = TweetStore(
+                os.environ.get("TWEET_STORE_PATH", TWEET_STORE_PATH))
+        return _tweet_store
+
+
+if __name__ == "__main__":
+    import sys
+
+    store = get_tweet_store()
+    for target in sys.argv[1:]:
+        mark = store.watermark(target) or {}
+        print(f"🐦 {target}: {store.count(target)} tweets, "
+              f"newest {mark.get('newest_id')}, oldest {mark.get('oldest_id')}")
+    store.close()
@@ -1,9 +1,11 @@
 import os
 import sys
-import json
 import logging
 import requests
 
+from common.media_store import get_media_store
+from twitter.tweet_store import get_tweet_store
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -20,6 +22,17 @@ BEARER_TOKEN = "AAAAAAAAAAAAAAAAAAAAAAPS3wEAAAAAgs7hG9UlcJmC%2BWuEIZdfJFtcuVY%3D
 OUTPUT_FOLDER = "downloads/twitter"
 MEDIA_FOLDER = f"{OUTPUT_FOLDER}/medias"
 
+TWEET_PARAMS = {
+    "tweet.fields": "created_at,public_metrics,attachments,referenced_tweets",
+    "expansions": "attachments.media_keys,referenced_tweets.id",
+    "media.fields": "media_key,type,url,preview_image_url,variants,alt_text",
+}
+
+# max_results bounds: 5-100 on a user timeline, 10-100 on recent search
+MAX_RESULTS = 100
+USER_MIN_RESULTS = 5
+SEARCH_MIN_RESULTS = 10
+
 def create_headers(bearer_token):
     return {"Authorization": f"Bearer {bearer_token}"}
 
@@ -32,17 +45,40 @@ def get_user_id(username):
         sys.exit(1)
     return response.json()["data"]["id"]
 
-def get_latest_saved_id(json_filename):
-    """Return the max tweet ID already saved, or None if no file."""
-    path = os.path.join(OUTPUT_FOLDER, json_filename)
-    if not os.path.exists(path):
-        return None
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    if not data:
-        return None
-    # Tweet IDs are numeric strings → pick the max
-    return max(int(t["id"]) for t in data if "id" in t)
+def target_name(profile=None, hashtag=None):
+    """Store/folder name of a crawl target"""
+    return profile if profile else f"hashtag_{hashtag}"
+
+def import_legacy_json(target):
+    """Load an old <target>.json array into the tweet store once"""
+    store = get_tweet_store()
+    path = os.path.join(OUTPUT_FOLDER, f"{target}.json")
+    if store.watermark(target) is None and os.path.exists(path):
+        imported = store.import_json(target, path)
+        logging.info(f"📥 Imported {imported} tweets from {path}")
+
+def get_latest_saved_id(target):
+    """Return the max tweet ID already saved for a target, or None."""
+    import_legacy_json(target)
+    return get_tweet_store().latest_id(target)
+
+def get_oldest_saved_id(target):
+    """Return the min tweet ID already saved for a target, or None."""
+    import_legacy_json(target)
+    return get_tweet_store().oldest_id(target)
+
+def set_id_bounds(params, target, backfill=False):
+    """Only request tweets newer than the stored ones, or older when backfilling"""
+    if backfill:
+        until_id = get_oldest_saved_id(target)
+        if until_id:
+            params["until_id"] = until_id
+            logging.info(f"⏪ Backfilling tweets older than ID {until_id}")
+    else:
+        since_id = get_latest_saved_id(target)
+        if since_id:
+            params["since_id"] = since_id
+            logging.info(f"⏩ Skipping old tweets, fetching only newer than ID {since_id}")
 
 def extract_tweet_media(tweets_data):
     """Attach all media (including from quoted/retweeted tweets) to each tweet."""
@@ -83,14 +119,24 @@ def download_file(url, filename, base_folder, subfolder_name):
     folder = os.path.join(base_folder, subfolder_name)
     os.makedirs(folder, exist_ok=True)
     path = os.path.join(folder, filename)
-    r = requests.get(url, stream=True)
-    if r.status_code == 200:
-        with open(path, "wb") as f:
-            for chunk in r.iter_content(1024):
-                f.write(chunk)
-        logging.info(f"✅ Saved {path}")
-    else:
-        logging.error(f"❌ Failed to download {url}")
+    store = get_media_store()
+
+    # Known URL → link the stored copy, no request at all
+    blob_path = store.lookup(url)
+    if blob_path:
+        store.link(blob_path, path)
+        logging.info(f"♻️ Reused {path}")
+        return path
+
+    with requests.get(url, stream=True) as r:
+        if r.status_code == 200:
+            blob_path = store.put_stream(
+                url, r.iter_content(64 * 1024), os.path.splitext(filename)[1])
+            store.link(blob_path, path)
+            logging.info(f"✅ Saved {path}")
+            return path
+        else:
+            logging.error(f"❌ Failed to download {url}")
 
 
 def download_video(media, filename, base_folder, subfolder_name):
@@ -104,29 +150,8 @@ def download_video(media, filename, base_folder, subfolder_name):
     return download_file(url, f"{filename}.mp4", base_folder, subfolder_name)
 
 
-def append_tweet_json(tweet, filename):
-    os.makedirs(OUTPUT_FOLDER, exist_ok=True)
-    path = os.path.join(OUTPUT_FOLDER, filename)
-
-    # If file doesn’t exist, create empty array
-    if not os.path.exists(path):
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump([], f)
-
-    # Load existing data
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    # Append new tweet if not already stored
-    if not any(t["id"] == tweet["id"] for t in data):
-        data.append(tweet)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        logging.info(f"💾 Appended tweet {tweet['id']} → {path}")
-
-
-def process_and_save(tweets_data, subfolder_name, json_filename):
-    """Attach media, download them, and append tweets to JSON"""
+def process_and_save(tweets_data, subfolder_name):
+    """Attach media, download them, and store the page's tweets"""
     tweets_data = extract_tweet_media(tweets_data)
 
     for tweet in tweets_data.get("data", []):
@@ -141,42 +166,58 @@ def process_and_save(tweets_data, subfolder_name, json_filename):
             elif media["type"] in ("video", "animated_gif"):
                 download_video(media, tweet_id, OUTPUT_FOLDER, subfolder_name)
 
-        # Append JSON
-        append_tweet_json(tweet, json_filename)
+    tweets = tweets_data.get("data", [])
+    if tweets:
+        added = get_tweet_store().add(subfolder_name, tweets)
+        logging.info(f"💾 Stored {added} new of {len(tweets)} tweets → {subfolder_name}")
 
     return tweets_data
 
 
-def crawl_user_tweets(user_id, subfolder_name, limit):
-    headers = create_headers(BEARER_TOKEN)
-    url = f"https://api.x.com/2/users/{user_id}/tweets"
-    params = {
-        "tweet.fields": "created_at,public_metrics,attachments,referenced_tweets",
-        "expansions": "attachments.media_keys,referenced_tweets.id",
-        "media.fields": "media_key,type,url,preview_image_url,variants,alt_text",
-        "max_results": 5,
-    }
+def page_size(remaining, min_results, max_results=MAX_RESULTS):
+    """Largest page the endpoint allows, shrunk to the tweets still wanted"""
+    if remaining is None:
+        return max_results
+    return max(min_results, min(max_results, remaining))
+
+
+def paginate_tweets(url, params, subfolder_name, limit, token_param, min_results):
+    """
+    Fetch, save and count pages of tweets until the limit or the last page
+
+    Args:
+        url: Timeline or search endpoint
+        params: Query parameters (max_results and the page token are set here)
+        subfolder_name: Store/folder name of the target
+        limit: Maximum tweets to fetch (None: all)
+        token_param: "pagination_token" (user timeline) or "next_token" (search)
+        min_results: Smallest max_results the endpoint accepts
 
+    Returns:
+        dict: api_calls and tweets fetched
+    """
+    headers = create_headers(BEARER_TOKEN)
     fetched = 0
+    api_calls = 0
     next_token = None
-    json_filename = f"{subfolder_name}.json"
-
-    since_id = get_latest_saved_id(json_filename)
-    if since_id:
-        params["since_id"] = since_id
-        logging.info(f"⏩ Skipping old tweets, fetching only newer than ID {since_id}")
 
     while True:
         if next_token:
-            params["pagination_token"] = next_token
+            params[token_param] = next_token
+        remaining = limit - fetched if limit else None
+        params["max_results"] = page_size(remaining, min_results)
 
         response = requests.get(url, headers=headers, params=params)
+        api_calls += 1
         if response.status_code != 200:
             logging.error(f"Error fetching tweets: {response.status_code} {response.text}")
             break
 
         data = response.json()
-        processed = process_and_save(data, subfolder_name, json_filename)
+        if remaining is not None and len(data.get("data", [])) > remaining:
+            # Below the endpoint minimum: keep only the tweets asked for
+            data["data"] = data["data"][:remaining]
+        processed = process_and_save(data, subfolder_name)
 
         fetched += len(processed.get("data", []))
         if limit and fetched >= limit:
@@ -189,67 +230,56 @@ def crawl_user_tweets(user_id, subfolder_name, limit):
             logging.info("No more tweets available.")
             break
 
+    per_tweet = f"{api_calls / fetched:.2f}" if fetched else "-"
+    logging.info(f"📊 {api_calls} API calls for {fetched} tweets ({per_tweet} calls/tweet)")
+    return {"api_calls": api_calls, "tweets": fetched}
 
-def crawl_hashtag_tweets(hashtag, subfolder_name, limit):
-    headers = create_headers(BEARER_TOKEN)
-    url = "https://api.x.com/2/tweets/search/recent"
-    params = {
-        "query": f"#{hashtag} -is:retweet",
-        "tweet.fields": "created_at,public_metrics,attachments,referenced_tweets",
-        "expansions": "attachments.media_keys,referenced_tweets.id",
-        "media.fields": "media_key,type,url,preview_image_url,variants,alt_text",
-        "max_results": 5
-    }
 
-    fetched = 0
-    next_token = None
-    json_filename = f"{subfolder_name}.json"
-
-    since_id = get_latest_saved_id(json_filename)
-    if since_id:
-        params["since_id"] = since_id
-        logging.info(f"⏩ Skipping old tweets, fetching only newer than ID {since_id}")
-
-    while True:
-        if next_token:
-            params["next_token"] = next_token
-
-        response = requests.get(url, headers=headers, params=params)
-        if response.status_code != 200:
-            logging.error(f"Error fetching hashtag tweets: {response.status_code} {response.text}")
-            break
+def crawl_user_tweets(user_id, subfolder_name, limit, backfill=False):
+    url = f"https://api.x.com/2/users/{user_id}/tweets"
+    params = dict(TWEET_PARAMS)
+    set_id_bounds(params, subfolder_name, backfill)
+    return paginate_tweets(url, params, subfolder_name, limit,
+                           token_param="pagination_token", min_results=USER_MIN_RESULTS)
 
-        data = response.json()
-        processed = process_and_save(data, subfolder_name, json_filename)
 
-        fetched += len(processed.get("data", []))
-        if limit and fetched >= limit:
-            logging.info(f"Reached limit of {limit} tweets.")
-            break
-
-        meta = data.get("meta", {})
-        next_token = meta.get("next_token")
-        if not next_token:
-            logging.info("No more tweets available.")
-            break
+def crawl_hashtag_tweets(hashtag, subfolder_name, limit, backfill=False):
+    url = "https://api.x.com/2/tweets/search/recent"
+    params = {"query": f"#{hashtag} -is:retweet", **TWEET_PARAMS}
+    set_id_bounds(params, subfolder_name, backfill)
+    return paginate_tweets(url, params, subfolder_name, limit,
+                           token_param="next_token", min_results=SEARCH_MIN_RESULTS)
 
 
 class TwitterCrawler:
     @staticmethod
-    def crawl(profile=None, hashtag=None, limit=None):
+    def crawl(profile=None, hashtag=None, limit=None, backfill=False):
         """Crawl tweets by user or hashtag.
         - If limit is given: fetch up to that many tweets.
         - If limit is None: fetch all available tweets.
+        - If backfill is set: fetch tweets older than the oldest stored one
+          instead of newer than the newest.
         """
         if profile:
-            subfolder_name = profile
+            subfolder_name = target_name(profile=profile)
             logging.info(f"Fetching tweets for @{profile}...")
             user_id = get_user_id(profile)
-            crawl_user_tweets(user_id, subfolder_name, limit)
+            return crawl_user_tweets(user_id, subfolder_name, limit, backfill)
         elif hashtag:
-            subfolder_name = f"hashtag_{hashtag}"
+            subfolder_name = target_name(hashtag=hashtag)
             logging.info(f"Fetching tweets for #{hashtag}...")
-            crawl_hashtag_tweets(hashtag, subfolder_name, limit)
+            return crawl_hashtag_tweets(hashtag, subfolder_name, limit, backfill)
         else:
             logging.error("You must provide either a profile or a hashtag.")
 
+    @staticmethod
+    def export(profile=None, hashtag=None, output=None):
+        """Write a target's stored tweets as a JSON array file."""
+        if not profile and not hashtag:
+            logging.error("You must provide either a profile or a hashtag.")
+            return
+        target = target_name(profile, hashtag)
+        import_legacy_json(target)
+        output = output or os.path.join(OUTPUT_FOLDER, f"{target}.json")
+        count = get_tweet_store().export_json(target, output)
+        logging.info(f"📤 Exported {count} tweets → {output}")